@@ -1,6 +1,20 @@
 """News scraper module for fetching and processing financial news."""
 
-from .scraper import NewsScraperClient
-from .config import ScraperConfig
+import importlib
 
-__all__ = ['NewsScraperClient', 'ScraperConfig']
\ No newline at end of file
+# Public name -> submodule that defines it. Submodules are imported on first access, so
+# sentiment scoring works without Crawl4AI installed.
+_EXPORTS = {
+    'NewsScraper': 'scraper',
+    'ScraperConfig': 'config',
+    'SentimentScorer': 'sentiment',
+    'SentimentCache': 'sentiment',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
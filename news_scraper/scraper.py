@@ -9,6 +9,8 @@ from typing import List, Dict, Optional
 # Ensure that the Crawl4AI package is installed in your environment.
 from crawl4ai import Crawler
 
+from news_scraper.sentiment import SentimentCache, SentimentScorer
+
 #######################################
 # CLASSES
 #######################################
@@ -18,15 +20,27 @@ class NewsScraper:
     It fetches the latest news headlines and filters them by keywords if provided.
     """
 
-    def __init__(self, base_url: str = "https://crawl4ai.com/mkdocs/", crawl_delay: int = 5):
+    def __init__(
+        self,
+        base_url: str = "https://crawl4ai.com/mkdocs/",
+        crawl_delay: int = 5,
+        sentiment_scorer: Optional[SentimentScorer] = None,
+        sentiment_cache_path: Optional[str] = None
+    ):
         """
         Initializes the NewsScraper with a base URL and a crawl delay.
         
         :param base_url: The URL to scrape news from.
         :param crawl_delay: Delay (in seconds) between crawls.
+        :param sentiment_scorer: Scores headlines at ingestion. Defaults to the cached lexicon scorer.
+        :param sentiment_cache_path: SQLite file of the default scorer's cache. Defaults to the
+                                     per-user cache shared by all runs (see ``default_cache_path``).
         """
         self.base_url = base_url
         self.crawl_delay = crawl_delay
+        self.sentiment_scorer = sentiment_scorer if sentiment_scorer is not None else SentimentScorer(
+            cache=SentimentCache(sentiment_cache_path)
+        )
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.DEBUG)
         if not self.logger.handlers:
@@ -38,7 +52,8 @@ class NewsScraper:
         Optionally filters the news items based on the provided keywords.
         
         :param keywords: List of keywords to filter news headlines.
-        :return: A list of dictionaries containing 'headline', 'link', and 'timestamp'.
+        :return: A list of dictionaries containing 'headline', 'link', 'timestamp',
+                 'sentiment' and 'sentiment_score'.
         """
         try:
             # Initialize the crawler from Crawl4AI with the base URL.
@@ -70,6 +85,9 @@ class NewsScraper:
                 "timestamp": timestamp
             })
 
+        # Score the whole batch once at ingestion; agents only read the annotations.
+        self.sentiment_scorer.score_items(filtered_news)
+
         self.logger.info(f"Retrieved {len(filtered_news)} news items after filtering.")
         return filtered_news
 
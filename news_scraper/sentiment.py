@@ -0,0 +1,295 @@
+#######################################
+# IMPORTS
+#######################################
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+#######################################
+# CONSTANTS
+#######################################
+# A compact finance lexicon in the spirit of Loughran-McDonald.
+POSITIVE_WORDS = frozenset({
+    "beat", "beats", "boom", "bullish", "climb", "climbs", "gain", "gains", "growth",
+    "high", "improve", "improves", "jump", "jumps", "outperform", "profit", "profits",
+    "rally", "rallies", "rebound", "record", "rise", "rises", "soar", "soars", "strong",
+    "surge", "surges", "upgrade", "upgrades", "win", "wins",
+})
+NEGATIVE_WORDS = frozenset({
+    "bankruptcy", "bearish", "crash", "crashes", "cut", "cuts", "decline", "declines",
+    "default", "downgrade", "downgrades", "drop", "drops", "fall", "falls", "fear", "fears",
+    "fraud", "lawsuit", "loss", "losses", "miss", "misses", "plunge", "plunges", "recession",
+    "slump", "slumps", "sink", "sinks", "tumble", "tumbles", "weak", "warning",
+})
+NEGATIONS = frozenset({"no", "not", "never", "without", "fails", "failed"})
+
+_TOKEN_PATTERN = re.compile(r"[a-z']+")
+
+# Overrides the directory of the default, file-backed sentiment cache
+CACHE_DIR_ENV = "SIMTD_CACHE_DIR"
+
+#######################################
+# FUNCTIONS
+#######################################
+def default_cache_path() -> str:
+    """
+    :return: The SQLite file shared by every run and sweep process of this user:
+             ``$SIMTD_CACHE_DIR/sentiment.sqlite``, else under ``$XDG_CACHE_HOME/simtd``
+             or ``~/.cache/simtd``.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(base, "simtd")
+    return os.path.join(cache_dir, "sentiment.sqlite")
+
+#######################################
+# CLASSES
+#######################################
+class LexiconSentimentBackend:
+    """
+    Dictionary-based headline scorer. Fast, dependency-free and deterministic.
+    Scores are (positive - negative) / (positive + negative), in [-1, 1].
+    """
+
+    name = "lexicon-v1"
+
+    def score_batch(self, texts: Sequence[str]) -> List[float]:
+        """
+        Score a batch of texts.
+
+        :param texts: The headlines to score.
+        :return: One score per text, in [-1, 1].
+        """
+        return [self._score(text) for text in texts]
+
+    @staticmethod
+    def _score(text: str) -> float:
+        positive = negative = 0
+        negate = False
+        for token in _TOKEN_PATTERN.findall(text.lower()):
+            if token in NEGATIONS:
+                negate = True
+                continue
+            if token in POSITIVE_WORDS:
+                if negate:
+                    negative += 1
+                else:
+                    positive += 1
+            elif token in NEGATIVE_WORDS:
+                if negate:
+                    positive += 1
+                else:
+                    negative += 1
+            negate = False
+        if positive + negative == 0:
+            return 0.0
+        return (positive - negative) / (positive + negative)
+
+
+class TransformerSentimentBackend:
+    """
+    Scores headlines with a local Hugging Face text-classification model on CPU
+    (FinBERT by default). Requires the optional ``transformers`` package.
+    """
+
+    def __init__(self, model_name: str = "ProsusAI/finbert", batch_size: int = 32):
+        """
+        :param model_name: A text-classification model with positive/negative/neutral labels.
+        :param batch_size: Number of texts per forward pass.
+        """
+        try:
+            from transformers import pipeline
+        except ImportError as e:
+            raise ImportError("transformers is required for the transformer sentiment backend") from e
+        self.name = f"transformer:{model_name}"
+        self.batch_size = batch_size
+        self._pipeline = pipeline("text-classification", model=model_name, device=-1, top_k=None)
+
+    def score_batch(self, texts: Sequence[str]) -> List[float]:
+        """
+        Score a batch of texts as P(positive) - P(negative).
+
+        :param texts: The headlines to score.
+        :return: One score per text, in [-1, 1].
+        """
+        outputs = self._pipeline(list(texts), batch_size=self.batch_size, truncation=True)
+        scores = []
+        for labels in outputs:
+            probabilities = {entry["label"].lower(): entry["score"] for entry in labels}
+            scores.append(probabilities.get("positive", 0.0) - probabilities.get("negative", 0.0))
+        return scores
+
+
+class SentimentCache:
+    """
+    Persistent score cache keyed by a hash of the backend name and the text.
+    Backed by SQLite so scores survive across runs and are shared between sweep processes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: SQLite file for the cache, or ":memory:" for a per-process cache.
+                     Defaults to ``default_cache_path()``.
+        """
+        path = path or default_cache_path()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment (key TEXT PRIMARY KEY, score REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, float]:
+        """
+        :param keys: Content hashes to look up.
+        :return: The cached scores for the keys that are present.
+        """
+        found: Dict[str, float] = {}
+        keys = list(keys)
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._connection.execute(
+                f"SELECT key, score FROM sentiment WHERE key IN ({placeholders})", chunk
+            )
+            found.update(rows)
+        return found
+
+    def put_many(self, scores: Dict[str, float]) -> None:
+        """
+        :param scores: Content hash to score pairs to store.
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO sentiment (key, score) VALUES (?, ?)", scores.items()
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class SentimentScorer:
+    """
+    Scores news items in batches with a pluggable backend, memoizing every score by
+    content hash so that each headline is scored exactly once across runs.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        cache: Optional[SentimentCache] = None,
+        batch_size: int = 256,
+        neutral_band: float = 0.05
+    ):
+        """
+        :param backend: An object with ``name`` and ``score_batch(texts)``. Defaults to the lexicon backend.
+        :param cache: Where scores are memoized. Defaults to the persistent per-user cache.
+        :param batch_size: Maximum number of texts sent to the backend at once.
+        :param neutral_band: Scores within +/- this band are labelled "neutral".
+        """
+        self.backend = backend if backend is not None else LexiconSentimentBackend()
+        self.cache = cache if cache is not None else SentimentCache()
+        self.batch_size = batch_size
+        self.neutral_band = neutral_band
+        self.logger = logging.getLogger(__name__)
+        # Accounting per backend name: texts scored by the backend (cache misses), seconds
+        # spent scoring them and texts served from the cache instead
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def content_key(self, text: str) -> str:
+        """
+        :param text: The text to hash.
+        :return: The cache key for this text under the current backend.
+        """
+        normalized = " ".join(text.split()).lower()
+        return hashlib.sha1(f"{self.backend.name}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def score_texts(self, texts: Sequence[str]) -> List[float]:
+        """
+        Score texts, only sending cache misses (deduplicated) to the backend.
+
+        :param texts: The texts to score.
+        :return: One score per text, in input order.
+        """
+        keys = [self.content_key(text) for text in texts]
+        scores = self.cache.get_many(list(set(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in scores and key not in missing:
+                missing[key] = text
+        if missing:
+            missing_keys = list(missing)
+            new_scores: Dict[str, float] = {}
+            for start in range(0, len(missing_keys), self.batch_size):
+                batch_keys = missing_keys[start:start + self.batch_size]
+                new_scores.update(zip(batch_keys, self._run_backend([missing[key] for key in batch_keys])))
+            self.cache.put_many(new_scores)
+            scores.update(new_scores)
+        self._stats_entry()["cache_hits"] += len(texts) - len(missing)
+        return [scores[key] for key in keys]
+
+    def score_items(self, items: List[Dict[str, Any]], text_field: str = "headline") -> List[Dict[str, Any]]:
+        """
+        Annotate news items in place with ``sentiment_score`` and a ``sentiment`` label.
+
+        :param items: News item dictionaries, as returned by the scraper.
+        :param text_field: The key holding the text to score.
+        :return: The same list, for chaining.
+        """
+        if not items:
+            return items
+        scores = self.score_texts([item.get(text_field, "") for item in items])
+        for item, score in zip(items, scores):
+            item["sentiment_score"] = score
+            item["sentiment"] = self.label(score)
+        return items
+
+    def label(self, score: float) -> str:
+        """
+        :param score: A sentiment score in [-1, 1].
+        :return: "positive", "negative" or "neutral".
+        """
+        if score > self.neutral_band:
+            return "positive"
+        if score < -self.neutral_band:
+            return "negative"
+        return "neutral"
+
+    def throughput(self) -> Dict[str, float]:
+        """
+        :return: Backend throughput for each backend used so far: cache misses scored per
+                 second. Cache hits are counted separately in ``stats[name]["cache_hits"]``.
+        """
+        return {
+            name: (entry["texts"] / entry["seconds"]) if entry["seconds"] > 0 else float("inf")
+            for name, entry in self.stats.items()
+        }
+
+    def _run_backend(self, texts: List[str]) -> List[float]:
+        """
+        Score texts with the backend and record its throughput.
+        """
+        start = time.perf_counter()
+        scores = self.backend.score_batch(texts)
+        elapsed = time.perf_counter() - start
+        entry = self._stats_entry()
+        entry["texts"] += len(texts)
+        entry["seconds"] += elapsed
+        self.logger.debug(f"Scored {len(texts)} texts with {self.backend.name} in {elapsed:.4f}s")
+        return scores
+
+    def _stats_entry(self) -> Dict[str, float]:
+        """
+        :return: The accounting entry of the current backend, created on first use.
+        """
+        return self.stats.setdefault(self.backend.name, {"texts": 0, "seconds": 0.0, "cache_hits": 0})
@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+from trading_simulation.analytics import PerformanceTracker, SimulationAnalytics
+
+@pytest.fixture
+def equity_paths():
+    """Equity of two agents over five steps."""
+    return np.array([
+        [100.0, 100.0],
+        [110.0, 90.0],
+        [99.0, 95.0],
+        [121.0, 95.0],
+        [115.0, 100.0],
+    ])
+
+def test_metrics_match_batch_computation(equity_paths):
+    """Test that streaming metrics match metrics computed from the full history."""
+    tracker = PerformanceTracker(2)
+    for equity in equity_paths:
+        tracker.update(equity)
+    metrics = tracker.metrics()
+
+    returns = equity_paths[1:] / equity_paths[:-1] - 1.0
+    expected_sharpe = returns.mean(axis=0) / returns.std(axis=0, ddof=1) * np.sqrt(252)
+    peaks = np.maximum.accumulate(equity_paths, axis=0)
+    expected_drawdown = ((peaks - equity_paths) / peaks).max(axis=0)
+
+    assert np.allclose(metrics['sharpe'], expected_sharpe)
+    assert np.allclose(metrics['max_drawdown'], expected_drawdown)
+    assert np.allclose(metrics['pnl'], [15.0, 0.0])
+    assert np.allclose(metrics['hit_rate'], [0.5, 2 / 3])
+
+def test_turnover_accumulates():
+    """Test that turnover is traded notional over initial equity."""
+    tracker = PerformanceTracker(1)
+    tracker.update(np.array([1000.0]), np.array([0.0]))
+    tracker.update(np.array([1000.0]), np.array([250.0]))
+    tracker.update(np.array([1000.0]), np.array([250.0]))
+    assert tracker.metrics()['turnover'][0] == pytest.approx(0.5)
+
+def test_equity_curve_is_bounded():
+    """Test that the equity curve keeps a bounded, evenly spaced set of samples."""
+    tracker = PerformanceTracker(1, max_samples=8)
+    for step in range(100):
+        tracker.update(np.array([100.0 + step]))
+    steps, samples = tracker.equity_curve()
+
+    assert len(steps) <= 8
+    assert steps[0] == 0
+    assert len(set(np.diff(steps))) == 1
+    assert np.allclose(samples[:, 0], 100.0 + steps)
+
+def test_simulation_analytics_export(equity_paths):
+    """Test per-agent and world-level export."""
+    analytics = SimulationAnalytics(['Alice', 'Bob'])
+    for equity in equity_paths:
+        analytics.update(equity, np.array([10.0, 0.0]))
+    exported = analytics.export()
+
+    assert list(exported['agents'].index) == ['Alice', 'Bob']
+    assert exported['summary']['steps'] == 5
+    assert exported['summary']['pnl'] == pytest.approx(15.0)
+    assert list(exported['equity_curve'].columns) == ['Alice', 'Bob', 'world']
+    assert exported['equity_curve']['world'].iloc[-1] == pytest.approx(215.0)
+    assert exported['trades'].empty
+
+def test_trade_log():
+    """Test that recorded fills are stamped with their step and bounded by max_trades."""
+    analytics = SimulationAnalytics(['Alice', 'Bob'], max_trades=3)
+    analytics.record_trades(np.array([0, 1]), np.array([2, 0]), np.array([5.0, -3.0]), np.array([10.0, 20.0]))
+    analytics.update(np.array([100.0, 100.0]))
+    analytics.record_trades(np.array([1, 0]), np.array([1, 1]), np.array([1.0, 2.0]), np.array([30.0, 30.0]),
+                            cost=np.array([0.5, 0.5]))
+    analytics.update(np.array([100.0, 100.0]))
+
+    trades = analytics.trades()
+    assert list(trades.columns) == ['step', 'agent', 'ticker', 'quantity', 'price', 'cost']
+    assert trades['step'].tolist() == [0, 0, 1]
+    assert trades['agent'].tolist() == [0, 1, 1]
+    assert trades['quantity'].tolist() == [5.0, -3.0, 1.0]
+    assert trades['cost'].tolist() == [0.0, 0.0, 0.5]
+    assert analytics.trades_dropped == 1
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+import pandas as pd
+from trading_simulation.bars import BarAggregator, BarFeed, parse_timeframe
+
+@pytest.fixture
+def minute_bars():
+    """Create two days of random minute bars."""
+    rng = np.random.default_rng(0)
+    n = 2 * 24 * 60
+    timestamps = np.arange(n) * 60
+    close = 100.0 + np.cumsum(rng.normal(0, 0.1, n))
+    open_ = np.r_[100.0, close[:-1]]
+    high = np.maximum(open_, close) + rng.random(n)
+    low = np.minimum(open_, close) - rng.random(n)
+    volume = rng.integers(1, 100, n).astype(float)
+    return timestamps, open_, high, low, close, volume
+
+def reference_bars(minute_bars, rule):
+    """Aggregate minute bars with pandas, for comparison."""
+    timestamps, open_, high, low, close, volume = minute_bars
+    frame = pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+        index=pd.to_datetime(timestamps, unit='s')
+    )
+    return frame.resample(rule).agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+
+def test_parse_timeframe():
+    """Test timeframe parsing."""
+    assert parse_timeframe('5m') == 300
+    assert parse_timeframe('1d') == 86400
+    assert parse_timeframe(30) == 30
+    with pytest.raises(ValueError):
+        parse_timeframe('5x')
+
+def test_non_multiple_timeframes_are_rejected():
+    """Test that each timeframe must nest in the next."""
+    with pytest.raises(ValueError):
+        BarAggregator('AAPL', timeframes=('2m', '5m'))
+
+def test_streaming_matches_batch_resample(minute_bars):
+    """Test that chunked streaming aggregation matches a full resample."""
+    aggregator = BarAggregator('AAPL', capacity=5000)
+    for chunk in np.array_split(np.arange(len(minute_bars[0])), 37):
+        aggregator.update_bars(*(column[chunk] for column in minute_bars))
+    aggregator.flush()
+
+    for timeframe, rule in [('5m', '5min'), ('1h', '1h'), ('1d', '1D')]:
+        expected = reference_bars(minute_bars, rule)
+        bars = aggregator.series[timeframe].latest()
+        assert len(bars['close']) == len(expected)
+        for field in ['open', 'high', 'low', 'close', 'volume']:
+            assert np.allclose(bars[field], expected[field].to_numpy())
+
+def test_coarse_bars_close_incrementally(minute_bars):
+    """Test that subscribers only see bars once a later bar starts."""
+    received = []
+    aggregator = BarAggregator('AAPL', timeframes=('1m', '5m'))
+    aggregator.subscribe('5m', lambda symbol, timeframe, bars: received.append(bars['start'].tolist()))
+
+    aggregator.update_bars(*(column[:5] for column in minute_bars))
+    assert received == []
+    assert aggregator.forming('5m')['start'] == 0
+
+    aggregator.update_bars(*(column[5:6] for column in minute_bars))
+    assert received == [[0.0]]
+
+def test_ticks_and_out_of_order_input():
+    """Test tick aggregation and rejection of unordered input."""
+    aggregator = BarAggregator('AAPL', timeframes=('1m',))
+    aggregator.update_ticks(np.array([0, 10, 59, 61]), np.array([10.0, 12.0, 9.0, 11.0]), np.array([1, 2, 3, 4]))
+    bar = aggregator.series['1m'].latest(1)
+    assert [bar[f][0] for f in ['open', 'high', 'low', 'close', 'volume']] == [10.0, 12.0, 9.0, 9.0, 6.0]
+    with pytest.raises(ValueError):
+        aggregator.update_ticks(np.array([5]), np.array([1.0]), np.array([1]))
+
+def test_feed_subscriptions_by_resolution(minute_bars):
+    """Test that subscribers to different resolutions of one feed get their own bars."""
+    feed = BarFeed(['AAPL', 'MSFT'], timeframes=('1m', '1h'))
+    seen = {'1m': 0, '1h': 0}
+
+    def on_bars(symbol, timeframe, bars):
+        seen[timeframe] += len(bars['close'])
+
+    feed.subscribe('1m', on_bars, symbols=['AAPL'])
+    feed.subscribe('1h', on_bars)
+    feed.update_bars('AAPL', *(column[:180] for column in minute_bars))
+    feed.update_bars('MSFT', *(column[:180] for column in minute_bars))
+
+    assert seen == {'1m': 179, '1h': 2 * 2}
+    assert len(feed.latest('MSFT', '1h')['close']) == 2
+
+def test_series_ring_buffer():
+    """Test that only the most recent bars are kept."""
+    aggregator = BarAggregator('AAPL', timeframes=('1m',), capacity=3)
+    aggregator.update_ticks(np.arange(10) * 60, np.arange(10, dtype=float), np.ones(10))
+    assert aggregator.series['1m'].latest()['close'].tolist() == [6.0, 7.0, 8.0]
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+import pandas as pd
+from trading_simulation.data_cache import EpisodeCache
+from trading_simulation.risk import TRADING_HALT, RiskGate, RiskLimits
+
+@pytest.fixture
+def processed_df():
+    """Create a processed frame with three tickers over ten days, in shuffled order."""
+    dates = pd.bdate_range('2023-01-02', periods=10).strftime('%Y-%m-%d')
+    rows = []
+    for day, date in enumerate(dates):
+        for offset, tic in enumerate(['MSFT', 'AAPL', 'AMZN']):
+            rows.append({
+                'date': date, 'tic': tic,
+                'close': 100.0 + day + offset, 'high': 101.0 + day, 'volume': 1000.0 * (day + 1),
+                'macd': day * 0.1 + offset, 'rsi_30': 50.0 + offset, 'turbulence': float(day)
+            })
+    return pd.DataFrame(rows).sample(frac=1.0, random_state=0)
+
+@pytest.fixture
+def cache(processed_df):
+    """Create an episode cache over the processed frame."""
+    return EpisodeCache(processed_df, ['macd', 'rsi_30'])
+
+def reference_split(df, start, end):
+    """FinRL's data_split, for comparison."""
+    data = df[(df.date >= start) & (df.date < end)]
+    data = data.sort_values(['date', 'tic'], ignore_index=True)
+    data.index = data.date.factorize()[0]
+    return data
+
+def test_frame_matches_data_split(cache, processed_df):
+    """Test that window frames match FinRL's data_split."""
+    expected = reference_split(processed_df, '2023-01-04', '2023-01-11')
+    pd.testing.assert_frame_equal(cache.frame('2023-01-04', '2023-01-11'), expected)
+
+def test_windows_are_memoized(cache):
+    """Test that the same window is materialized once and shared."""
+    assert cache.frame('2023-01-04', '2023-01-11') is cache.frame('2023-01-04', '2023-01-11')
+    assert cache.episode('2023-01-04', '2023-01-11') is cache.episode('2023-01-04', '2023-01-11')
+
+def test_episode_arrays_are_read_only_views(cache):
+    """Test the env arrays' layout and that windows do not copy data."""
+    episode = cache.episode('2023-01-04', '2023-01-11')
+    full_price = cache.field('close')
+
+    assert episode.price.shape == (5, 3)
+    assert episode.tech.shape == (5, 6)
+    assert episode.turbulence.tolist() == [2.0, 3.0, 4.0, 5.0, 6.0]
+    assert np.shares_memory(episode.price, full_price)
+    assert not episode.price.flags.writeable
+    # Tickers are sorted (AAPL, AMZN, MSFT) and indicators are grouped per ticker
+    assert episode.price[0].tolist() == [103.0, 104.0, 102.0]
+    assert episode.tech[0].tolist() == [1.2, 51.0, 2.2, 52.0, 0.2, 50.0]
+
+def test_env_config(cache):
+    """Test the StockTradingEnv array config entries."""
+    config = cache.env_config('2023-01-02', '2023-01-05', if_train=True)
+    assert set(config) == {'price_array', 'tech_array', 'turbulence_array', 'if_train'}
+    assert config['price_array'].shape == (3, 3)
+
+def test_walk_forward_folds(cache):
+    """Test rolling train/test windows."""
+    folds = list(cache.walk_forward(train_days=4, test_days=2))
+    assert len(folds) == 3
+    (train_start, train_end), (test_start, test_end) = folds[0]
+    assert (train_start, train_end, test_start, test_end) == ('2023-01-02', '2023-01-06', '2023-01-06', '2023-01-10')
+    assert folds[-1][1][1] is None
+    assert len(cache.frame(*folds[-1][1])) == 2 * 3
+
+def test_ragged_frame_is_rejected(processed_df):
+    """Test that frames with missing rows are rejected."""
+    with pytest.raises(ValueError):
+        EpisodeCache(processed_df.iloc[1:], ['macd'])
+
+def test_mismatched_tickers_are_rejected(processed_df):
+    """Test that frames whose days hold different tickers are rejected, even with the right row count."""
+    frame = processed_df.copy()
+    frame.loc[(frame.date == frame.date.max()) & (frame.tic == 'AMZN'), 'tic'] = 'TSLA'
+    with pytest.raises(ValueError):
+        EpisodeCache(frame, ['macd'])
+
+def test_raw_turbulence_drives_the_halt(cache):
+    """Test that the cached turbulence halts the risk gate on the same days as FinRL's env,
+    whose own turbulence_ary is squashed and never reaches the threshold."""
+    env_module = pytest.importorskip("finrl.meta.env_stock_trading.env_stocktrading_np")
+    env = env_module.StockTradingEnv(config=cache.env_config(None, None), turbulence_thresh=5.0)
+    gate = RiskGate(RiskLimits(turbulence_threshold=5.0))
+
+    halted = [
+        gate.check([0], [0], [1], [100.0], np.array([1e6]), np.zeros((1, 1)), turbulence=value).reasons[0] == TRADING_HALT
+        for value in cache.episode(None, None).turbulence
+    ]
+    assert halted == env.turbulence_bool.astype(bool).tolist()
+    assert any(halted)
+    assert (env.turbulence_ary < 5.0).all()
@@ -0,0 +1,205 @@
+import os
+import signal
+import socket
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from trading_simulation.distributed import (
+    MSG_ERROR,
+    MSG_REGISTER,
+    Coordinator,
+    Shard,
+    decode,
+    encode,
+    export_to_wire,
+    launch_local_workers,
+    merge_exports,
+    pack_frame,
+    parse_address,
+    register_task,
+    split_population,
+    unpack_frames,
+)
+from trading_simulation.analytics import SimulationAnalytics
+from trading_simulation.population import PopulationSpec
+
+def _square(params):
+    return {"value": params["x"] ** 2, "pid": os.getpid()}
+
+def _die_once(params):
+    # The first worker to run this shard dies without replying
+    marker = params["marker"]
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return params["x"]
+
+def _freeze_once(params):
+    # The first worker to run this shard freezes, heartbeat thread included, like a hung host
+    marker = params["marker"]
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os.kill(os.getpid(), signal.SIGSTOP)
+    return params["x"]
+
+def _fail(params):
+    raise RuntimeError("boom")
+
+# Workers inherit these registrations, so the tests start them with the "fork" method
+register_task("square", _square)
+register_task("die_once", _die_once)
+register_task("freeze_once", _freeze_once)
+register_task("fail", _fail)
+
+@pytest.fixture
+def export():
+    """A run export as produced by SimulationAnalytics.export()."""
+    return {
+        "summary": {"equity": 110.0, "pnl": 10.0, "total_return": 0.1, "sharpe": 1.0, "steps": 3},
+        "agents": pd.DataFrame({"pnl": [4.0, 6.0]}, index=pd.Index(["A", "B"], name="agent")),
+        "equity_curve": pd.DataFrame(
+            {"A": [50.0, 52.0, 54.0], "B": [50.0, 53.0, 56.0], "world": [100.0, 105.0, 110.0]},
+            index=pd.Index([0, 1, 2], name="step"),
+        ),
+    }
+
+def test_encoding_round_trip():
+    """Test that every supported type survives encoding, including arrays."""
+    value = {"a": [1, 2.5, None, True, False], "b": "héllo", 3: b"\x00\x01",
+             "arr": np.arange(6, dtype=np.float32).reshape(2, 3)}
+    decoded = decode(encode(value))
+    np.testing.assert_array_equal(decoded.pop("arr"), value.pop("arr"))
+    assert decoded == value
+
+def test_encoding_rejects_unknown_types():
+    """Test that arbitrary objects are never serialized."""
+    with pytest.raises(TypeError):
+        encode(object())
+
+def test_frames_split_across_reads():
+    """Test that partial frames stay buffered until complete."""
+    data = pack_frame(3, {"x": 1}) + pack_frame(4, [1, 2])
+    buffer = bytearray(data[:7])
+    assert unpack_frames(buffer) == []
+    buffer += data[7:]
+    assert unpack_frames(buffer) == [(3, {"x": 1}), (4, [1, 2])]
+    assert not buffer
+
+def test_parse_address():
+    """Test TCP and Unix socket addresses."""
+    assert parse_address("tcp://127.0.0.1:5000")[1] == ("127.0.0.1", 5000)
+    assert parse_address("unix:///tmp/sim.sock")[1] == "/tmp/sim.sock"
+    with pytest.raises(ValueError):
+        parse_address("http://localhost")
+
+def test_split_population():
+    """Test that agent groups cover the population with unique names and seeds."""
+    groups = split_population(PopulationSpec(size=10, seed=7), 3)
+    assert [group.size for group in groups] == [4, 3, 3]
+    assert len({group.name_prefix for group in groups}) == 3
+    assert [group.seed for group in groups] == [7, 8, 9]
+
+def test_merge_exports(export):
+    """Test that shard exports are aggregated into one world."""
+    merged = merge_exports([export_to_wire(export), export_to_wire(export)])
+    assert merged["summary"]["equity"] == 220.0
+    assert merged["summary"]["total_return"] == pytest.approx(0.1)
+    assert merged["summary"]["steps"] == 3
+    # Same agent names in both shards are qualified by shard number
+    assert list(merged["agents"].index) == ["0:A", "0:B", "1:A", "1:B"]
+    assert list(merged["equity_curve"]["world"]) == [200.0, 210.0, 220.0]
+
+def test_merge_exports_trades_and_risk_tolerance(export):
+    """Test that trade logs point at the merged agent table and risk tolerance averages over agents."""
+    export["trades"] = pd.DataFrame({"step": [1], "agent": [1], "ticker": [0], "quantity": [2.0],
+                                     "price": [10.0], "cost": [0.0]})
+    first = export_to_wire(export)
+    first["agents"]["risk_tolerance"] = np.array([0.2, 0.4])
+    first["summary"]["risk_tolerance"] = 0.3
+    # A larger second shard: three agents
+    second = export_to_wire(export)
+    second["agents"] = {"agent": ["C", "D", "E"], "pnl": np.zeros(3), "risk_tolerance": np.array([0.6, 0.8, 1.0])}
+    second["equity_curve"] = {"step": np.arange(3), "C": np.ones(3), "D": np.ones(3), "E": np.ones(3),
+                              "world": np.full(3, 3.0)}
+    second["summary"]["risk_tolerance"] = 0.8
+
+    merged = merge_exports([first, second])
+    assert merged["trades"]["agent"].tolist() == [1, 3]
+    assert merged["summary"]["risk_tolerance"] == pytest.approx(0.6)
+
+def test_merged_world_metrics_match_one_world():
+    """Test that world risk metrics are those of the combined equity series, not shard averages."""
+    rng = np.random.default_rng(0)
+    equity = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.02, (40, 4)), axis=0)
+    shards = [SimulationAnalytics(["A", "B"]), SimulationAnalytics(["C", "D"])]
+    world = SimulationAnalytics(["A", "B", "C", "D"])
+    for row in equity:
+        shards[0].update(row[:2])
+        shards[1].update(row[2:])
+        world.update(row)
+
+    merged = merge_exports([export_to_wire(shard.export()) for shard in shards])
+    expected = world.summary()
+    for name in ("equity", "pnl", "total_return", "sharpe", "volatility", "max_drawdown", "hit_rate"):
+        assert merged["summary"][name] == pytest.approx(expected[name])
+
+def test_local_workers(tmp_path):
+    """Test dispatching shards to several local worker processes over a Unix socket."""
+    with Coordinator(f"unix://{tmp_path}/coord.sock") as coordinator:
+        launch_local_workers(coordinator.address, 3, heartbeat_interval=0.2, start_method="fork")
+        coordinator.wait_for_workers(3)
+        results = coordinator.run([Shard(i, "square", {"x": i}) for i in range(12)], timeout=30)
+    assert {i: r["value"] for i, r in results.items()} == {i: i * i for i in range(12)}
+    assert len({r["pid"] for r in results.values()}) > 1
+
+def test_lost_worker_is_redispatched(tmp_path):
+    """Test that a shard whose worker dies is re-run on another worker over TCP."""
+    with Coordinator("tcp://127.0.0.1:0", heartbeat_timeout=2.0) as coordinator:
+        launch_local_workers(coordinator.address, 2, heartbeat_interval=0.2, start_method="fork")
+        coordinator.wait_for_workers(2)
+        results = coordinator.run([Shard(0, "die_once", {"x": 5, "marker": str(tmp_path / "m")})], timeout=30)
+    assert results == {0: 5}
+    assert coordinator.redispatched == 1
+
+def test_silent_worker_is_redispatched(tmp_path):
+    """Test that missed heartbeats mark a worker as lost."""
+    with Coordinator("tcp://127.0.0.1:0", heartbeat_timeout=1.0) as coordinator:
+        workers = launch_local_workers(coordinator.address, 2, heartbeat_interval=0.2, start_method="fork")
+        coordinator.wait_for_workers(2)
+        started = time.monotonic()
+        try:
+            results = coordinator.run([Shard(0, "freeze_once", {"x": 1, "marker": str(tmp_path / "m")})], timeout=30)
+        finally:
+            for worker in workers:
+                worker.kill()
+    assert results == {0: 1}
+    assert coordinator.redispatched == 1
+    assert time.monotonic() - started < 5
+
+def test_failing_shard_exhausts_attempts():
+    """Test that a shard that keeps raising fails the run after max_attempts."""
+    with Coordinator("tcp://127.0.0.1:0", max_attempts=2) as coordinator:
+        launch_local_workers(coordinator.address, 1, heartbeat_interval=0.2, start_method="fork")
+        coordinator.wait_for_workers(1)
+        with pytest.raises(RuntimeError):
+            coordinator.run([Shard(0, "fail")], timeout=30)
+
+def test_malformed_payload_gets_an_error_reply():
+    """Test that a worker sending a non-dict payload is answered and dropped, not fatal."""
+    with Coordinator("tcp://127.0.0.1:0") as coordinator:
+        bad = socket.create_connection(parse_address(coordinator.address)[1])
+        bad.sendall(pack_frame(MSG_REGISTER, [1, 2]))
+        with pytest.raises(TimeoutError):
+            coordinator.wait_for_workers(1, timeout=0.5)
+
+        buffer = bytearray()
+        while data := bad.recv(1 << 16):
+            buffer += data
+        bad.close()
+        (message_type, payload), = unpack_frames(buffer)
+        assert message_type == MSG_ERROR and "list payload" in payload["error"]
+
+        launch_local_workers(coordinator.address, 1, heartbeat_interval=0.2, start_method="fork")
+        coordinator.wait_for_workers(1)
+        assert coordinator.run([Shard(0, "square", {"x": 3})], timeout=30)[0]["value"] == 9
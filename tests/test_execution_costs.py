@@ -0,0 +1,132 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from trading_simulation.execution_costs import (
+    CostAdjustedEnv,
+    ExecutionCostModel,
+    ProportionalCostModel,
+)
+
+@pytest.fixture
+def fills():
+    """A buy and a sell with their bars: quantity, price, high, low, volume."""
+    return (
+        np.array([100.0, -50.0]),
+        np.array([10.0, 20.0]),
+        np.array([11.0, 21.0]),
+        np.array([9.0, 19.0]),
+        np.array([10000.0, 400.0]),
+    )
+
+class FakeEnv:
+    """Minimal stand-in for FinRL's array-based StockTradingEnv."""
+
+    def __init__(self, price_ary):
+        self.price_ary = price_ary
+        self.day = 0
+        self.stocks = np.zeros(price_ary.shape[1])
+        self.amount = 1000.0
+        self.total_asset = 1000.0
+        self.reward_scaling = 1.0
+
+    def step(self, actions):
+        self.day += 1
+        self.stocks = self.stocks + np.asarray(actions)
+        return None, 1.0, False, {}
+
+def test_proportional_matches_finrl_fee(fills):
+    """Test that the proportional model charges fee_pct of notional and nothing else."""
+    quantity, price = fills[0], fills[1]
+    result = ProportionalCostModel(0.001).apply(quantity, price)
+    np.testing.assert_allclose(result.fees, [1.0, 1.0])
+    np.testing.assert_allclose(result.total_cost, result.fees)
+    np.testing.assert_allclose(result.cash_delta, [-1001.0, 999.0])
+
+def test_spread_and_impact(fills):
+    """Test the spread and square-root impact terms against hand-computed values."""
+    result = ExecutionCostModel(fee_pct=0.0, spread_fraction=0.1, impact_coefficient=0.1).apply(*fills)
+    # half of 10% of a range of 2, per share
+    np.testing.assert_allclose(result.spread, [0.1 * 100, 0.1 * 50])
+    # 0.1 * (range / price) * price * sqrt(shares / volume) * shares
+    np.testing.assert_allclose(result.impact, [0.1 * 2 * np.sqrt(0.01) * 100, 0.1 * 2 * np.sqrt(0.125) * 50])
+    assert np.all(result.total_cost > 0)
+
+def test_missing_bar_data_costs_only_fees(fills):
+    """Test that spread and impact need their inputs and default to zero."""
+    quantity, price = fills[0], fills[1]
+    result = ExecutionCostModel(fee_pct=0.001).apply(quantity, price)
+    np.testing.assert_allclose(result.total_cost, result.fees)
+
+def test_participation_cap(fills):
+    """Test that fills are clipped to a fraction of bar volume, keeping their side."""
+    result = ExecutionCostModel(participation_cap=0.05).apply(*fills)
+    np.testing.assert_array_equal(result.filled, [100.0, -20.0])
+
+def test_fills_on_one_ticker_share_its_volume():
+    """Test that several agents on one ticker split the cap pro rata and pay impact on their combined size."""
+    quantity = np.array([40.0, -40.0, 20.0, 30.0])
+    price = np.full(4, 10.0)
+    high, low = np.full(4, 11.0), np.full(4, 9.0)
+    volume = np.array([1000.0, 1000.0, 1000.0, 10000.0])
+    ticker = np.array([0, 0, 0, 1])
+    model = ExecutionCostModel(fee_pct=0.0, spread_fraction=0.0, impact_coefficient=0.1, participation_cap=0.05)
+
+    result = model.apply(quantity, price, high, low, volume, ticker=ticker)
+
+    # 100 shares requested against a cap of 50 on ticker 0
+    np.testing.assert_array_equal(result.filled, [20.0, -20.0, 10.0, 30.0])
+    assert np.abs(result.filled[:3]).sum() <= 50
+    # every fill of ticker 0 pays impact at the combined participation of 50 / 1000
+    np.testing.assert_allclose(
+        result.impact, 0.1 * 0.2 * 10.0 * np.sqrt([0.05, 0.05, 0.05, 0.003]) * [20, 20, 10, 30]
+    )
+    # without tickers, every fill is its own ticker
+    alone = model.apply(quantity, price, high, low, volume)
+    np.testing.assert_array_equal(alone.filled, [40.0, -40.0, 20.0, 30.0])
+
+def test_invalid_parameters():
+    """Test that negative costs and bad participation caps are rejected."""
+    with pytest.raises(ValueError):
+        ProportionalCostModel(-0.1)
+    with pytest.raises(ValueError):
+        ExecutionCostModel(participation_cap=1.5)
+
+def test_env_reward_is_charged_extra_costs():
+    """Test that the wrapper deducts costs beyond the env's own fee from cash and reward."""
+    env = FakeEnv(np.array([[10.0, 20.0], [10.0, 20.0]]))
+    model = ExecutionCostModel(fee_pct=0.001, spread_fraction=0.1, impact_coefficient=0.0)
+    high = np.array([[11.0, 21.0], [11.0, 21.0]])
+    low = np.array([[9.0, 19.0], [9.0, 19.0]])
+    wrapped = CostAdjustedEnv(env, model, charged_fee_pct=0.001, high=high, low=low)
+
+    _, reward, _, _ = wrapped.step([10, 0])
+    assert reward == pytest.approx(1.0 - 1.0)  # spread of 0.1 per share on 10 shares
+    assert env.amount == pytest.approx(999.0)
+    assert wrapped.day == 1  # attributes pass through to the env
+
+def test_env_fee_is_read_from_the_env():
+    """Test that the fee the env charges itself comes from its buy and sell cost rates."""
+    env = FakeEnv(np.array([[10.0, 20.0], [10.0, 20.0]]))
+    env.buy_cost_pct, env.sell_cost_pct = 0.001, 0.001
+    wrapped = CostAdjustedEnv(env, ProportionalCostModel(0.003), charged_fee_pct=0.003)
+
+    _, reward, _, _ = wrapped.step([10, 0])
+    assert reward == pytest.approx(1.0 - 0.2)  # 0.2% of 100 not charged by the env
+
+def test_env_five_value_step():
+    """Test that gymnasium-style (state, reward, done, truncated, info) returns pass through."""
+    env = FakeEnv(np.array([[10.0, 20.0], [10.0, 20.0]]))
+    step = env.step
+    env.step = lambda actions: (*step(actions)[:3], False, {})
+    wrapped = CostAdjustedEnv(env, ProportionalCostModel(0.002))
+
+    state, reward, done, truncated, info = wrapped.step([10, 0])
+    assert reward == pytest.approx(1.0 - 0.2)
+    assert truncated is False and info == {}
+
+def test_env_without_holdings_is_untouched():
+    """Test that envs without a holdings array are stepped unchanged."""
+    env = SimpleNamespace(step=lambda actions: (None, 1.0, False, {}))
+    wrapped = CostAdjustedEnv(env, ExecutionCostModel())
+    assert wrapped.step([1]) == (None, 1.0, False, {})
+    assert wrapped.last_costs is None
@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+from multiprocessing import shared_memory
+from trading_simulation.market_stimulus import MarketStimulus, NewsRecord, StimulusBuilder
+
+@pytest.fixture
+def builder():
+    """Create a stimulus builder for testing."""
+    return StimulusBuilder()
+
+@pytest.fixture
+def sample_news():
+    """Sample scored news items."""
+    return [
+        {'headline': 'Market sees unexpected rally', 'sentiment': 'positive', 'sentiment_score': 1.0, 'timestamp': 1.0},
+        {'headline': 'Tech stocks slump', 'sentiment': 'negative', 'sentiment_score': -1.0, 'timestamp': 2.0},
+    ]
+
+def test_stimulus_is_read_only(builder, sample_news):
+    """Test that agents cannot mutate the shared stimulus."""
+    info = {'day': 1, 'weights': [0.5, 0.5], 'state': {'cash': np.arange(2.0)}}
+    stimulus = builder.build(0, np.arange(4.0), 0.5, False, info, sample_news)
+
+    with pytest.raises(ValueError):
+        stimulus.observation[0] = 42.0
+    with pytest.raises(ValueError):
+        stimulus.observation.flags.writeable = True
+    with pytest.raises(TypeError):
+        stimulus.info['day'] = 2
+    # Nested values are frozen too, and detached from the env's objects
+    assert stimulus.info['weights'] == (0.5, 0.5)
+    with pytest.raises(TypeError):
+        stimulus.info['state']['cash'] = 0.0
+    with pytest.raises(ValueError):
+        stimulus.info['state']['cash'].flags.writeable = True
+    info['state']['cash'][0] = 9.0
+    assert stimulus.info['state']['cash'][0] == 0.0
+    with pytest.raises(AttributeError):
+        stimulus.reward = 1.0
+    with pytest.raises(AttributeError):
+        stimulus.news[0].headline = 'changed'
+    assert isinstance(stimulus.news, tuple)
+
+def test_dict_style_access(builder, sample_news):
+    """Test that agents written against the stimulus dict still work."""
+    stimulus = builder.build(3, np.zeros(2), 1.0, True, None, sample_news)
+
+    assert stimulus.get('type') == 'MARKET_UPDATE'
+    assert stimulus['done'] is True
+    assert stimulus.get('missing', 'default') == 'default'
+    assert stimulus.news[1] == NewsRecord('Tech stocks slump', 2.0, 'negative', -1.0, None)
+
+def test_retained_stimuli_stay_valid(builder, sample_news):
+    """Test that a kept stimulus is never overwritten by later steps, and unchanged news is not rebuilt."""
+    observation = np.ones(3)
+    first = builder.build(0, observation, 0.0, False, {}, sample_news)
+    observation[:] = 2.0
+    second = builder.build(1, observation, 0.0, False, {}, sample_news)
+    builder.build(2, np.full(3, 3.0), 0.0, False, {}, sample_news)
+
+    assert second.news is first.news
+    assert np.allclose(first.observation, 1.0)
+    assert np.allclose(second.observation, 2.0)
+
+def test_wire_format_round_trip(builder, sample_news):
+    """Test packing into shared memory and reading back without copying the observation."""
+    stimulus = builder.build(7, np.arange(5.0), -0.25, False, {'turbulence': np.float64(3.5)}, sample_news)
+    block = shared_memory.SharedMemory(create=True, size=stimulus.packed_size())
+    try:
+        written = stimulus.pack_into(block.buf)
+        decoded = MarketStimulus.from_buffer(block.buf)
+
+        assert written == stimulus.packed_size()
+        assert decoded.step == 7
+        assert decoded.reward == -0.25
+        assert np.array_equal(decoded.observation, np.arange(5.0))
+        assert not decoded.observation.flags.writeable
+        assert decoded.info['turbulence'] == 3.5
+        assert decoded.news == stimulus.news
+        del decoded
+    finally:
+        block.close()
+        block.unlink()
+
+def test_from_buffer_rejects_garbage():
+    """Test that unrelated bytes are not decoded."""
+    with pytest.raises(ValueError):
+        MarketStimulus.from_buffer(bytes(64))
@@ -0,0 +1,141 @@
+import pytest
+import numpy as np
+import torch
+from trading_simulation.policy_server import PolicyServer, PolicyBackend, TorchPolicyBackend
+
+class CountingBackend(PolicyBackend):
+    """Backend that records the batch shapes it is called with."""
+    name = "counting"
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, batch):
+        self.calls.append(batch.shape)
+        return batch[:, :2] * 2.0
+
+class FakeSB3Policy:
+    """Mimics the parts of a stable-baselines3 policy the SB3 backend uses."""
+    action_space = None
+
+    def __init__(self, scale):
+        self.scale = scale
+
+    def to(self, device):
+        return self
+
+    def set_training_mode(self, mode):
+        pass
+
+    def _predict(self, observation, deterministic=True):
+        return observation[:, :1] * self.scale
+
+class FakeSB3Model:
+    """A stable-baselines3-like model wrapping a FakeSB3Policy."""
+
+    def __init__(self, scale):
+        self.policy = FakeSB3Policy(scale)
+
+@pytest.fixture
+def policy_server():
+    """Create a policy server instance for testing."""
+    return PolicyServer(num_threads=1)
+
+@pytest.fixture
+def linear_policy():
+    """A small torch policy mapping 4 observations to 2 actions."""
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(4, 2), torch.nn.Tanh())
+
+def test_thread_count_is_opt_in():
+    """Test that a server only changes torch's process-wide threads when asked to."""
+    previous = torch.get_num_threads()
+    try:
+        torch.set_num_threads(2)
+        assert PolicyServer().num_threads == 2
+        assert torch.get_num_threads() == 2
+        assert PolicyServer(num_threads=1).num_threads == 1
+    finally:
+        torch.set_num_threads(previous)
+
+def test_agents_sharing_a_model_are_batched(policy_server):
+    """Test that agents sharing a model trigger one forward pass per step."""
+    backend = CountingBackend()
+    for name in ["Alice", "Bob", "Eve"]:
+        policy_server.register(name, backend)
+
+    observations = {name: np.arange(4, dtype=np.float32) + i for i, name in enumerate(["Alice", "Bob", "Eve"])}
+    actions = policy_server.predict(observations)
+
+    assert backend.calls == [(3, 4)]
+    assert np.allclose(actions["Bob"], [2.0, 4.0])
+
+def test_predict_skips_agents_without_observations(policy_server):
+    """Test that only agents with an observation are evaluated."""
+    backend = CountingBackend()
+    policy_server.register("Alice", backend)
+    policy_server.register("Bob", backend)
+
+    actions = policy_server.predict({"Bob": np.ones(4)})
+
+    assert set(actions) == {"Bob"}
+    assert backend.calls == [(1, 4)]
+
+def test_buffer_is_reused_across_steps(policy_server):
+    """Test that the observation buffer is preallocated once per group."""
+    backend = CountingBackend()
+    policy_server.register("Alice", backend)
+    policy_server.register("Bob", backend)
+
+    policy_server.predict({"Alice": np.ones(4), "Bob": np.ones(4)})
+    group = next(iter(policy_server._groups.values()))
+    first_buffer = group.buffer
+    policy_server.predict({"Alice": np.zeros(4), "Bob": np.zeros(4)})
+
+    assert group.buffer is first_buffer
+
+def test_torch_backend_matches_single_predictions(policy_server, linear_policy):
+    """Test that batched torch inference matches per-agent inference."""
+    policy_server.register("Alice", linear_policy)
+    policy_server.register("Bob", linear_policy)
+    observations = {"Alice": np.ones(4), "Bob": np.full(4, -1.0)}
+
+    actions = policy_server.predict(observations)
+
+    single = TorchPolicyBackend(linear_policy)
+    for name, obs in observations.items():
+        expected = single(np.asarray(obs, dtype=np.float32)[None, :])[0]
+        assert np.allclose(actions[name], expected, atol=1e-6)
+
+def test_torchscript_policy(policy_server, linear_policy):
+    """Test that scripted modules are served like eager modules."""
+    scripted = torch.jit.script(linear_policy)
+    policy_server.register("Alice", scripted)
+
+    actions = policy_server.predict({"Alice": np.ones(4)})
+    assert actions["Alice"].shape == (2,)
+
+def test_unregister_drops_empty_groups(policy_server):
+    """Test that removing the last agent of a group removes the group."""
+    backend = CountingBackend()
+    policy_server.register("Alice", backend)
+    policy_server.unregister("Alice")
+
+    assert not policy_server.has_policy("Alice")
+    assert policy_server.predict({"Alice": np.ones(4)}) == {}
+
+def test_unsupported_policy_type(policy_server):
+    """Test that unknown policy objects are rejected."""
+    with pytest.raises(TypeError):
+        policy_server.register("Alice", object())
+
+def test_temporary_models_get_their_own_groups(policy_server):
+    """Test that models passed as temporaries are never confused after being freed."""
+    names = ["A", "B", "C", "D"]
+    for scale, name in enumerate(names, start=1):
+        policy_server.register(name, FakeSB3Model(float(scale)))
+
+    actions = policy_server.predict({name: np.ones(4, dtype=np.float32) for name in names})
+
+    assert len(policy_server._groups) == 4
+    assert [float(actions[name][0]) for name in names] == [1.0, 2.0, 3.0, 4.0]
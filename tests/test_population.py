@@ -0,0 +1,114 @@
+import pytest
+import numpy as np
+from trading_simulation.population import PopulationSpec, build_population, build_personas
+from trading_simulation.risk import RiskGate
+from trading_simulation.trading_agents import intern_persona_spec
+
+@pytest.fixture
+def population():
+    """Build a reproducible population for testing."""
+    spec = PopulationSpec(
+        size=5000,
+        style_mix={'conservative': 0.5, 'aggressive': 0.5},
+        risk_distribution='beta',
+        risk_params=(2.0, 5.0),
+        seed=42
+    )
+    return build_population(spec, tickers=['AAPL', 'MSFT'])
+
+def test_spec_validation():
+    """Test that invalid population specs are rejected."""
+    with pytest.raises(ValueError):
+        PopulationSpec(size=-1)
+    with pytest.raises(ValueError):
+        PopulationSpec(size=10, style_mix={'balanced': 0.0})
+    with pytest.raises(ValueError):
+        PopulationSpec(size=10, risk_distribution='pareto')
+    with pytest.raises(ValueError):
+        PopulationSpec(size=10, risk_precision=9)
+
+def test_mean_risk_tolerance():
+    """Test the mean of each risk distribution."""
+    assert PopulationSpec(size=1, risk_params=(0.4, 1.0)).mean_risk_tolerance() == pytest.approx(0.7)
+    assert PopulationSpec(size=1, risk_distribution='normal', risk_params=(0.6, 0.1)).mean_risk_tolerance() == 0.6
+    assert PopulationSpec(size=1, risk_distribution='beta', risk_params=(3.0, 1.0)).mean_risk_tolerance() == 0.75
+
+def test_persona_specs_are_interned():
+    """Test that identical persona definitions are shared and immutable all the way down."""
+    first = intern_persona_spec('balanced', 0.5)
+    second = intern_persona_spec('balanced', 0.5)
+    assert first is second
+    assert first.definitions['preferences'] is second.definitions['preferences']
+    with pytest.raises(TypeError):
+        first.definitions['occupation'] = {}
+    with pytest.raises(TypeError):
+        first.definitions['occupation']['title'] = 'Broker'
+    assert isinstance(first.definitions['preferences']['interests'], tuple)
+
+def test_persona_spec_keys_are_quantized():
+    """Test that nearby float risk tolerances share one spec, keeping the intern table bounded."""
+    spec = intern_persona_spec('balanced', 0.3)
+    assert intern_persona_spec('balanced', 0.1 + 0.2) is spec
+    assert intern_persona_spec('balanced', 0.300001) is spec
+    assert spec.risk_tolerance == 0.3
+
+def test_persona_definitions_are_copied():
+    """Test that personas get mutable copies, so changing one never leaks into the spec."""
+    spec = intern_persona_spec('balanced', 0.5)
+    preferences = spec.definition('preferences')
+    preferences['interests'].append('crypto')
+    assert 'crypto' not in spec.definitions['preferences']['interests']
+    assert spec.definition('preferences') == {'interests': ['stock market', 'economics', 'financial news']}
+
+def test_population_follows_spec(population):
+    """Test style mix, risk rounding and flyweight sharing."""
+    styles = {spec.trading_style for spec in population.specs}
+    assert styles == {'conservative', 'aggressive'}
+    assert len(population.specs) <= 2 * 101
+    assert np.allclose(population.risk_tolerance, np.round(population.risk_tolerance, 2), atol=1e-6)
+    trader = population[10]
+    assert trader.name == 'Trader10'
+    assert trader.spec is intern_persona_spec(trader.spec.trading_style, trader.spec.risk_tolerance)
+    assert trader.risk_tolerance == pytest.approx(trader.spec.risk_tolerance, abs=1e-6)
+
+def test_population_is_compact(population):
+    """Test the under-1KB-per-trader memory target."""
+    assert population.bytes_per_agent() < 1024
+    assert population.build_seconds >= 0
+
+def test_batch_orders_and_fills(population):
+    """Test that population orders flow through the risk gate and settle in batch."""
+    rng = np.random.default_rng(0)
+    prices = np.array([100.0, 50.0])
+    agent_idx, ticker_idx, quantity = population.propose_orders(rng)
+    result = RiskGate().check(agent_idx, ticker_idx, quantity, prices, population.cash, population.positions)
+
+    population.apply_fills(agent_idx, ticker_idx, quantity, prices, result.accepted)
+
+    assert (population.positions >= 0).all()
+    assert np.allclose(population.equity(prices), 100000.0)
+
+def test_build_personas_share_the_spec(population):
+    """Test that materialized personas reference the shared spec."""
+    personas = build_personas(population, limit=3)
+    assert len(personas) == 3
+    assert personas[0].name == 'Trader0'
+    assert personas[0].persona_spec is population.specs[population.spec_index[0]]
+
+def test_reset_restores_starting_state(population):
+    """Test that a reset population starts the next episode with its initial cash and no positions."""
+    population.apply_fills(np.array([0, 1]), np.array([0, 1]), np.array([3, 2]), np.array([100.0, 50.0]))
+    population.reset()
+    assert (population.cash == 100000.0).all()
+    assert not population.positions.any()
+
+def test_fills_charge_costs(population):
+    """Test that execution costs of settled fills are charged to the agents' cash."""
+    prices = np.array([100.0, 50.0])
+    population.apply_fills(
+        np.array([0, 1]), np.array([0, 1]), np.array([2.0, 1.0]), prices,
+        accepted=np.array([True, False]), costs=np.array([0.5, 9.0])
+    )
+    assert population.positions[0, 0] == 2
+    assert population.cash[0] == pytest.approx(100000.0 - 200.0 - 0.5)
+    assert population.cash[1] == pytest.approx(100000.0)
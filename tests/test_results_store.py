@@ -0,0 +1,110 @@
+import multiprocessing
+import pytest
+import numpy as np
+import pandas as pd
+from trading_simulation.results_store import ResultsStore, RunRecord, config_hash, flatten_config
+
+@pytest.fixture
+def store():
+    """An in-memory store with small series chunks."""
+    with ResultsStore(chunk_size=4) as store:
+        yield store
+
+def _write_runs(path, offset):
+    with ResultsStore(path) as store, store.batch_writer(batch_size=10) as writer:
+        for i in range(offset, offset + 50):
+            writer.add({"risk_tolerance": i / 100}, seed=0, metrics={"sharpe": float(i)})
+
+def test_config_hash_ignores_key_order():
+    """Test that equal configurations hash equally."""
+    assert config_hash({"a": 1, "b": {"c": 2}}) == config_hash({"b": {"c": 2}, "a": 1})
+    assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+def test_flatten_config():
+    """Test that nested scalars and sequence items become dotted parameters."""
+    config = {"a": 1, "b": {"c": "x", "d": [1, 2], "e": (0.5, {"f": None})}}
+    assert flatten_config(config) == {"a": 1, "b.c": "x", "b.d.0": 1, "b.d.1": 2, "b.e.0": 0.5}
+
+def test_invalid_names_are_rejected():
+    """Test that names that cannot be columns are refused."""
+    with pytest.raises(ValueError):
+        RunRecord({"bad name": 1}, 0, {})
+
+def test_round_trip(store):
+    """Test that a run's config, metrics and chunked series are returned intact."""
+    equity = np.linspace(100.0, 110.0, 10)
+    run_id = store.add_run({"hmax": 100, "style": "balanced"}, 3, {"sharpe": 1.5}, {"equity.world": equity})
+    run = store.get_run(config_hash({"hmax": 100, "style": "balanced"}), 3)
+    assert run["run_id"] == run_id
+    assert run["config"] == {"hmax": 100, "style": "balanced"}
+    assert run["metrics"] == {"sharpe": 1.5}
+    assert run["series"] == ["equity.world"]
+    np.testing.assert_array_equal(store.load_series(run_id, "equity.world"), equity)
+
+def test_same_config_and_seed_replaces(store):
+    """Test that re-running a configuration with the same seed overwrites it."""
+    store.add_run({"a": 1}, 0, {"sharpe": 1.0}, {"x": np.arange(8)})
+    run_id = store.add_run({"a": 1}, 0, {"sharpe": 2.0}, {"x": np.arange(3)})
+    assert len(store) == 1
+    assert store.top_runs("sharpe")["sharpe"].tolist() == [2.0]
+    assert store.load_series(run_id, "x").tolist() == [0, 1, 2]
+
+def test_top_runs_with_filters(store):
+    """Test ranking runs by a metric with parameter filters."""
+    store.add_runs([
+        RunRecord({"risk_tolerance": risk, "style": style}, 0, {"sharpe": sharpe, "max_drawdown": -sharpe})
+        for risk, style, sharpe in [(0.2, "a", 3.0), (0.6, "a", 2.0), (0.8, "b", 1.0), (0.9, "a", 0.5)]
+    ])
+    top = store.top_runs("sharpe", 2, {"risk_tolerance": (">", 0.5)})
+    assert top["sharpe"].tolist() == [2.0, 1.0]
+    assert top["risk_tolerance"].tolist() == [0.6, 0.8]
+    top = store.top_runs("max_drawdown", 1, {"style": "a"}, ascending=True)
+    assert top["sharpe"].tolist() == [3.0]
+    with pytest.raises(ValueError):
+        store.top_runs("sortino")
+    with pytest.raises(ValueError):
+        store.top_runs("sharpe", where={"style": ("LIKE", "a")})
+
+def test_top_configs_average_over_seeds(store):
+    """Test that configurations are ranked by their mean over seeds."""
+    store.add_runs(
+        [RunRecord({"risk_tolerance": 0.7}, seed, {"sharpe": sharpe}) for seed, sharpe in enumerate([1.0, 3.0])]
+        + [RunRecord({"risk_tolerance": 0.9}, 0, {"sharpe": 2.5})]
+        + [RunRecord({"risk_tolerance": 0.1}, 0, {"sharpe": 9.0})]
+    )
+    top = store.top_configs("sharpe", 20, {"risk_tolerance": (">", 0.5)})
+    assert top["risk_tolerance"].tolist() == [0.9, 0.7]
+    assert top["runs"].tolist() == [1, 2]
+    assert top["sharpe_std"].iloc[1] == pytest.approx(np.std([1.0, 3.0], ddof=1))
+    assert store.top_configs("sharpe", min_runs=2)["risk_tolerance"].tolist() == [0.7]
+
+def test_add_export(store):
+    """Test storing a SimulationRunner export."""
+    export = {
+        "summary": {"sharpe": 1.2, "steps": 3},
+        "equity_curve": pd.DataFrame({"A": [1.0, 2.0, 3.0], "world": [1.0, 2.0, 3.0]},
+                                     index=pd.Index([0, 1, 2], name="step")),
+        "trades": pd.DataFrame({"step": [0, 0, 2, 2, 2], "agent": [0, 0, 0, 0, 0], "ticker": [0, 1, 0, 1, 1],
+                                "quantity": [1.0, 2.0, -1.0, 3.0, -2.0], "price": [10.0] * 5, "cost": [0.1] * 5}),
+    }
+    run_id = store.add_export({"total_steps": 3}, 0, export)
+    assert store.load_series(run_id, "equity.world").tolist() == [1.0, 2.0, 3.0]
+    assert store.load_series(run_id, "step").tolist() == [0, 1, 2]
+    # The trade log spans several chunks
+    assert store.load_series(run_id, "trades.quantity").tolist() == [1.0, 2.0, -1.0, 3.0, -2.0]
+    assert store.load_series(run_id, "trades.step").tolist() == [0, 0, 2, 2, 2]
+    assert store.add_export({"total_steps": 3}, 1, {}) is None
+
+def test_concurrent_writers(tmp_path):
+    """Test several processes writing batches to one store file."""
+    path = str(tmp_path / "runs.db")
+    ResultsStore(path).close()
+    processes = [multiprocessing.Process(target=_write_runs, args=(path, offset)) for offset in (0, 50, 100)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+    with ResultsStore(path) as store:
+        assert len(store) == 150
+        assert store.top_runs("sharpe", 3)["sharpe"].tolist() == [149.0, 148.0, 147.0]
@@ -0,0 +1,143 @@
+import pytest
+import numpy as np
+from trading_simulation.risk import RiskGate, RiskLimits, REASON_NAMES
+
+@pytest.fixture
+def prices():
+    """Prices for three tickers."""
+    return np.array([100.0, 50.0, 10.0])
+
+@pytest.fixture
+def positions():
+    """Holdings of two agents across three tickers."""
+    return np.array([[10, 0, 0], [0, 5, 0]], dtype=np.float64)
+
+def test_limits_validation():
+    """Test that invalid limits are rejected."""
+    with pytest.raises(ValueError):
+        RiskLimits(hmax=0)
+    with pytest.raises(ValueError):
+        RiskLimits(max_gross_leverage=-1.0)
+
+def test_cash_is_checked_cumulatively(prices, positions):
+    """Test that an agent's buys are accepted until its cash runs out."""
+    gate = RiskGate(RiskLimits(hmax=None))
+    result = gate.check(
+        agent_idx=[0, 0, 0], ticker_idx=[0, 0, 0], quantity=[4, 4, 4],
+        prices=prices, cash=np.array([1000.0, 0.0]), positions=positions
+    )
+    assert result.reason_names() == ['accepted', 'accepted', 'insufficient_cash']
+
+def test_hmax_and_unknown_ticker(prices, positions):
+    """Test per-order size limits and tickers outside the world."""
+    gate = RiskGate(RiskLimits(hmax=100))
+    result = gate.check(
+        agent_idx=[0, 1], ticker_idx=[0, -1], quantity=[101, 1],
+        prices=prices, cash=np.array([1e9, 1e9]), positions=positions
+    )
+    assert result.reason_names() == ['max_order_size', 'unknown_ticker']
+    assert not result.accepted.any()
+
+def test_cash_check_covers_execution_costs(prices, positions):
+    """Test that estimated execution costs are included in the cash check."""
+    gate = RiskGate(RiskLimits(transaction_cost_pct=0.001))
+    cash = np.array([100.1, 0.0])
+    result = gate.check(agent_idx=[0], ticker_idx=[0], quantity=[1], prices=prices, cash=cash, positions=positions)
+    assert result.reason_names() == ['accepted']
+
+    # Spread and impact on top of the fee would overdraw the agent
+    result = gate.check(
+        agent_idx=[0], ticker_idx=[0], quantity=[1], prices=prices, cash=cash, positions=positions,
+        costs=np.array([1.16])
+    )
+    assert result.reason_names() == ['insufficient_cash']
+
+    # Sells need cash only for costs beyond their own proceeds
+    result = gate.check(
+        agent_idx=[1, 1], ticker_idx=[1, 1], quantity=[-1, -1], prices=prices, cash=cash, positions=positions,
+        costs=np.array([1.0, 60.0])
+    )
+    assert result.reason_names() == ['accepted', 'insufficient_cash']
+
+def test_sells_limited_by_holdings(prices, positions):
+    """Test that agents cannot sell more than they hold across the batch."""
+    gate = RiskGate()
+    result = gate.check(
+        agent_idx=[1, 1, 0], ticker_idx=[1, 1, 1], quantity=[-3, -3, -1],
+        prices=prices, cash=np.zeros(2), positions=positions
+    )
+    assert result.reason_names() == ['accepted', 'insufficient_shares', 'insufficient_shares']
+
+def test_rejected_orders_never_make_room(prices):
+    """Test that only orders that survive count towards later orders of the batch."""
+    gate = RiskGate()
+    flat = np.zeros((1, 3))
+    # An unaffordable buy must not cover a sale of the same shares
+    result = gate.check(
+        agent_idx=[0, 0], ticker_idx=[0, 0], quantity=[10, -10],
+        prices=prices, cash=np.zeros(1), positions=flat
+    )
+    assert result.reason_names() == ['insufficient_cash', 'insufficient_shares']
+
+    # A rejected oversized sale must not use up the shares a valid one needs
+    result = gate.check(
+        agent_idx=[0, 0], ticker_idx=[0, 0], quantity=[-10, -3],
+        prices=prices, cash=np.zeros(1), positions=np.array([[5.0, 0.0, 0.0]])
+    )
+    assert result.reason_names() == ['insufficient_shares', 'accepted']
+
+    # Nor an unaffordable buy the cash of a cheaper one
+    result = gate.check(
+        agent_idx=[0, 0], ticker_idx=[0, 2], quantity=[50, 3],
+        prices=prices, cash=np.array([100.0]), positions=flat
+    )
+    assert result.reason_names() == ['insufficient_cash', 'accepted']
+
+def test_turbulence_halts_buying_only(prices, positions):
+    """Test that a turbulence halt blocks buys but allows sells."""
+    gate = RiskGate(RiskLimits(turbulence_threshold=50.0))
+    result = gate.check(
+        agent_idx=[0, 0], ticker_idx=[1, 0], quantity=[1, -1],
+        prices=prices, cash=np.array([1e6, 1e6]), positions=positions, turbulence=80.0
+    )
+    assert result.reason_names() == ['trading_halt', 'accepted']
+
+def test_position_and_exposure_limits(prices, positions):
+    """Test max position and gross exposure limits."""
+    gate = RiskGate(RiskLimits(max_position=12))
+    result = gate.check(
+        agent_idx=[0, 0], ticker_idx=[0, 0], quantity=[2, 1],
+        prices=prices, cash=np.array([1e6, 0.0]), positions=positions
+    )
+    assert result.reason_names() == ['accepted', 'position_limit']
+
+    # An oversized holding can still be reduced, but not grown
+    result = gate.check(
+        agent_idx=[0, 0], ticker_idx=[0, 0], quantity=[-1, 1],
+        prices=prices, cash=np.array([1e6, 0.0]), positions=np.array([[20, 0, 0], [0, 5, 0]], dtype=np.float64)
+    )
+    assert result.reason_names() == ['accepted', 'position_limit']
+
+    gate = RiskGate(RiskLimits(max_gross_leverage=0.5))
+    result = gate.check(
+        agent_idx=[0], ticker_idx=[1], quantity=[100],
+        prices=prices, cash=np.array([9000.0, 0.0]), positions=positions
+    )
+    assert result.reason_names() == ['gross_exposure']
+    assert result.reject_counts() == {'gross_exposure': 1}
+
+def test_large_batch(prices):
+    """Test that a 100k-order batch is validated in one call."""
+    rng = np.random.default_rng(0)
+    n_agents, n_orders = 10000, 100000
+    gate = RiskGate(RiskLimits(hmax=100, max_gross_leverage=2.0))
+    result = gate.check(
+        agent_idx=rng.integers(0, n_agents, n_orders),
+        ticker_idx=rng.integers(0, 3, n_orders),
+        quantity=rng.integers(-5, 6, n_orders),
+        prices=prices,
+        cash=np.full(n_agents, 1000.0),
+        positions=np.full((n_agents, 3), 2.0)
+    )
+    assert result.accepted.shape == (n_orders,)
+    assert set(result.reason_names()) <= set(REASON_NAMES)
@@ -0,0 +1,95 @@
+import pytest
+from news_scraper.sentiment import CACHE_DIR_ENV as SENTIMENT_CACHE_DIR_ENV
+from news_scraper.sentiment import LexiconSentimentBackend, SentimentCache, SentimentScorer
+
+class CountingBackend:
+    """Backend that counts how many texts it was asked to score."""
+    name = "counting"
+
+    def __init__(self):
+        self.scored = []
+
+    def score_batch(self, texts):
+        self.scored.extend(texts)
+        return [0.5 for _ in texts]
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the default, file-backed cache at a per-test directory."""
+    monkeypatch.setenv(SENTIMENT_CACHE_DIR_ENV, str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+@pytest.fixture
+def sample_news_items():
+    """Sample news items for testing."""
+    return [
+        {'headline': 'Market sees unexpected rally', 'timestamp': '2023-01-01'},
+        {'headline': 'Tech stocks slump amid regulation fears', 'timestamp': '2023-01-02'},
+        {'headline': 'Fed meeting scheduled for Wednesday', 'timestamp': '2023-01-03'},
+    ]
+
+def test_lexicon_scores():
+    """Test the lexicon backend on clearly positive and negative headlines."""
+    backend = LexiconSentimentBackend()
+    positive, negative, neutral, negated = backend.score_batch([
+        'Shares surge after earnings beat',
+        'Stocks plunge on recession fears',
+        'Company holds annual meeting',
+        'Earnings did not beat estimates',
+    ])
+    assert positive > 0
+    assert negative < 0
+    assert neutral == 0
+    assert negated < 0
+
+def test_score_items_annotates_in_place(sample_news_items):
+    """Test that items gain a sentiment label and score."""
+    scorer = SentimentScorer()
+    scored = scorer.score_items(sample_news_items)
+
+    assert scored is sample_news_items
+    assert [item['sentiment'] for item in scored] == ['positive', 'negative', 'neutral']
+    assert all('sentiment_score' in item for item in scored)
+
+def test_each_headline_scored_once(sample_news_items):
+    """Test that duplicate and previously seen headlines hit the cache."""
+    backend = CountingBackend()
+    scorer = SentimentScorer(backend=backend, batch_size=2)
+    scorer.score_items(sample_news_items + [dict(sample_news_items[0])])
+    scorer.score_items([dict(item) for item in sample_news_items])
+
+    assert len(backend.scored) == 3
+    assert scorer.stats['counting']['texts'] == 3
+    assert scorer.stats['counting']['cache_hits'] == 4
+    assert scorer.throughput()['counting'] > 0
+
+def test_cache_persists_across_scorers(tmp_path, sample_news_items):
+    """Test that a file-backed cache is reused by a fresh scorer."""
+    path = str(tmp_path / 'sentiment.sqlite')
+    first = CountingBackend()
+    SentimentScorer(backend=first, cache=SentimentCache(path)).score_items(sample_news_items)
+
+    second = CountingBackend()
+    SentimentScorer(backend=second, cache=SentimentCache(path)).score_items(sample_news_items)
+
+    assert len(first.scored) == 3
+    assert second.scored == []
+
+def test_cache_is_keyed_by_backend(sample_news_items):
+    """Test that different backends do not share cached scores."""
+    cache = SentimentCache()
+    SentimentScorer(cache=cache).score_items(sample_news_items)
+    backend = CountingBackend()
+    SentimentScorer(backend=backend, cache=cache).score_items(sample_news_items)
+
+    assert len(backend.scored) == 3
+
+def test_default_cache_is_persistent(cache_dir, sample_news_items):
+    """Test that default scorers share a file-backed cache, so headlines are scored once across runs."""
+    SentimentScorer().score_items(sample_news_items)
+    assert (cache_dir / 'sentiment.sqlite').exists()
+
+    backend = CountingBackend()
+    backend.name = LexiconSentimentBackend.name
+    SentimentScorer(backend=backend).score_items([dict(item) for item in sample_news_items])
+    assert backend.scored == []
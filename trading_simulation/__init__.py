@@ -1,7 +1,33 @@
 """Trading simulation module integrating FinRL and TinyTroupe."""
 
-from .trading_world import TradingWorld
-from .trading_agents import TraderAgent, TraderPersona
-from .simulation_runner import SimulationRunner
+import importlib
 
-__all__ = ['TradingWorld', 'TraderAgent', 'TraderPersona', 'SimulationRunner']
\ No newline at end of file
+# Public name -> submodule that defines it. Submodules are imported on first access, so
+# the numpy-only ones (risk, analytics, bars, ...) work without FinRL and TinyTroupe.
+_EXPORTS = {
+    'TradingWorld': 'trading_world',
+    'TradingPersona': 'trading_agents',
+    'SimulationRunner': 'simulation_runner',
+    'PolicyServer': 'policy_server',
+    'PerformanceTracker': 'analytics',
+    'SimulationAnalytics': 'analytics',
+    'PopulationSpec': 'population',
+    'TraderPopulation': 'population',
+    'build_population': 'population',
+    'BarAggregator': 'bars',
+    'BarFeed': 'bars',
+    'ExecutionCostModel': 'execution_costs',
+    'ProportionalCostModel': 'execution_costs',
+    'Coordinator': 'distributed',
+    'Worker': 'distributed',
+    'register_task': 'distributed',
+    'ResultsStore': 'results_store',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
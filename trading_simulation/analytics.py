@@ -0,0 +1,277 @@
+# trading_simulation/analytics.py
+
+#######################################
+# IMPORTS
+#######################################
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+#######################################
+# CONSTANTS
+#######################################
+# Columns of the trade log; "agent" and "ticker" are indices into the run's agents and tickers
+TRADE_FIELDS = ("step", "agent", "ticker", "quantity", "price", "cost")
+
+#######################################
+# CLASSES
+#######################################
+class PerformanceTracker:
+    """
+    Streaming performance metrics for a fixed set of equity series (e.g. one per agent).
+
+    Every update is O(1) per series: returns feed Welford's mean/variance (for Sharpe),
+    drawdown is tracked against a running peak, and the equity curve is kept as a bounded
+    set of samples that is decimated by two whenever it fills up. No tick history is stored.
+    """
+
+    def __init__(self, n_series: int, periods_per_year: float = 252, max_samples: int = 512):
+        """
+        Constructor for the PerformanceTracker.
+
+        :param n_series: The number of equity series tracked in parallel.
+        :param periods_per_year: Steps per year, used to annualize Sharpe and volatility.
+        :param max_samples: Maximum number of equity curve samples kept per series.
+        """
+        if max_samples < 2:
+            raise ValueError("max_samples must be at least 2")
+        self.n_series = n_series
+        self.periods_per_year = periods_per_year
+        self.max_samples = max_samples
+        self.steps = 0
+
+        self.initial_equity = np.zeros(n_series)
+        self.last_equity = np.zeros(n_series)
+        self.peak_equity = np.zeros(n_series)
+        self.max_drawdown = np.zeros(n_series)
+        self.traded_notional = np.zeros(n_series)
+
+        # Welford accumulators over per-step returns
+        self._return_count = 0
+        self._return_mean = np.zeros(n_series)
+        self._return_m2 = np.zeros(n_series)
+        self._winning_steps = np.zeros(n_series, dtype=np.int64)
+        self._active_steps = np.zeros(n_series, dtype=np.int64)
+
+        # Decimated equity curve
+        self._sample_stride = 1
+        self._sample_count = 0
+        self._sample_steps = np.zeros(max_samples, dtype=np.int64)
+        self._samples = np.zeros((max_samples, n_series))
+
+    def update(self, equity: np.ndarray, traded_notional: Optional[np.ndarray] = None) -> None:
+        """
+        Record the equity of every series at the end of a step.
+
+        :param equity: Current equity per series, shape (n_series,).
+        :param traded_notional: Absolute notional traded per series during this step.
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        if self.steps == 0:
+            self.initial_equity[:] = equity
+            self.peak_equity[:] = equity
+        else:
+            returns = np.divide(
+                equity - self.last_equity, self.last_equity,
+                out=np.zeros(self.n_series), where=self.last_equity > 0
+            )
+            self._return_count += 1
+            delta = returns - self._return_mean
+            self._return_mean += delta / self._return_count
+            self._return_m2 += delta * (returns - self._return_mean)
+            self._winning_steps += returns > 0
+            self._active_steps += returns != 0
+
+            np.maximum(self.peak_equity, equity, out=self.peak_equity)
+            drawdown = np.divide(
+                self.peak_equity - equity, self.peak_equity,
+                out=np.zeros(self.n_series), where=self.peak_equity > 0
+            )
+            np.maximum(self.max_drawdown, drawdown, out=self.max_drawdown)
+
+        if traded_notional is not None:
+            self.traded_notional += traded_notional
+        self.last_equity[:] = equity
+        self._record_sample(equity)
+        self.steps += 1
+
+    def metrics(self) -> Dict[str, np.ndarray]:
+        """
+        The current metrics of every series. Can be called at any step.
+
+        ``hit_rate`` is the share of steps with a positive return among the steps whose
+        equity changed at all; it is measured per step, not per winning trade.
+
+        :return: A mapping of metric name to an array of shape (n_series,).
+        """
+        count = self._return_count
+        variance = self._return_m2 / (count - 1) if count > 1 else np.zeros(self.n_series)
+        volatility = np.sqrt(variance)
+        annualization = np.sqrt(self.periods_per_year)
+        sharpe = np.divide(
+            self._return_mean * annualization, volatility,
+            out=np.zeros(self.n_series), where=volatility > 0
+        )
+        hit_rate = np.divide(
+            self._winning_steps, self._active_steps,
+            out=np.zeros(self.n_series), where=self._active_steps > 0
+        )
+        has_capital = self.initial_equity > 0
+        return {
+            "equity": self.last_equity.copy(),
+            "pnl": self.last_equity - self.initial_equity,
+            "total_return": np.divide(
+                self.last_equity, self.initial_equity, out=np.ones(self.n_series), where=has_capital
+            ) - 1.0,
+            "sharpe": sharpe,
+            "volatility": volatility * annualization,
+            "max_drawdown": self.max_drawdown.copy(),
+            "turnover": np.divide(
+                self.traded_notional, self.initial_equity, out=np.zeros(self.n_series), where=has_capital
+            ),
+            "hit_rate": hit_rate,
+        }
+
+    def equity_curve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: The sampled step numbers, shape (k,), and equity samples, shape (k, n_series).
+        """
+        count = self._sample_count
+        return self._sample_steps[:count].copy(), self._samples[:count].copy()
+
+    def _record_sample(self, equity: np.ndarray) -> None:
+        """
+        Keep every ``stride``-th equity value, halving the samples and doubling the stride when full.
+        """
+        if self.steps % self._sample_stride:
+            return
+        if self._sample_count == self.max_samples:
+            kept = (self.max_samples + 1) // 2
+            self._sample_steps[:kept] = self._sample_steps[0::2]
+            self._samples[:kept] = self._samples[0::2]
+            self._sample_count = kept
+            self._sample_stride *= 2
+            if self.steps % self._sample_stride:
+                return
+        self._sample_steps[self._sample_count] = self.steps
+        self._samples[self._sample_count] = equity
+        self._sample_count += 1
+
+
+class SimulationAnalytics:
+    """
+    Per-agent and world-level performance of a simulation run. The world series is the
+    total equity of all tracked agents. Fills reported through ``record_trades`` are kept
+    as a trade log of up to ``max_trades`` rows.
+    """
+
+    def __init__(
+        self,
+        agent_names: List[str],
+        periods_per_year: float = 252,
+        max_samples: int = 512,
+        max_trades: int = 1000000
+    ):
+        """
+        Constructor for the SimulationAnalytics.
+
+        :param agent_names: Names of the agents to track, in the order their equity is reported.
+        :param periods_per_year: Steps per year, used to annualize Sharpe and volatility.
+        :param max_samples: Maximum number of equity curve samples kept per series.
+        :param max_trades: Maximum number of trades kept; later ones are only counted.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.agent_names = list(agent_names)
+        self.agents = PerformanceTracker(len(self.agent_names), periods_per_year, max_samples)
+        self.world = PerformanceTracker(1, periods_per_year, max_samples)
+        self.max_trades = max_trades
+        self.n_trades = 0
+        self.trades_dropped = 0
+        self._trades: List[np.ndarray] = []
+
+    def record_trades(
+        self,
+        agent: np.ndarray,
+        ticker: np.ndarray,
+        quantity: np.ndarray,
+        price: np.ndarray,
+        cost: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Log the fills settled during the current step; call it before the step's ``update``.
+
+        :param agent: Index of each fill's agent in ``agent_names``.
+        :param ticker: Ticker index of each fill.
+        :param quantity: Signed shares of each fill.
+        :param price: Execution price of each fill.
+        :param cost: Fees and other execution costs of each fill.
+        """
+        count = len(quantity)
+        kept = max(min(count, self.max_trades - self.n_trades), 0)
+        if kept < count:
+            if not self.trades_dropped:
+                self.logger.warning(f"Trade log is full at {self.max_trades} trades; further trades are not kept.")
+            self.trades_dropped += count - kept
+        if not kept:
+            return
+        self._trades.append(np.column_stack([
+            np.full(kept, self.world.steps),
+            *(np.asarray(column, dtype=np.float64)[:kept] for column in (agent, ticker, quantity, price)),
+            np.zeros(kept) if cost is None else np.asarray(cost, dtype=np.float64)[:kept],
+        ]))
+        self.n_trades += kept
+
+    def trades(self) -> pd.DataFrame:
+        """
+        :return: The trade log, one row per fill with the ``TRADE_FIELDS`` columns, in the
+                 order the fills were recorded. ``step`` matches the equity curve's index.
+        """
+        rows = np.concatenate(self._trades) if self._trades else np.zeros((0, len(TRADE_FIELDS)))
+        trades = pd.DataFrame(rows, columns=list(TRADE_FIELDS))
+        return trades.astype({"step": np.int64, "agent": np.int64, "ticker": np.int64})
+
+    def update(self, equity: np.ndarray, traded_notional: Optional[np.ndarray] = None) -> None:
+        """
+        Record the end-of-step equity of every agent.
+
+        :param equity: Equity per agent, in the order of ``agent_names``.
+        :param traded_notional: Absolute notional traded per agent during this step.
+        """
+        self.agents.update(equity, traded_notional)
+        world_traded = None if traded_notional is None else np.array([np.sum(traded_notional)])
+        self.world.update(np.array([np.sum(equity)]), world_traded)
+
+    def agent_metrics(self) -> pd.DataFrame:
+        """
+        :return: One row of metrics per agent, indexed by agent name.
+        """
+        return pd.DataFrame(self.agents.metrics(), index=pd.Index(self.agent_names, name="agent"))
+
+    def summary(self) -> Dict[str, float]:
+        """
+        :return: The world-level metrics as plain floats.
+        """
+        summary = {name: float(values[0]) for name, values in self.world.metrics().items()}
+        summary["steps"] = self.world.steps
+        return summary
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Export everything needed to report on a run.
+
+        :return: A dict with the world ``summary``, the per-agent ``agents`` metrics, the
+                 sampled ``equity_curve`` (one column per agent plus "world", indexed by step)
+                 and the ``trades`` log.
+        """
+        steps, agent_samples = self.agents.equity_curve()
+        _, world_samples = self.world.equity_curve()
+        equity_curve = pd.DataFrame(agent_samples, index=pd.Index(steps, name="step"), columns=self.agent_names)
+        equity_curve["world"] = world_samples[:, 0]
+        return {
+            "summary": self.summary(),
+            "agents": self.agent_metrics(),
+            "equity_curve": equity_curve,
+            "trades": self.trades(),
+        }
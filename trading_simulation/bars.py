@@ -0,0 +1,324 @@
+# trading_simulation/bars.py
+
+#######################################
+# IMPORTS
+#######################################
+import logging
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+#######################################
+# CONSTANTS
+#######################################
+BAR_FIELDS = ("start", "open", "high", "low", "close", "volume")
+_START, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME = range(len(BAR_FIELDS))
+
+_TIMEFRAME_PATTERN = re.compile(r"^(\d+)([smhd])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Callback signature: (symbol, timeframe, bars) where bars maps BAR_FIELDS to arrays.
+BarCallback = Callable[[str, str, Dict[str, np.ndarray]], None]
+
+#######################################
+# FUNCTIONS (helpers)
+#######################################
+def parse_timeframe(timeframe: Union[str, int]) -> int:
+    """
+    :param timeframe: A timeframe such as "1m", "5m", "1h", "1d", or a number of seconds.
+    :return: The timeframe length in seconds.
+    """
+    if isinstance(timeframe, int):
+        seconds = timeframe
+    else:
+        match = _TIMEFRAME_PATTERN.match(timeframe)
+        if match is None:
+            raise ValueError(f"Invalid timeframe: {timeframe}")
+        seconds = int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError(f"Timeframe must be positive: {timeframe}")
+    return seconds
+
+
+def _as_bars(bars: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Column views of an (n, 6) bar matrix.
+    """
+    return {name: bars[:, i] for i, name in enumerate(BAR_FIELDS)}
+
+#######################################
+# CLASSES
+#######################################
+class BarSeries:
+    """
+    Fixed-capacity ring buffer of closed bars for one timeframe.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity: The number of most recent bars kept.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._bars = np.zeros((capacity, len(BAR_FIELDS)))
+        self._count = 0  # total bars ever appended
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, bars: np.ndarray) -> None:
+        """
+        :param bars: Closed bars to append, shape (n, 6), in chronological order.
+        """
+        if len(bars) >= self.capacity:
+            bars = bars[-self.capacity:]
+        positions = (self._count + np.arange(len(bars))) % self.capacity
+        self._bars[positions] = bars
+        self._count += len(bars)
+
+    def latest(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        :param n: The number of most recent bars to return. Defaults to all kept bars.
+        :return: The bars as column arrays, oldest first.
+        """
+        n = len(self) if n is None else min(n, len(self))
+        positions = (self._count - n + np.arange(n)) % self.capacity
+        return _as_bars(self._bars[positions])
+
+
+class BarAggregator:
+    """
+    Streaming OHLCV aggregation of one symbol into several timeframes.
+
+    Input ticks or fine bars are aggregated into the finest timeframe with vectorized
+    ``reduceat`` passes; each bar that closes is then fed to the next coarser timeframe,
+    so coarse bars are updated incrementally and never recomputed from raw input. A bar
+    closes as soon as input starting at or after its end arrives (or on ``flush``).
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframes: Sequence[Union[str, int]] = ("1m", "5m", "1h", "1d"),
+        capacity: int = 10000,
+        origin: int = 0
+    ):
+        """
+        Constructor for the BarAggregator.
+
+        :param symbol: The symbol these bars belong to.
+        :param timeframes: The timeframes to build; each must be a multiple of the previous one.
+        :param capacity: Closed bars kept per timeframe.
+        :param origin: Epoch offset (in seconds) that buckets are aligned to, e.g. a session open.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.symbol = symbol
+        self.origin = origin
+        ordered = sorted(timeframes, key=parse_timeframe)
+        self.timeframes: List[str] = [str(timeframe) for timeframe in ordered]
+        self._seconds = [parse_timeframe(timeframe) for timeframe in ordered]
+        for finer, coarser in zip(self._seconds, self._seconds[1:]):
+            if coarser % finer:
+                raise ValueError("Each timeframe must be a multiple of the previous one")
+        self.series: Dict[str, BarSeries] = {timeframe: BarSeries(capacity) for timeframe in self.timeframes}
+        self._forming: List[Optional[np.ndarray]] = [None] * len(self.timeframes)
+        self._subscribers: Dict[str, List[BarCallback]] = {timeframe: [] for timeframe in self.timeframes}
+
+    def subscribe(self, timeframe: str, callback: BarCallback) -> None:
+        """
+        Call ``callback(symbol, timeframe, bars)`` whenever bars of ``timeframe`` close.
+
+        :param timeframe: One of this aggregator's timeframes.
+        :param callback: The function to call with the newly closed bars.
+        """
+        if timeframe not in self._subscribers:
+            raise ValueError(f"Unknown timeframe {timeframe}; available: {self.timeframes}")
+        self._subscribers[timeframe].append(callback)
+
+    def update_ticks(self, timestamps: np.ndarray, prices: np.ndarray, sizes: np.ndarray) -> None:
+        """
+        Aggregate a chunk of trades.
+
+        :param timestamps: Epoch seconds of each trade, non-decreasing.
+        :param prices: Trade prices.
+        :param sizes: Trade sizes.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        self.update_bars(timestamps, prices, prices, prices, prices, sizes)
+
+    def update_bars(
+        self,
+        timestamps: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray
+    ) -> None:
+        """
+        Aggregate a chunk of bars at (or finer than) the finest timeframe, e.g. minute data.
+
+        :param timestamps: Epoch seconds at which each input bar starts, non-decreasing.
+        :param open: Open prices.
+        :param high: High prices.
+        :param low: Low prices.
+        :param close: Close prices.
+        :param volume: Volumes.
+        """
+        bars = np.column_stack([
+            np.asarray(column, dtype=np.float64) for column in (timestamps, open, high, low, close, volume)
+        ])
+        if len(bars) == 0:
+            return
+        if np.any(np.diff(bars[:, _START]) < 0):
+            raise ValueError("timestamps must be non-decreasing")
+        forming = self._forming[0]
+        if forming is not None and bars[0, _START] < forming[_START]:
+            raise ValueError("input is older than the bar currently forming")
+        self._aggregate(0, bars)
+        self._advance(bars[-1, _START])
+
+    def flush(self) -> None:
+        """
+        Close every forming bar, e.g. at the end of a session or simulation.
+        """
+        for level in range(len(self.timeframes)):
+            forming = self._forming[level]
+            if forming is not None:
+                self._forming[level] = None
+                self._close(level, forming[None, :])
+
+    def forming(self, timeframe: str) -> Optional[Dict[str, float]]:
+        """
+        :param timeframe: One of this aggregator's timeframes.
+        :return: The bar currently forming at that timeframe, if any.
+        """
+        forming = self._forming[self.timeframes.index(timeframe)]
+        if forming is None:
+            return None
+        return {name: float(forming[i]) for i, name in enumerate(BAR_FIELDS)}
+
+    def _aggregate(self, level: int, bars: np.ndarray) -> None:
+        """
+        Fold chronological bars into the timeframe at ``level``, closing completed buckets.
+        """
+        seconds = self._seconds[level]
+        buckets = (bars[:, _START] - self.origin) // seconds * seconds + self.origin
+        first = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        last = np.r_[first[1:] - 1, len(bars) - 1]
+
+        aggregated = np.empty((len(first), len(BAR_FIELDS)))
+        aggregated[:, _START] = buckets[first]
+        aggregated[:, _OPEN] = bars[first, _OPEN]
+        aggregated[:, _HIGH] = np.maximum.reduceat(bars[:, _HIGH], first)
+        aggregated[:, _LOW] = np.minimum.reduceat(bars[:, _LOW], first)
+        aggregated[:, _CLOSE] = bars[last, _CLOSE]
+        aggregated[:, _VOLUME] = np.add.reduceat(bars[:, _VOLUME], first)
+
+        forming = self._forming[level]
+        if forming is not None:
+            if forming[_START] == aggregated[0, _START]:
+                head = aggregated[0]
+                head[_OPEN] = forming[_OPEN]
+                head[_HIGH] = max(head[_HIGH], forming[_HIGH])
+                head[_LOW] = min(head[_LOW], forming[_LOW])
+                head[_VOLUME] += forming[_VOLUME]
+            else:
+                aggregated = np.vstack([forming, aggregated])
+
+        self._forming[level] = aggregated[-1].copy()
+        if len(aggregated) > 1:
+            self._close(level, aggregated[:-1])
+
+    def _advance(self, watermark: float) -> None:
+        """
+        Close coarser bars whose bucket ended before ``watermark``, the start of the newest input.
+        """
+        for level in range(1, len(self.timeframes)):
+            forming = self._forming[level]
+            if forming is not None and forming[_START] + self._seconds[level] <= watermark:
+                self._forming[level] = None
+                self._close(level, forming[None, :])
+
+    def _close(self, level: int, closed: np.ndarray) -> None:
+        """
+        Store closed bars, notify subscribers and feed the next coarser timeframe.
+        """
+        timeframe = self.timeframes[level]
+        self.series[timeframe].append(closed)
+        if self._subscribers[timeframe]:
+            bars = _as_bars(closed)
+            for callback in self._subscribers[timeframe]:
+                callback(self.symbol, timeframe, bars)
+        if level + 1 < len(self.timeframes):
+            self._aggregate(level + 1, closed)
+
+
+class BarFeed:
+    """
+    Bar aggregators for every symbol of a world, with per-timeframe subscriptions.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        timeframes: Sequence[Union[str, int]] = ("1m", "5m", "1h", "1d"),
+        capacity: int = 10000,
+        origin: int = 0
+    ):
+        """
+        :param symbols: The symbols to aggregate.
+        :param timeframes: The timeframes to build for every symbol.
+        :param capacity: Closed bars kept per symbol and timeframe.
+        :param origin: Epoch offset (in seconds) that buckets are aligned to.
+        """
+        self.aggregators: Dict[str, BarAggregator] = {
+            symbol: BarAggregator(symbol, timeframes, capacity, origin) for symbol in symbols
+        }
+
+    @property
+    def timeframes(self) -> List[str]:
+        return next(iter(self.aggregators.values())).timeframes if self.aggregators else []
+
+    def subscribe(self, timeframe: str, callback: BarCallback, symbols: Optional[Sequence[str]] = None) -> None:
+        """
+        :param timeframe: The timeframe to receive.
+        :param callback: Called as ``callback(symbol, timeframe, bars)`` when bars close.
+        :param symbols: Restrict the subscription to these symbols. Defaults to all.
+        """
+        for symbol in symbols if symbols is not None else self.aggregators:
+            self.aggregators[symbol].subscribe(timeframe, callback)
+
+    def update_bars(self, symbol: str, *columns: np.ndarray) -> None:
+        """
+        :param symbol: The symbol the bars belong to.
+        :param columns: timestamps, open, high, low, close and volume arrays.
+        """
+        self.aggregators[symbol].update_bars(*columns)
+
+    def update_ticks(self, symbol: str, timestamps: np.ndarray, prices: np.ndarray, sizes: np.ndarray) -> None:
+        """
+        :param symbol: The symbol the trades belong to.
+        :param timestamps: Epoch seconds of each trade.
+        :param prices: Trade prices.
+        :param sizes: Trade sizes.
+        """
+        self.aggregators[symbol].update_ticks(timestamps, prices, sizes)
+
+    def latest(self, symbol: str, timeframe: str, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        :param symbol: The symbol.
+        :param timeframe: The timeframe.
+        :param n: The number of most recent closed bars.
+        :return: The bars as column arrays, oldest first.
+        """
+        return self.aggregators[symbol].series[timeframe].latest(n)
+
+    def flush(self) -> None:
+        """
+        Close every forming bar of every symbol.
+        """
+        for aggregator in self.aggregators.values():
+            aggregator.flush()
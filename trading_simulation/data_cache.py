@@ -0,0 +1,193 @@
+# trading_simulation/data_cache.py
+
+#######################################
+# IMPORTS
+#######################################
+import logging
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+#######################################
+# CLASSES
+#######################################
+class EpisodeArrays(NamedTuple):
+    """Read-only inputs of FinRL's array-based StockTradingEnv for one window."""
+    price: np.ndarray       # (n_days, n_tickers)
+    tech: np.ndarray        # (n_days, n_tickers * n_indicators), grouped by ticker
+    turbulence: np.ndarray  # (n_days,)
+
+
+class EpisodeCache:
+    """
+    Serves date windows of a processed FinRL frame without re-splitting it.
+
+    The frame is sorted once and converted into contiguous (day, ticker) arrays; the row
+    offset of every date is then implicit, so any [start, end) window is a zero-copy slice.
+    Window frames and episode arrays are memoized, so every env and walk-forward fold that
+    uses the same window shares one materialization.
+    """
+
+    def __init__(
+        self,
+        processed_df: pd.DataFrame,
+        tech_indicators: List[str],
+        date_col: str = "date",
+        tic_col: str = "tic",
+        price_col: str = "close",
+        turbulence_col: str = "turbulence"
+    ):
+        """
+        Constructor for the EpisodeCache.
+
+        :param processed_df: Output of FinRL's FeatureEngineer, with one row per (date, ticker).
+        :param tech_indicators: The technical indicator columns fed to the env.
+        :param date_col: The date column.
+        :param tic_col: The ticker column.
+        :param price_col: The price column used as the env's price array.
+        :param turbulence_col: The turbulence column used as the env's risk indicator.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.date_col = date_col
+        self.price_col = price_col
+        self.tech_indicators = list(tech_indicators)
+        self.turbulence_col = turbulence_col
+
+        self._frame = processed_df.sort_values([date_col, tic_col], ignore_index=True)
+        self.dates = self._frame[date_col].unique()
+        self.tickers = list(self._frame[tic_col].iloc[: len(self._frame) // max(len(self.dates), 1)])
+        if len(self._frame) != len(self.dates) * len(self.tickers):
+            raise ValueError("processed_df must have exactly one row per date and ticker")
+        # Every day must hold the same tickers, or reshaping would mix up their columns
+        tickers_by_day = self._frame[tic_col].to_numpy().reshape(len(self.dates), len(self.tickers))
+        if not (tickers_by_day == np.array(self.tickers, dtype=object)).all():
+            raise ValueError("processed_df must have the same tickers on every date")
+
+        self._fields: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._bounds: Dict[Tuple[Any, Any], Tuple[int, int]] = {}
+        self._frames: Dict[Tuple[int, int], pd.DataFrame] = {}
+        self._episodes: Dict[Tuple[int, int], EpisodeArrays] = {}
+        self.logger.debug(f"EpisodeCache built for {len(self.dates)} days x {len(self.tickers)} tickers.")
+
+    def bounds(self, start: Any, end: Any) -> Tuple[int, int]:
+        """
+        :param start: First date of the window (inclusive). None starts at the first cached day.
+        :param end: Last date of the window (exclusive), as in FinRL's ``data_split``.
+                    None runs to the last cached day.
+        :return: The [first, last) day offsets of the window.
+        """
+        key = (start, end)
+        bounds = self._bounds.get(key)
+        if bounds is None:
+            lo = 0 if start is None else int(np.searchsorted(self.dates, self._as_date(start), side="left"))
+            hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, self._as_date(end), side="left"))
+            bounds = self._bounds[key] = (lo, max(lo, hi))
+        return bounds
+
+    def field(self, column: str, start: Any = None, end: Any = None) -> np.ndarray:
+        """
+        A per-ticker column as a read-only (n_days, n_tickers) array, or a view of a window of it.
+
+        :param column: The column to reshape (e.g. "close", "high", "volume").
+        :param start: First date of the window. None starts at the first cached day.
+        :param end: Last date of the window (exclusive). None runs to the last cached day.
+        :return: The array or window view.
+        """
+        lo, hi = self.bounds(start, end)
+        return self._field((column,))[lo:hi]
+
+    def frame(self, start: Any, end: Any) -> pd.DataFrame:
+        """
+        The rows of a window, indexed by day number like FinRL's ``data_split``.
+        The result is shared between callers and must not be modified.
+
+        :param start: First date of the window (inclusive).
+        :param end: Last date of the window (exclusive).
+        :return: The window's frame.
+        """
+        lo, hi = self.bounds(start, end)
+        frame = self._frames.get((lo, hi))
+        if frame is None:
+            n_tickers = len(self.tickers)
+            frame = self._frame.iloc[lo * n_tickers:hi * n_tickers]
+            frame = frame.set_axis(np.repeat(np.arange(hi - lo), n_tickers), axis=0)
+            self._frames[(lo, hi)] = frame
+        return frame
+
+    def episode(self, start: Any, end: Any) -> EpisodeArrays:
+        """
+        The env input arrays of a window, as read-only views of the cached arrays.
+
+        :param start: First date of the window (inclusive).
+        :param end: Last date of the window (exclusive).
+        :return: The window's EpisodeArrays.
+        """
+        lo, hi = self.bounds(start, end)
+        episode = self._episodes.get((lo, hi))
+        if episode is None:
+            episode = self._episodes[(lo, hi)] = EpisodeArrays(
+                price=self._field((self.price_col,))[lo:hi],
+                tech=self._field(tuple(self.tech_indicators))[lo:hi],
+                turbulence=self._field((self.turbulence_col,))[lo:hi, 0],
+            )
+        return episode
+
+    def env_config(self, start: Any, end: Any, if_train: bool = False) -> Dict[str, Any]:
+        """
+        :param start: First date of the window (inclusive).
+        :param end: Last date of the window (exclusive).
+        :param if_train: Whether the env is used for training.
+        :return: The array entries of a FinRL ``StockTradingEnv`` config for the window.
+        """
+        episode = self.episode(start, end)
+        return {
+            "price_array": episode.price,
+            "tech_array": episode.tech,
+            "turbulence_array": episode.turbulence,
+            "if_train": if_train,
+        }
+
+    def walk_forward(
+        self,
+        train_days: int,
+        test_days: int,
+        step_days: Optional[int] = None
+    ) -> Iterator[Tuple[Tuple[Any, Any], Tuple[Any, Any]]]:
+        """
+        Rolling train/test windows over the cached dates. Windows are expressed as
+        [start, end) date pairs that can be passed to ``frame``, ``episode`` or ``env_config``.
+
+        :param train_days: Trading days in each training window.
+        :param test_days: Trading days in each test window.
+        :param step_days: Days between fold starts. Defaults to ``test_days``.
+        :return: An iterator of ((train_start, train_end), (test_start, test_end)); the last
+                 test window may end with None, meaning the end of the data.
+        """
+        step_days = step_days or test_days
+        n_days = len(self.dates)
+        for first in range(0, n_days - train_days - test_days + 1, step_days):
+            split = first + train_days
+            last = split + test_days
+            test_end = self.dates[last] if last < n_days else None
+            yield (self.dates[first], self.dates[split]), (self.dates[split], test_end)
+
+    def _field(self, columns: Tuple[str, ...]) -> np.ndarray:
+        """
+        Reshape columns into a contiguous, read-only (n_days, n_tickers * n_columns) array, once.
+        """
+        array = self._fields.get(columns)
+        if array is None:
+            values = self._frame[list(columns)].to_numpy(dtype=np.float64)
+            array = np.ascontiguousarray(values.reshape(len(self.dates), len(self.tickers) * len(columns)))
+            array.flags.writeable = False
+            self._fields[columns] = array
+        return array
+
+    def _as_date(self, value: Any) -> Any:
+        """
+        Convert a window bound to the dtype of the date column.
+        """
+        if self.dates.dtype.kind == "M":
+            return np.datetime64(value).astype(self.dates.dtype)
+        return value
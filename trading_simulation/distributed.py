@@ -0,0 +1,828 @@
+# trading_simulation/distributed.py
+
+#######################################
+# IMPORTS
+#######################################
+import logging
+import multiprocessing
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Local module imports
+from trading_simulation.analytics import PerformanceTracker
+from trading_simulation.population import PopulationSpec
+
+#######################################
+# CONSTANTS
+#######################################
+# Frame header: magic, message type, payload length
+_FRAME = struct.Struct("<2sBI")
+_MAGIC = b"SD"
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+# Message types
+MSG_REGISTER, MSG_HEARTBEAT, MSG_TASK, MSG_RESULT, MSG_ERROR, MSG_SHUTDOWN = range(1, 7)
+
+# Value tags of the binary encoding
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _BYTES, _LIST, _DICT, _ARRAY = b"NTFifsbldA"
+_INT_STRUCT = struct.Struct("<q")
+_FLOAT_STRUCT = struct.Struct("<d")
+_LEN_STRUCT = struct.Struct("<I")
+
+# Summary metrics that add up across shards; the others are averaged, weighted by starting equity
+_ADDITIVE_METRICS = ("equity", "pnl")
+# Summary metrics recomputed from the combined world equity series
+_SERIES_METRICS = ("sharpe", "volatility", "max_drawdown", "hit_rate")
+
+# Task name -> function(params) -> result, run by workers
+TaskHandler = Callable[[Dict[str, Any]], Any]
+_TASKS: Dict[str, TaskHandler] = {}
+
+#######################################
+# FUNCTIONS (encoding)
+#######################################
+def encode(value: Any) -> bytes:
+    """
+    Encode a value into the protocol's compact, tagged binary format.
+
+    Supported types are None, bool, int, float, str, bytes, lists and tuples, dicts and
+    numpy arrays (sent as raw buffers) and scalars. Nothing is pickled, so a peer can
+    only ever send data, never code.
+
+    :param value: The value to encode.
+    :return: The encoded bytes.
+    """
+    out = bytearray()
+    _encode_into(out, value)
+    return bytes(out)
+
+
+def decode(data: bytes) -> Any:
+    """
+    :param data: Bytes produced by ``encode``.
+    :return: The decoded value. Tuples come back as lists.
+    """
+    view = memoryview(data)
+    value, offset = _decode_from(view, 0)
+    if offset != len(view):
+        raise ValueError("trailing bytes after encoded value")
+    return value
+
+
+def _encode_into(out: bytearray, value: Any) -> None:
+    if value is None:
+        out.append(_NONE)
+    elif isinstance(value, (bool, np.bool_)):
+        out.append(_TRUE if value else _FALSE)
+    elif isinstance(value, (int, np.integer)):
+        out.append(_INT)
+        out += _INT_STRUCT.pack(int(value))
+    elif isinstance(value, (float, np.floating)):
+        out.append(_FLOAT)
+        out += _FLOAT_STRUCT.pack(float(value))
+    elif isinstance(value, str):
+        raw = value.encode("utf-8")
+        out.append(_STR)
+        out += _LEN_STRUCT.pack(len(raw)) + raw
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        raw = bytes(value)
+        out.append(_BYTES)
+        out += _LEN_STRUCT.pack(len(raw)) + raw
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        out += _LEN_STRUCT.pack(len(value))
+        for item in value:
+            _encode_into(out, item)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        out += _LEN_STRUCT.pack(len(value))
+        for key, item in value.items():
+            _encode_into(out, key)
+            _encode_into(out, item)
+    elif isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError("object arrays cannot be encoded")
+        array = np.ascontiguousarray(value)
+        dtype = array.dtype.str.encode("ascii")
+        out.append(_ARRAY)
+        out += bytes([len(dtype)]) + dtype + bytes([array.ndim])
+        out += struct.pack(f"<{array.ndim}q", *array.shape)
+        out += _LEN_STRUCT.pack(array.nbytes) + array.tobytes()
+    else:
+        raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+
+
+def _decode_from(view: memoryview, offset: int) -> Tuple[Any, int]:
+    tag = view[offset]
+    offset += 1
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE:
+        return True, offset
+    if tag == _FALSE:
+        return False, offset
+    if tag == _INT:
+        return _INT_STRUCT.unpack_from(view, offset)[0], offset + _INT_STRUCT.size
+    if tag == _FLOAT:
+        return _FLOAT_STRUCT.unpack_from(view, offset)[0], offset + _FLOAT_STRUCT.size
+    if tag in (_STR, _BYTES):
+        (length,) = _LEN_STRUCT.unpack_from(view, offset)
+        offset += _LEN_STRUCT.size
+        raw = bytes(view[offset:offset + length])
+        return (raw.decode("utf-8") if tag == _STR else raw), offset + length
+    if tag == _LIST:
+        (count,) = _LEN_STRUCT.unpack_from(view, offset)
+        offset += _LEN_STRUCT.size
+        items = []
+        for _ in range(count):
+            item, offset = _decode_from(view, offset)
+            items.append(item)
+        return items, offset
+    if tag == _DICT:
+        (count,) = _LEN_STRUCT.unpack_from(view, offset)
+        offset += _LEN_STRUCT.size
+        mapping = {}
+        for _ in range(count):
+            key, offset = _decode_from(view, offset)
+            mapping[key], offset = _decode_from(view, offset)
+        return mapping, offset
+    if tag == _ARRAY:
+        dtype_len = view[offset]
+        dtype = np.dtype(bytes(view[offset + 1:offset + 1 + dtype_len]).decode("ascii"))
+        offset += 1 + dtype_len
+        ndim = view[offset]
+        shape = struct.unpack_from(f"<{ndim}q", view, offset + 1)
+        offset += 1 + 8 * ndim
+        (nbytes,) = _LEN_STRUCT.unpack_from(view, offset)
+        offset += _LEN_STRUCT.size
+        array = np.frombuffer(view[offset:offset + nbytes], dtype=dtype).reshape(shape).copy()
+        return array, offset + nbytes
+    raise ValueError(f"Unknown value tag {tag!r} at offset {offset - 1}")
+
+#######################################
+# FUNCTIONS (framing and addresses)
+#######################################
+def pack_frame(message_type: int, payload: Any) -> bytes:
+    """
+    :param message_type: One of the ``MSG_*`` constants.
+    :param payload: The value to send.
+    :return: A length-prefixed frame ready to write to a socket.
+    """
+    body = encode(payload)
+    return _FRAME.pack(_MAGIC, message_type, len(body)) + body
+
+
+def unpack_frames(buffer: bytearray) -> List[Tuple[int, Any]]:
+    """
+    Remove every complete frame from the front of a receive buffer.
+
+    :param buffer: Bytes received so far; consumed frames are deleted from it.
+    :return: The (message type, payload) of each complete frame.
+    """
+    frames = []
+    offset = 0
+    while len(buffer) - offset >= _FRAME.size:
+        magic, message_type, length = _FRAME.unpack_from(buffer, offset)
+        if magic != _MAGIC or length > MAX_FRAME_BYTES:
+            raise ValueError("Malformed frame")
+        end = offset + _FRAME.size + length
+        if len(buffer) < end:
+            break
+        frames.append((message_type, decode(bytes(buffer[offset + _FRAME.size:end]))))
+        offset = end
+    del buffer[:offset]
+    return frames
+
+
+def parse_address(address: str) -> Tuple[int, Any]:
+    """
+    :param address: ``"tcp://host:port"`` or ``"unix:///path/to/socket"``.
+    :return: The socket family and the address to bind or connect to.
+    """
+    if address.startswith("unix://"):
+        return socket.AF_UNIX, address[len("unix://"):]
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid TCP address: {address}")
+        return socket.AF_INET, (host, int(port))
+    raise ValueError(f"Address must start with tcp:// or unix://: {address}")
+
+#######################################
+# FUNCTIONS (tasks)
+#######################################
+def register_task(name: str, handler: TaskHandler) -> None:
+    """
+    Make a task runnable by workers. Workers must register the same tasks as the
+    coordinator expects, e.g. by importing the module that registers them.
+
+    :param name: The task name used in shard payloads.
+    :param handler: Called with the shard's params; its return value must be encodable.
+    """
+    _TASKS[name] = handler
+
+
+def _simulation_task(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one SimulationRunner shard and return its export in wire format.
+
+    :param params: ``total_steps``, an optional ``population`` (PopulationSpec fields) and
+                   an optional ``seed``.
+    """
+    # Imported here so that workers running other tasks do not need TinyTroupe or FinRL
+    from trading_simulation.simulation_runner import SimulationRunner
+
+    population = params.get("population")
+    if population is not None:
+        population = PopulationSpec(**{**population, "risk_params": tuple(population["risk_params"])})
+    results = SimulationRunner().run(
+        total_steps=params.get("total_steps", 50), population=population, seed=params.get("seed")
+    )
+    return export_to_wire(results)
+
+
+register_task("simulation", _simulation_task)
+
+#######################################
+# FUNCTIONS (results)
+#######################################
+def export_to_wire(export: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a ``TradingWorld.export()`` result into plain, encodable columns.
+
+    :param export: The run export (summary, agents, equity_curve and optionally trades).
+    :return: The same content with the DataFrames replaced by dicts of arrays.
+    """
+    if not export:
+        return {}
+    agents = export["agents"]
+    curve = export["equity_curve"]
+    wire = {
+        "summary": dict(export["summary"]),
+        "agents": {"agent": [str(name) for name in agents.index],
+                   **{column: agents[column].to_numpy() for column in agents.columns}},
+        "equity_curve": {"step": curve.index.to_numpy(),
+                         **{str(column): curve[column].to_numpy() for column in curve.columns}},
+    }
+    trades = export.get("trades")
+    if trades is not None:
+        wire["trades"] = {str(column): trades[column].to_numpy() for column in trades.columns}
+    return wire
+
+
+def merge_exports(exports: Sequence[Dict[str, Any]], periods_per_year: float = 252) -> Dict[str, Any]:
+    """
+    Aggregate the wire-format exports of several shards into one run export.
+
+    Agent metrics are concatenated, the "world" equity curve is the sum of the shards'
+    (on the steps all shards sampled) and equity and P&L add up. Sharpe, volatility, max
+    drawdown and hit rate are recomputed from that combined world curve; they are exact
+    while the shards' curves are undecimated (runs up to ``max_samples`` steps). Turnover,
+    weighted by each shard's starting equity, is the world's traded notional over its
+    starting equity. The risk tolerance is the mean over all agents, and the shards' trade
+    logs are concatenated with their agent indices offset to the merged agent table. The
+    individual shard summaries are kept under ``shards``.
+
+    :param exports: Results of ``export_to_wire``, one per shard.
+    :param periods_per_year: Steps per year, as used by the shards' analytics.
+    :return: A dict with ``summary``, ``agents``, ``equity_curve`` and ``trades`` (as DataFrames)
+             and ``shards``.
+    """
+    exports = [export for export in exports if export]
+    if not exports:
+        return {}
+
+    # Shards built from the same traders reuse agent names; qualify them with the shard number
+    names = [list(export["agents"]["agent"]) for export in exports]
+    qualify = len({name for shard in names for name in shard}) < sum(len(shard) for shard in names)
+
+    agents, curves, world, trades = [], [], [], []
+    first_agent = 0
+    for shard, (export, shard_names) in enumerate(zip(exports, names)):
+        labels = [f"{shard}:{name}" if qualify else name for name in shard_names]
+        columns = {k: v for k, v in export["agents"].items() if k != "agent"}
+        agents.append(pd.DataFrame(columns, index=pd.Index(labels, name="agent")))
+        steps = pd.Index(export["equity_curve"]["step"], name="step")
+        curves.append(pd.DataFrame(
+            {label: export["equity_curve"][name] for label, name in zip(labels, shard_names)}, index=steps
+        ))
+        world.append(pd.Series(export["equity_curve"]["world"], index=steps))
+        if "trades" in export:
+            shard_trades = pd.DataFrame(export["trades"])
+            shard_trades["agent"] += first_agent
+            trades.append(shard_trades)
+        first_agent += len(shard_names)
+    equity_curve = pd.concat(curves, axis=1, join="inner")
+    equity_curve["world"] = pd.concat(world, axis=1, join="inner").sum(axis=1).reindex(equity_curve.index)
+    agents = pd.concat(agents)
+
+    summaries = [export["summary"] for export in exports]
+    starts = np.array([summary.get("equity", 0.0) - summary.get("pnl", 0.0) for summary in summaries])
+    weights = starts / starts.sum() if starts.sum() > 0 else np.full(len(starts), 1.0 / len(starts))
+    summary: Dict[str, float] = {}
+    for name in summaries[0]:
+        values = np.array([shard.get(name, 0.0) for shard in summaries], dtype=np.float64)
+        summary[name] = float(values.sum() if name in _ADDITIVE_METRICS else values @ weights)
+    if "total_return" in summary and starts.sum() > 0:
+        summary["total_return"] = summary["pnl"] / float(starts.sum())
+    if "steps" in summary:
+        summary["steps"] = int(max(shard["steps"] for shard in summaries))
+    if "risk_tolerance" in summary and "risk_tolerance" in agents:
+        summary["risk_tolerance"] = float(agents["risk_tolerance"].mean())
+
+    # Replay the combined world series, one sample per period of the curve's stride
+    world_equity = equity_curve["world"].to_numpy()
+    if len(world_equity) > 1:
+        stride = max(int(np.median(np.diff(equity_curve.index.to_numpy()))), 1)
+        tracker = PerformanceTracker(1, periods_per_year=periods_per_year / stride, max_samples=len(world_equity))
+        for equity in world_equity:
+            tracker.update(equity[None])
+        world_metrics = tracker.metrics()
+        for name in _SERIES_METRICS:
+            if name in summary:
+                summary[name] = float(world_metrics[name][0])
+
+    return {
+        "summary": summary,
+        "agents": agents,
+        "equity_curve": equity_curve,
+        "trades": pd.concat(trades, ignore_index=True) if trades else None,
+        "shards": summaries,
+    }
+
+
+def split_population(spec: PopulationSpec, n_shards: int) -> List[PopulationSpec]:
+    """
+    Split a population spec into agent groups of near-equal size, one per shard.
+    Each group gets a distinct name prefix and seed so agents stay unique across shards.
+
+    :param spec: The full population.
+    :param n_shards: The number of groups.
+    :return: The per-shard specs (empty groups are dropped).
+    """
+    if n_shards < 1:
+        raise ValueError("n_shards must be positive")
+    sizes = np.full(n_shards, spec.size // n_shards)
+    sizes[: spec.size % n_shards] += 1
+    return [
+        replace(
+            spec,
+            size=int(size),
+            name_prefix=f"{spec.name_prefix}{shard}_",
+            seed=None if spec.seed is None else spec.seed + shard,
+        )
+        for shard, size in enumerate(sizes) if size
+    ]
+
+
+def simulation_shards(
+    total_steps: int,
+    populations: Sequence[Optional[PopulationSpec]],
+    seed: Optional[int] = None
+) -> List["Shard"]:
+    """
+    :param total_steps: Steps each shard's world runs for.
+    :param populations: One population (or None for the default traders) per shard.
+    :param seed: The run's seed; shard ``i`` runs with ``seed + i``. None lets each shard draw its own.
+    :return: Shards for the built-in "simulation" task.
+    """
+    return [
+        Shard(
+            shard_id=index,
+            task="simulation",
+            params={
+                "total_steps": total_steps,
+                "population": None if spec is None else asdict(spec),
+                "seed": None if seed is None else seed + index,
+            },
+        )
+        for index, spec in enumerate(populations)
+    ]
+
+#######################################
+# CLASSES
+#######################################
+@dataclass
+class Shard:
+    """One unit of work dispatched to a worker."""
+    shard_id: int
+    task: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+
+
+@dataclass
+class _WorkerState:
+    """Coordinator-side view of a connected worker."""
+    sock: socket.socket
+    worker_id: str = ""
+    last_seen: float = field(default_factory=time.monotonic)
+    shard: Optional[Shard] = None
+    buffer: bytearray = field(default_factory=bytearray)
+    registered: bool = False
+
+
+class Coordinator:
+    """
+    Dispatches shards to connected workers and gathers their results.
+
+    Each worker runs one shard at a time. Workers send heartbeats while they work; a
+    worker that disconnects, or stays silent for longer than ``heartbeat_timeout``, is
+    dropped and its shard is re-dispatched to another worker, up to ``max_attempts``
+    times. The event loop is single-threaded and runs inside ``run``.
+    """
+
+    def __init__(
+        self,
+        address: str = "tcp://127.0.0.1:0",
+        heartbeat_timeout: float = 10.0,
+        max_attempts: int = 3,
+        backlog: int = 64
+    ):
+        """
+        Constructor for the Coordinator. The listening socket is bound immediately so
+        workers can connect before ``run`` is called.
+
+        :param address: ``tcp://host:port`` (port 0 picks a free port) or ``unix:///path``.
+        :param heartbeat_timeout: Seconds of silence after which a worker is considered lost.
+        :param max_attempts: Dispatches per shard before the run fails.
+        :param backlog: Pending connections the listening socket accepts.
+        """
+        if heartbeat_timeout <= 0:
+            raise ValueError("heartbeat_timeout must be positive")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be positive")
+        self.logger = logging.getLogger(__name__)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+
+        family, bind_address = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.unlink(bind_address)
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(bind_address)
+        self._server.listen(backlog)
+        self._server.setblocking(False)
+        if family == socket.AF_UNIX:
+            self.address = f"unix://{bind_address}"
+        else:
+            host, port = self._server.getsockname()[:2]
+            self.address = f"tcp://{host}:{port}"
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._workers: Dict[socket.socket, _WorkerState] = {}
+        self.redispatched = 0
+
+    @property
+    def n_workers(self) -> int:
+        """The number of registered, live workers."""
+        return sum(state.registered for state in self._workers.values())
+
+    def wait_for_workers(self, n_workers: int, timeout: float = 30.0) -> None:
+        """
+        Block until ``n_workers`` workers have registered.
+
+        :param n_workers: The number of workers to wait for.
+        :param timeout: Seconds to wait before raising TimeoutError.
+        """
+        deadline = time.monotonic() + timeout
+        while self.n_workers < n_workers:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Only {self.n_workers} of {n_workers} workers registered")
+            self._poll(min(remaining, 0.1), {}, deque())
+
+    def run(self, shards: Sequence[Shard], timeout: Optional[float] = None) -> Dict[int, Any]:
+        """
+        Dispatch shards until every one has a result.
+
+        :param shards: The work to distribute. Shard ids must be unique.
+        :param timeout: Overall seconds allowed, or None to wait indefinitely.
+        :return: The result of every shard, keyed by shard id.
+        """
+        if len({shard.shard_id for shard in shards}) != len(shards):
+            raise ValueError("Shard ids must be unique")
+        pending: Deque[Shard] = deque(shards)
+        results: Dict[int, Any] = {}
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.logger.info(f"Coordinator at {self.address} dispatching {len(shards)} shards.")
+
+        while len(results) < len(shards):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"{len(shards) - len(results)} shards unfinished after {timeout}s")
+            self._dispatch(pending)
+            self._poll(min(self.heartbeat_timeout / 4, 0.5), results, pending)
+            self._reap(pending)
+        self.logger.info(f"All {len(shards)} shards complete ({self.redispatched} re-dispatched).")
+        return results
+
+    def close(self) -> None:
+        """
+        Tell every worker to shut down and stop listening.
+        """
+        for state in list(self._workers.values()):
+            try:
+                state.sock.sendall(pack_frame(MSG_SHUTDOWN, None))
+            except OSError:
+                pass
+            self._drop(state)
+        self._selector.unregister(self._server)
+        self._selector.close()
+        self._server.close()
+        family, bind_address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.unlink(bind_address)
+
+    def __enter__(self) -> "Coordinator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _dispatch(self, pending: Deque[Shard]) -> None:
+        """
+        Hand pending shards to idle workers.
+        """
+        for state in list(self._workers.values()):
+            if not pending:
+                return
+            if not state.registered or state.shard is not None:
+                continue
+            shard = pending.popleft()
+            if shard.attempts >= self.max_attempts:
+                raise RuntimeError(f"Shard {shard.shard_id} failed {shard.attempts} times")
+            shard.attempts += 1
+            state.shard = shard
+            try:
+                state.sock.sendall(pack_frame(MSG_TASK, {
+                    "shard_id": shard.shard_id, "task": shard.task, "params": shard.params
+                }))
+            except OSError:
+                self._lose(state, pending, "send failed")
+
+    def _poll(self, timeout: float, results: Dict[int, Any], pending: Deque[Shard]) -> None:
+        """
+        Accept connections and handle every frame received within ``timeout`` seconds.
+        """
+        for key, _ in self._selector.select(timeout):
+            if key.fileobj is self._server:
+                sock, _ = self._server.accept()
+                sock.setblocking(True)
+                state = self._workers[sock] = _WorkerState(sock)
+                self._selector.register(sock, selectors.EVENT_READ, data=state)
+                continue
+            state = key.data
+            if self._workers.get(state.sock) is not state:
+                continue  # dropped earlier in this poll
+            try:
+                data = state.sock.recv(1 << 16)
+            except OSError:
+                data = b""
+            if not data:
+                self._lose(state, pending, "disconnected")
+                continue
+            state.buffer += data
+            state.last_seen = time.monotonic()
+            try:
+                frames = unpack_frames(state.buffer)
+            except ValueError:
+                self._lose(state, pending, "sent a malformed frame")
+                continue
+            for message_type, payload in frames:
+                self._handle(state, message_type, payload, results, pending)
+                if self._workers.get(state.sock) is not state:
+                    break
+
+    def _handle(
+        self,
+        state: _WorkerState,
+        message_type: int,
+        payload: Any,
+        results: Dict[int, Any],
+        pending: Deque[Shard]
+    ) -> None:
+        """
+        Process one message from a worker. A worker whose message does not carry a dict
+        payload is sent an error reply and dropped, and its shard is re-dispatched.
+        """
+        if message_type in (MSG_REGISTER, MSG_RESULT, MSG_ERROR) and not isinstance(payload, dict):
+            reason = f"sent a {type(payload).__name__} payload with message type {message_type}"
+            try:
+                state.sock.sendall(pack_frame(MSG_ERROR, {"error": reason}))
+            except OSError:
+                pass
+            self._lose(state, pending, reason)
+            return
+        if message_type == MSG_REGISTER:
+            state.worker_id = str(payload.get("worker_id", ""))
+            state.registered = True
+            self.logger.info(f"Worker {state.worker_id} registered.")
+        elif message_type in (MSG_RESULT, MSG_ERROR):
+            shard = state.shard
+            if shard is None or payload.get("shard_id") != shard.shard_id:
+                return
+            state.shard = None
+            if message_type == MSG_RESULT:
+                results[shard.shard_id] = payload.get("result")
+            else:
+                self.logger.warning(f"Shard {shard.shard_id} failed on {state.worker_id}: {payload.get('error')}")
+                pending.append(shard)
+
+    def _reap(self, pending: Deque[Shard]) -> None:
+        """
+        Drop workers whose heartbeats stopped.
+        """
+        now = time.monotonic()
+        for state in list(self._workers.values()):
+            if now - state.last_seen > self.heartbeat_timeout:
+                self._lose(state, pending, f"missed heartbeats for {now - state.last_seen:.1f}s")
+
+    def _lose(self, state: _WorkerState, pending: Deque[Shard], reason: str) -> None:
+        """
+        Drop a worker and queue its shard for re-dispatch.
+        """
+        self.logger.warning(f"Lost worker {state.worker_id or '<unregistered>'}: {reason}")
+        if state.shard is not None:
+            pending.appendleft(state.shard)
+            self.redispatched += 1
+            state.shard = None
+        self._drop(state)
+
+    def _drop(self, state: _WorkerState) -> None:
+        if self._workers.pop(state.sock, None) is not None:
+            self._selector.unregister(state.sock)
+        state.sock.close()
+
+
+class Worker:
+    """
+    Connects to a Coordinator, runs the shards it receives and sends back their results.
+    A background thread keeps sending heartbeats while a shard is running.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        worker_id: Optional[str] = None,
+        heartbeat_interval: float = 2.0,
+        connect_timeout: float = 30.0
+    ):
+        """
+        Constructor for the Worker.
+
+        :param address: The coordinator's address.
+        :param worker_id: A name for logs. Defaults to the host, pid and a random suffix.
+        :param heartbeat_interval: Seconds between heartbeats; keep it well below the
+                                   coordinator's ``heartbeat_timeout``.
+        :param connect_timeout: Seconds to keep retrying the initial connection.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.address = address
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.heartbeat_interval = heartbeat_interval
+        self.connect_timeout = connect_timeout
+        self._send_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.completed = 0
+
+    def serve(self) -> None:
+        """
+        Run shards until the coordinator shuts the worker down or disconnects.
+        """
+        sock = self._connect()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(sock,), daemon=True)
+        try:
+            self._send(sock, MSG_REGISTER, {"worker_id": self.worker_id, "pid": os.getpid()})
+            heartbeat.start()
+            buffer = bytearray()
+            while True:
+                data = sock.recv(1 << 16)
+                if not data:
+                    self.logger.info(f"Worker {self.worker_id}: coordinator closed the connection.")
+                    return
+                buffer += data
+                for message_type, payload in unpack_frames(buffer):
+                    if message_type == MSG_SHUTDOWN:
+                        self.logger.info(f"Worker {self.worker_id} shutting down after {self.completed} shards.")
+                        return
+                    if message_type == MSG_TASK:
+                        self._run_task(sock, payload)
+        except OSError as error:
+            # The coordinator dropped this worker (e.g. after missed heartbeats) or went away
+            self.logger.warning(f"Worker {self.worker_id} lost its coordinator: {error}")
+        finally:
+            self._stopped.set()
+            sock.close()
+
+    def _connect(self) -> socket.socket:
+        """
+        Connect to the coordinator, retrying until ``connect_timeout``.
+        """
+        family, address = parse_address(self.address)
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            try:
+                sock.connect(address)
+                return sock
+            except OSError:
+                sock.close()
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+
+    def _run_task(self, sock: socket.socket, payload: Dict[str, Any]) -> None:
+        """
+        Execute one shard and report its result or error.
+        """
+        shard_id = payload["shard_id"]
+        handler = _TASKS.get(payload["task"])
+        try:
+            if handler is None:
+                raise KeyError(f"Unknown task {payload['task']!r}")
+            result = handler(payload.get("params") or {})
+            self._send(sock, MSG_RESULT, {"shard_id": shard_id, "result": result})
+            self.completed += 1
+        except Exception:
+            self.logger.exception(f"Worker {self.worker_id} failed shard {shard_id}")
+            self._send(sock, MSG_ERROR, {"shard_id": shard_id, "error": traceback.format_exc()})
+
+    def _heartbeat(self, sock: socket.socket) -> None:
+        while not self._stopped.wait(self.heartbeat_interval):
+            try:
+                self._send(sock, MSG_HEARTBEAT, None)
+            except OSError:
+                return
+
+    def _send(self, sock: socket.socket, message_type: int, payload: Any) -> None:
+        frame = pack_frame(message_type, payload)
+        with self._send_lock:
+            sock.sendall(frame)
+
+#######################################
+# FUNCTIONS (local workers)
+#######################################
+def run_worker(address: str, heartbeat_interval: float = 2.0) -> None:
+    """
+    Entry point for a worker process.
+
+    :param address: The coordinator's address.
+    :param heartbeat_interval: Seconds between heartbeats.
+    """
+    Worker(address, heartbeat_interval=heartbeat_interval).serve()
+
+
+def launch_local_workers(
+    address: str,
+    n_workers: int,
+    heartbeat_interval: float = 2.0,
+    start_method: Optional[str] = None
+) -> List[multiprocessing.Process]:
+    """
+    Start worker processes on this machine, e.g. for tests or a single-box run.
+
+    Workers only run tasks registered in their own process. Under "spawn" or "forkserver"
+    that means the tasks registered when this module is imported; "fork" also inherits
+    tasks registered at runtime (e.g. by a test module).
+
+    :param address: The coordinator's address.
+    :param n_workers: The number of worker processes.
+    :param heartbeat_interval: Seconds between heartbeats.
+    :param start_method: The multiprocessing start method, or None for the platform default.
+    :return: The started processes; they exit when the coordinator closes.
+    """
+    context: Any = multiprocessing.get_context(start_method)
+    processes = [
+        context.Process(target=run_worker, args=(address, heartbeat_interval), daemon=True)
+        for _ in range(n_workers)
+    ]
+    for process in processes:
+        process.start()
+    return processes
+
+
+#######################################
+# MAIN
+#######################################
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m trading_simulation.distributed <tcp://host:port | unix:///path>")
+    run_worker(sys.argv[1])
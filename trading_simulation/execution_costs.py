@@ -0,0 +1,269 @@
+# trading_simulation/execution_costs.py
+
+#######################################
+# IMPORTS
+#######################################
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+#######################################
+# FUNCTIONS (helpers)
+#######################################
+def _group_total(values: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """
+    :param values: One value per fill.
+    :param group: Dense group index of each fill.
+    :return: The sum of ``values`` over each fill's group, one entry per fill.
+    """
+    return np.bincount(group, weights=values, minlength=len(values))[group]
+
+#######################################
+# CLASSES
+#######################################
+@dataclass
+class ExecutionResult:
+    """Per-fill outcome of an execution-cost model. Costs are positive currency amounts."""
+    filled: np.ndarray
+    price: np.ndarray
+    fees: np.ndarray
+    spread: np.ndarray
+    impact: np.ndarray
+
+    @property
+    def total_cost(self) -> np.ndarray:
+        return self.fees + self.spread + self.impact
+
+    @property
+    def cash_delta(self) -> np.ndarray:
+        """
+        :return: The change in cash of each fill: notional paid (or received) plus all costs.
+        """
+        return -self.filled * self.price - self.total_cost
+
+
+class CostModel:
+    """
+    Computes execution costs for a whole step's fills in one vectorized pass.
+    Subclasses implement ``apply``.
+    """
+
+    fee_pct = 0.0
+
+    def apply(
+        self,
+        quantity: np.ndarray,
+        price: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+        volume: Optional[np.ndarray] = None,
+        ticker: Optional[np.ndarray] = None
+    ) -> ExecutionResult:
+        """
+        :param quantity: Signed shares of each fill (positive buys, negative sells).
+        :param price: Reference price of each fill (e.g. the bar close).
+        :param high: Bar high of each fill's ticker, if known.
+        :param low: Bar low of each fill's ticker, if known.
+        :param volume: Bar volume of each fill's ticker, if known.
+        :param ticker: Ticker index of each fill; fills of one ticker share its bar volume.
+                       Defaults to treating every fill as a separate ticker.
+        :return: The ExecutionResult of every fill.
+        """
+        raise NotImplementedError
+
+
+class ProportionalCostModel(CostModel):
+    """
+    A flat fee proportional to notional, equivalent to FinRL's ``transaction_cost_pct``.
+    """
+
+    def __init__(self, fee_pct: float = 0.001):
+        """
+        :param fee_pct: Fee as a fraction of traded notional.
+        """
+        if fee_pct < 0:
+            raise ValueError("fee_pct cannot be negative")
+        self.fee_pct = fee_pct
+
+    def apply(self, quantity, price, high=None, low=None, volume=None, ticker=None) -> ExecutionResult:
+        quantity = np.asarray(quantity, dtype=np.float64)
+        price = np.asarray(price, dtype=np.float64)
+        zeros = np.zeros_like(quantity)
+        return ExecutionResult(
+            filled=quantity,
+            price=price,
+            fees=self.fee_pct * np.abs(quantity) * price,
+            spread=zeros,
+            impact=zeros.copy(),
+        )
+
+
+class ExecutionCostModel(CostModel):
+    """
+    Proportional fees, spread crossing and square-root market impact, with an optional
+    participation cap.
+
+    - Spread: each fill crosses half of an estimated spread of ``spread_fraction * (high - low)``.
+    - Impact: ``impact_coefficient * sigma * price * sqrt(Q / volume)`` per share, where Q is
+      the step's combined shares in the fill's ticker and sigma is the bar's range relative
+      to price unless a volatility is given.
+    - Participation: the step's combined shares in a ticker are capped at
+      ``participation_cap * volume``, allocated to its fills pro rata (rounded down).
+    Components whose inputs are missing (no bar range or volume) cost nothing.
+    """
+
+    def __init__(
+        self,
+        fee_pct: float = 0.001,
+        spread_fraction: float = 0.1,
+        impact_coefficient: float = 0.1,
+        participation_cap: Optional[float] = None,
+        volatility: Optional[float] = None
+    ):
+        """
+        Constructor for the ExecutionCostModel.
+
+        :param fee_pct: Fee as a fraction of traded notional.
+        :param spread_fraction: Estimated quoted spread as a fraction of the bar's high-low range.
+        :param impact_coefficient: Scale of the square-root impact term.
+        :param participation_cap: Maximum fraction of bar volume all fills of a ticker may take together.
+        :param volatility: Fixed per-bar volatility for the impact term, instead of the bar range.
+        """
+        if min(fee_pct, spread_fraction, impact_coefficient) < 0:
+            raise ValueError("cost parameters cannot be negative")
+        if participation_cap is not None and not 0 < participation_cap <= 1:
+            raise ValueError("participation_cap must be in (0, 1]")
+        self.fee_pct = fee_pct
+        self.spread_fraction = spread_fraction
+        self.impact_coefficient = impact_coefficient
+        self.participation_cap = participation_cap
+        self.volatility = volatility
+
+    def apply(self, quantity, price, high=None, low=None, volume=None, ticker=None) -> ExecutionResult:
+        quantity = np.asarray(quantity, dtype=np.float64)
+        price = np.asarray(price, dtype=np.float64)
+        volume = None if volume is None else np.asarray(volume, dtype=np.float64)
+
+        # Fills of one ticker draw on the same bar volume
+        if ticker is None:
+            group = np.arange(len(quantity))
+        else:
+            group = np.unique(np.asarray(ticker), return_inverse=True)[1].reshape(-1)
+
+        filled = quantity
+        if self.participation_cap is not None and volume is not None:
+            limit = np.floor(self.participation_cap * volume)
+            requested = _group_total(np.abs(quantity), group)
+            over = requested > limit
+            scale = np.divide(limit, requested, out=np.ones_like(requested), where=over)
+            filled = np.sign(quantity) * np.where(over, np.floor(np.abs(quantity) * scale), np.abs(quantity))
+        shares = np.abs(filled)
+
+        fees = self.fee_pct * shares * price
+
+        bar_range = None
+        if high is not None and low is not None:
+            bar_range = np.maximum(np.asarray(high, dtype=np.float64) - np.asarray(low, dtype=np.float64), 0.0)
+            spread = 0.5 * self.spread_fraction * bar_range * shares
+        else:
+            spread = np.zeros_like(shares)
+
+        sigma = None
+        if self.volatility is not None:
+            sigma = np.full_like(shares, self.volatility)
+        elif bar_range is not None:
+            sigma = np.divide(bar_range, price, out=np.zeros_like(shares), where=price > 0)
+
+        if volume is not None and sigma is not None:
+            participation = np.divide(
+                _group_total(shares, group), volume, out=np.zeros_like(shares), where=volume > 0
+            )
+            impact = self.impact_coefficient * sigma * price * np.sqrt(participation) * shares
+        else:
+            impact = np.zeros_like(shares)
+
+        return ExecutionResult(filled=filled, price=price, fees=fees, spread=spread, impact=impact)
+
+
+class CostAdjustedEnv:
+    """
+    Wraps FinRL's array-based StockTradingEnv so that its reward reflects a CostModel.
+
+    After each env step the fills are recovered from the change in holdings, and the
+    costs the env did not already charge (beyond its own ``buy_cost_pct``/``sell_cost_pct``)
+    are deducted from the env's cash, total asset and reward. Costs only: the env's own
+    order sizing is left untouched, so the participation cap is not enforced here. Both
+    the 4-value and the 5-value (gymnasium-style) ``step`` returns are passed through.
+    """
+
+    def __init__(
+        self,
+        env: Any,
+        cost_model: CostModel,
+        charged_fee_pct: float = 0.0,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+        volume: Optional[np.ndarray] = None
+    ):
+        """
+        :param env: The StockTradingEnv to wrap.
+        :param cost_model: The cost model to charge.
+        :param charged_fee_pct: The proportional fee the env already applies itself, used only
+                                when the env does not expose ``buy_cost_pct``/``sell_cost_pct``.
+        :param high: Bar highs, shape (n_days, n_tickers), aligned with the env's price array.
+        :param low: Bar lows, same shape.
+        :param volume: Bar volumes, same shape.
+        """
+        self.env = env
+        self.cost_model = cost_model
+        self.charged_fee_pct = charged_fee_pct
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.last_costs: Optional[ExecutionResult] = None
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "env":
+            raise AttributeError(name)
+        return getattr(self.env, name)
+
+    def reset(self, *args, **kwargs) -> Any:
+        self.last_costs = None
+        return self.env.reset(*args, **kwargs)
+
+    def step(self, actions: Any) -> Any:
+        holdings = getattr(self.env, "stocks", None)
+        before = None if holdings is None else np.array(holdings, dtype=np.float64)
+        obs, reward, done, *rest = self.env.step(actions)
+        if before is None or getattr(self.env, "price_ary", None) is None:
+            return (obs, reward, done, *rest)
+
+        day = min(self.env.day, len(self.env.price_ary) - 1)
+        traded = np.asarray(self.env.stocks, dtype=np.float64) - before
+        price = np.asarray(self.env.price_ary[day], dtype=np.float64)
+        costs = self.cost_model.apply(traded, price, *(
+            None if array is None else array[day] for array in (self.high, self.low, self.volume)
+        ))
+        extra = float(costs.total_cost.sum() - self._charged_fees(traded, price))
+        if extra:
+            self.env.amount -= extra
+            if hasattr(self.env, "total_asset"):
+                self.env.total_asset -= extra
+            reward -= extra * getattr(self.env, "reward_scaling", 1.0)
+        self.last_costs = costs
+        return (obs, reward, done, *rest)
+
+    def _charged_fees(self, traded: np.ndarray, price: np.ndarray) -> float:
+        """
+        :param traded: Signed shares traded per ticker in the last step.
+        :param price: The prices the env traded at.
+        :return: The fees the env itself charged for these trades.
+        """
+        buy_cost_pct = getattr(self.env, "buy_cost_pct", self.charged_fee_pct)
+        sell_cost_pct = getattr(self.env, "sell_cost_pct", self.charged_fee_pct)
+        return float(
+            buy_cost_pct * np.maximum(traded, 0.0) @ price + sell_cost_pct * np.maximum(-traded, 0.0) @ price
+        )
@@ -0,0 +1,292 @@
+# trading_simulation/market_stimulus.py
+
+#######################################
+# IMPORTS
+#######################################
+import json
+import struct
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+#######################################
+# CONSTANTS
+#######################################
+MARKET_UPDATE = "MARKET_UPDATE"
+
+# Wire header: magic, version, step, reward, done, observation length, trailer length.
+# Padded to 40 bytes so the float64 observation that follows is 8-byte aligned.
+_WIRE_MAGIC = b"MSTM"
+_WIRE_VERSION = 1
+_WIRE_HEADER = struct.Struct("<4sIqd?3xII4x")
+
+#######################################
+# CLASSES
+#######################################
+class NewsRecord(NamedTuple):
+    """An immutable news item, shared by reference between agents."""
+    headline: str
+    timestamp: Any = None
+    sentiment: Optional[str] = None
+    sentiment_score: Optional[float] = None
+    link: Optional[str] = None
+
+    @classmethod
+    def from_item(cls, item: Mapping[str, Any]) -> "NewsRecord":
+        """
+        :param item: A news dictionary, as produced by the scraper.
+        :return: The equivalent NewsRecord.
+        """
+        return cls(
+            headline=item.get("headline", ""),
+            timestamp=item.get("timestamp"),
+            sentiment=item.get("sentiment"),
+            sentiment_score=item.get("sentiment_score"),
+            link=item.get("link"),
+        )
+
+
+class MarketStimulus:
+    """
+    A read-only market update handed to every agent in a step.
+
+    The observation is a NumPy array over immutable memory, ``info`` is frozen all the way
+    down (mapping proxies, tuples and immutable arrays) and the news are a tuple of
+    NewsRecord, so one instance can be shared by all agents, and kept in their memory,
+    without defensive copies. ``get`` keeps it usable where agents expect the former
+    stimulus dict.
+    """
+
+    __slots__ = ("type", "step", "observation", "reward", "done", "info", "news")
+    type: str
+    step: int
+    observation: np.ndarray
+    reward: float
+    done: bool
+    info: Mapping[str, Any]
+    news: Tuple[NewsRecord, ...]
+
+    def __init__(
+        self,
+        step: int,
+        observation: np.ndarray,
+        reward: float,
+        done: bool,
+        info: Mapping[str, Any],
+        news: Tuple[NewsRecord, ...],
+        stimulus_type: str = MARKET_UPDATE
+    ):
+        """
+        :param step: The market time step this update belongs to.
+        :param observation: A read-only array of the environment observation.
+        :param reward: The environment reward for the step.
+        :param done: Whether the environment episode has ended.
+        :param info: A frozen mapping of extra environment information (see ``freeze_info``).
+        :param news: The news items current at this step.
+        :param stimulus_type: The stimulus type.
+        """
+        object.__setattr__(self, "type", stimulus_type)
+        object.__setattr__(self, "step", step)
+        object.__setattr__(self, "observation", observation)
+        object.__setattr__(self, "reward", reward)
+        object.__setattr__(self, "done", done)
+        object.__setattr__(self, "info", info)
+        object.__setattr__(self, "news", news)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("MarketStimulus is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("MarketStimulus is immutable")
+
+    def __repr__(self) -> str:
+        return f"MarketStimulus(step={self.step}, reward={self.reward}, done={self.done}, news={len(self.news)})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Dict-style access to the stimulus fields.
+
+        :param key: A field name ("observation", "reward", "done", "info", "news", ...).
+        :param default: Returned when the field does not exist.
+        """
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_bytes(self) -> bytes:
+        """
+        :return: The stimulus in its wire format (see ``pack_into``).
+        """
+        buffer = bytearray(self.packed_size())
+        self.pack_into(buffer)
+        return bytes(buffer)
+
+    def packed_size(self) -> int:
+        """
+        :return: The number of bytes ``pack_into`` writes.
+        """
+        return _WIRE_HEADER.size + self.observation.nbytes + len(self._trailer())
+
+    def pack_into(self, buffer: Union[bytearray, memoryview], offset: int = 0) -> int:
+        """
+        Write the stimulus into a buffer, e.g. a ``multiprocessing.shared_memory`` block.
+
+        Layout: a fixed 40-byte little-endian header, the observation as contiguous float64,
+        then a UTF-8 JSON trailer holding the type, info and news.
+
+        :param buffer: A writable buffer with at least ``packed_size()`` bytes after ``offset``.
+        :param offset: Where to start writing.
+        :return: The number of bytes written.
+        """
+        trailer = self._trailer()
+        observation = np.ascontiguousarray(self.observation, dtype=np.float64).reshape(-1)
+        _WIRE_HEADER.pack_into(
+            buffer, offset, _WIRE_MAGIC, _WIRE_VERSION, self.step, self.reward, self.done,
+            observation.shape[0], len(trailer)
+        )
+        start = offset + _WIRE_HEADER.size
+        target = np.frombuffer(buffer, dtype=np.float64, count=observation.shape[0], offset=start)
+        target[:] = observation
+        start += observation.nbytes
+        buffer[start:start + len(trailer)] = trailer
+        return start + len(trailer) - offset
+
+    @classmethod
+    def from_buffer(cls, buffer: Union[bytes, bytearray, memoryview], offset: int = 0) -> "MarketStimulus":
+        """
+        Read a stimulus written by ``pack_into``. The observation is a read-only view into
+        ``buffer``, so no array data is copied.
+
+        :param buffer: The buffer holding the packed stimulus.
+        :param offset: Where the packed stimulus starts.
+        :return: The decoded MarketStimulus.
+        """
+        magic, version, step, reward, done, obs_len, trailer_len = _WIRE_HEADER.unpack_from(buffer, offset)
+        if magic != _WIRE_MAGIC or version != _WIRE_VERSION:
+            raise ValueError("Buffer does not hold a packed MarketStimulus")
+        start = offset + _WIRE_HEADER.size
+        observation = np.frombuffer(buffer, dtype=np.float64, count=obs_len, offset=start)
+        observation.flags.writeable = False
+        start += observation.nbytes
+        trailer = json.loads(bytes(buffer[start:start + trailer_len]).decode("utf-8"))
+        return cls(
+            step=step,
+            observation=observation,
+            reward=reward,
+            done=done,
+            info=freeze_info(trailer["info"]),
+            news=tuple(NewsRecord(*record) for record in trailer["news"]),
+            stimulus_type=trailer["type"],
+        )
+
+    def _trailer(self) -> bytes:
+        payload = {"type": self.type, "info": dict(self.info), "news": [list(record) for record in self.news]}
+        return json.dumps(payload, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+class StimulusBuilder:
+    """
+    Creates one MarketStimulus per step. The observation is copied once per step into
+    immutable memory shared by all agents, so a stimulus stays valid for as long as any
+    agent keeps it (e.g. in its episodic memory).
+    """
+
+    def __init__(self):
+        self._news_source: Optional[List[Dict[str, Any]]] = None
+        self._news_length = 0
+        self._news: Tuple[NewsRecord, ...] = ()
+
+    def build(
+        self,
+        step: int,
+        observation: Any,
+        reward: Any,
+        done: Any,
+        info: Optional[Mapping[str, Any]],
+        news: List[Dict[str, Any]]
+    ) -> MarketStimulus:
+        """
+        :param step: The market time step.
+        :param observation: The environment observation.
+        :param reward: The environment reward.
+        :param done: The environment done flag.
+        :param info: The environment info dictionary.
+        :param news: The world's current news items.
+        :return: A read-only MarketStimulus for this step.
+        """
+        return MarketStimulus(
+            step=step,
+            observation=self._freeze_observation(observation),
+            reward=float(reward),
+            done=bool(done),
+            info=freeze_info(info or {}),
+            news=self._freeze_news(news),
+        )
+
+    @staticmethod
+    def _freeze_observation(observation: Any) -> np.ndarray:
+        """
+        :return: An immutable float64 copy of the observation.
+        """
+        return _immutable_array(np.asarray(observation, dtype=np.float64))
+
+    def _freeze_news(self, news: List[Dict[str, Any]]) -> Tuple[NewsRecord, ...]:
+        """
+        Convert the news to records, reusing the previous tuple while the news list is unchanged.
+        """
+        if news is not self._news_source or len(news) != self._news_length:
+            self._news = tuple(NewsRecord.from_item(item) for item in news)
+            self._news_source = news
+            self._news_length = len(news)
+        return self._news
+
+#######################################
+# FUNCTIONS
+#######################################
+def freeze_info(info: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Freeze an env info dictionary all the way down: mappings become mapping proxies, lists
+    and tuples become tuples and arrays become immutable copies. Other values (scalars,
+    strings) are kept as they are.
+
+    :param info: The env info dictionary.
+    :return: The frozen mapping.
+    """
+    return _freeze(info)
+
+#######################################
+# FUNCTIONS (helpers)
+#######################################
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, np.ndarray):
+        return _freeze(value.tolist()) if value.dtype.hasobject else _immutable_array(value)
+    return value
+
+
+def _immutable_array(array: np.ndarray) -> np.ndarray:
+    """
+    Copy an array into memory owned by a bytes object. Unlike a read-only view of a
+    writeable buffer, the result cannot be made writeable again.
+    """
+    return np.frombuffer(np.ascontiguousarray(array).tobytes(), dtype=array.dtype).reshape(array.shape)
+
+
+def _json_default(value: Any) -> Any:
+    """
+    JSON fallback for NumPy scalars and arrays and frozen mappings found in env info.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
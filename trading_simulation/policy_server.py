@@ -0,0 +1,287 @@
+# trading_simulation/policy_server.py
+
+#######################################
+# IMPORTS
+#######################################
+import logging
+import os
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+import torch
+
+#######################################
+# CONSTANTS
+#######################################
+# Interop threads can only be set once per process, before any parallel work runs.
+_INTEROP_THREADS_CONFIGURED = False
+
+#######################################
+# FUNCTIONS (helpers)
+#######################################
+def configure_torch_threads(num_threads: Optional[int] = None, interop_threads: int = 1) -> int:
+    """
+    Tune torch's CPU thread pools for small-batch inference.
+
+    Batched policy calls are short, so oversubscribing cores (e.g. one pool per
+    worker process) costs more than it gains. By default we use the cores that
+    are available to this process.
+
+    :param num_threads: Intra-op threads. Defaults to the process CPU affinity count.
+    :param interop_threads: Inter-op threads; only applied on the first call.
+    :return: The number of intra-op threads in effect.
+    """
+    global _INTEROP_THREADS_CONFIGURED
+    if num_threads is None:
+        try:
+            num_threads = len(os.sched_getaffinity(0))
+        except AttributeError:
+            num_threads = os.cpu_count() or 1
+    torch.set_num_threads(max(1, num_threads))
+    if not _INTEROP_THREADS_CONFIGURED:
+        try:
+            torch.set_num_interop_threads(max(1, interop_threads))
+        except RuntimeError:
+            # Parallel work already started; torch keeps its current setting.
+            pass
+        _INTEROP_THREADS_CONFIGURED = True
+    return torch.get_num_threads()
+
+
+def load_policy(path: str, algo: Any = None, num_threads: Optional[int] = None) -> "PolicyBackend":
+    """
+    Load a trained policy from disk, picking the backend from the file extension.
+
+    :param path: ``.onnx`` (ONNX Runtime), ``.pt``/``.pth`` (TorchScript) or
+                 ``.zip`` (stable-baselines3 checkpoint).
+    :param algo: The stable-baselines3 algorithm class (e.g. ``PPO``), required for ``.zip``.
+    :param num_threads: Intra-op threads for the ONNX Runtime session.
+    :return: A PolicyBackend ready to be registered with a PolicyServer.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".onnx":
+        return OnnxPolicyBackend(path, num_threads=num_threads)
+    if extension in (".pt", ".pth"):
+        return TorchPolicyBackend(torch.jit.load(path, map_location="cpu"))
+    if extension == ".zip":
+        if algo is None:
+            raise ValueError("algo must be provided to load a stable-baselines3 checkpoint")
+        return SB3PolicyBackend(algo.load(path, device="cpu"))
+    raise ValueError(f"Unsupported policy file extension: {extension}")
+
+#######################################
+# CLASSES
+#######################################
+class PolicyBackend:
+    """
+    A callable that maps a batch of observations ``(n, obs_dim)`` to a batch of actions.
+    Subclasses wrap a specific model format.
+    """
+
+    name = "base"
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class TorchPolicyBackend(PolicyBackend):
+    """
+    Runs a ``torch.nn.Module`` or TorchScript module on CPU in inference mode.
+    """
+
+    name = "torch"
+
+    def __init__(self, module: torch.nn.Module):
+        """
+        :param module: A module mapping a float32 observation tensor to actions.
+        """
+        self.module = module.to("cpu").eval()
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            # from_numpy shares memory with the server's preallocated buffer.
+            actions = self.module(torch.from_numpy(batch))
+        return actions.numpy()
+
+
+class SB3PolicyBackend(PolicyBackend):
+    """
+    Runs the policy network of a stable-baselines3 model (as produced by FinRL's DRLAgent).
+    Mirrors ``BasePolicy.predict`` but skips its per-call tensor copies and grad bookkeeping.
+    """
+
+    name = "sb3"
+
+    def __init__(self, model: Any, deterministic: bool = True):
+        """
+        :param model: A trained stable-baselines3 model (PPO, A2C, DDPG, SAC, TD3, ...).
+        :param deterministic: Whether to use the deterministic action.
+        """
+        self.policy = model.policy.to("cpu")
+        self.policy.set_training_mode(False)
+        self.deterministic = deterministic
+        action_space = self.policy.action_space
+        self._low = getattr(action_space, "low", None)
+        self._high = getattr(action_space, "high", None)
+        self._squash_output = getattr(self.policy, "squash_output", False)
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            actions = self.policy._predict(torch.from_numpy(batch), deterministic=self.deterministic)
+        actions = actions.numpy()
+        if self._low is not None:
+            if self._squash_output:
+                actions = self._low + 0.5 * (actions + 1.0) * (self._high - self._low)
+            else:
+                actions = np.clip(actions, self._low, self._high)
+        return actions
+
+
+class OnnxPolicyBackend(PolicyBackend):
+    """
+    Runs an exported ONNX policy with ONNX Runtime, which has a lower per-call
+    overhead than eager torch for small networks.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model: Any, num_threads: Optional[int] = None):
+        """
+        :param model: A path to an ``.onnx`` file or an existing ``InferenceSession``.
+        :param num_threads: Intra-op threads for the session. Defaults to ONNX Runtime's choice.
+        """
+        if isinstance(model, str):
+            try:
+                import onnxruntime
+            except ImportError as e:
+                raise ImportError("onnxruntime is required to serve ONNX policies") from e
+            options = onnxruntime.SessionOptions()
+            if num_threads is not None:
+                options.intra_op_num_threads = num_threads
+                options.inter_op_num_threads = 1
+            model = onnxruntime.InferenceSession(model, options, providers=["CPUExecutionProvider"])
+        self.session = model
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class _PolicyGroup:
+    """
+    The agents sharing one model, with a reusable observation buffer.
+    """
+
+    def __init__(self, backend: PolicyBackend, source: Any = None):
+        self.backend = backend
+        # The object the group was registered with. Holding it keeps its id (the default
+        # group key) from being reused by another model while the group exists.
+        self.source = source
+        self.agent_names: List[str] = []
+        self.buffer: Optional[np.ndarray] = None
+
+    def ensure_buffer(self, rows: int, obs_dim: int) -> np.ndarray:
+        """
+        Return a float32 buffer of at least ``rows`` x ``obs_dim``, growing it only when needed.
+        """
+        if self.buffer is None or self.buffer.shape[0] < rows or self.buffer.shape[1] != obs_dim:
+            capacity = max(rows, len(self.agent_names))
+            self.buffer = np.empty((capacity, obs_dim), dtype=np.float32)
+        return self.buffer
+
+
+class PolicyServer:
+    """
+    Serves trained policies to many agents at once.
+
+    Agents that share a model are grouped together; on each step their observations
+    are stacked into one preallocated buffer and the model runs a single forward
+    pass for the whole group, instead of one ``predict`` call per agent.
+    """
+
+    def __init__(self, num_threads: Optional[int] = None):
+        """
+        Constructor for the PolicyServer.
+
+        :param num_threads: Intra-op torch threads to configure for the whole process (see
+                            ``configure_torch_threads``). None leaves torch's settings alone,
+                            so only a dedicated serving process needs to opt in.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.num_threads = configure_torch_threads(num_threads) if num_threads is not None else torch.get_num_threads()
+        self._groups: Dict[Hashable, _PolicyGroup] = {}
+        self._agent_groups: Dict[str, Hashable] = {}
+        self.logger.debug(f"PolicyServer initialized with {self.num_threads} torch threads.")
+
+    def register(self, agent_name: str, policy: Any, model_key: Optional[Hashable] = None) -> None:
+        """
+        Attach a policy to an agent. Agents registered with the same model are batched together.
+
+        :param agent_name: The name of the agent the policy acts for.
+        :param policy: A PolicyBackend, a stable-baselines3 model or a torch module.
+        :param model_key: Key identifying the shared model. Defaults to the policy object identity.
+        """
+        if agent_name in self._agent_groups:
+            self.unregister(agent_name)
+        key = model_key if model_key is not None else id(policy)
+        group = self._groups.get(key)
+        if group is None:
+            group = _PolicyGroup(self._as_backend(policy), source=policy)
+            self._groups[key] = group
+        group.agent_names.append(agent_name)
+        self._agent_groups[agent_name] = key
+
+    def unregister(self, agent_name: str) -> None:
+        """
+        Detach an agent from its policy, dropping the group once it is empty.
+
+        :param agent_name: The name of the agent.
+        """
+        key = self._agent_groups.pop(agent_name, None)
+        if key is None:
+            return
+        group = self._groups[key]
+        group.agent_names.remove(agent_name)
+        if not group.agent_names:
+            del self._groups[key]
+
+    def has_policy(self, agent_name: str) -> bool:
+        """
+        :param agent_name: The name of the agent.
+        :return: True if a policy is registered for this agent.
+        """
+        return agent_name in self._agent_groups
+
+    def predict(self, observations: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Compute actions for every agent that has both a policy and an observation.
+
+        :param observations: Mapping of agent name to its (flattenable) observation.
+        :return: Mapping of agent name to its action array.
+        """
+        actions: Dict[str, np.ndarray] = {}
+        for group in self._groups.values():
+            names = [name for name in group.agent_names if name in observations]
+            if not names:
+                continue
+            first = np.asarray(observations[names[0]], dtype=np.float32).reshape(-1)
+            buffer = group.ensure_buffer(len(names), first.shape[0])
+            for row, name in enumerate(names):
+                buffer[row] = np.asarray(observations[name], dtype=np.float32).reshape(-1)
+            batch_actions = group.backend(buffer[: len(names)])
+            for row, name in enumerate(names):
+                actions[name] = batch_actions[row]
+        return actions
+
+    @staticmethod
+    def _as_backend(policy: Any) -> PolicyBackend:
+        """
+        Wrap a raw model in the matching PolicyBackend.
+        """
+        if isinstance(policy, PolicyBackend):
+            return policy
+        if hasattr(policy, "policy") and hasattr(policy.policy, "_predict"):
+            return SB3PolicyBackend(policy)
+        if isinstance(policy, (torch.nn.Module, torch.jit.ScriptModule)):
+            return TorchPolicyBackend(policy)
+        raise TypeError(f"Unsupported policy type: {type(policy).__name__}")
@@ -0,0 +1,324 @@
+# trading_simulation/population.py
+
+#######################################
+# IMPORTS
+#######################################
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Local module imports
+from trading_simulation.trading_agents import (
+    PersonaSpec,
+    TradingPersona,
+    create_trader_persona,
+    PERSONA_RISK_DECIMALS,
+    intern_persona_spec,
+)
+
+#######################################
+# CLASSES
+#######################################
+@dataclass
+class PopulationSpec:
+    """Distribution of trader personas to generate."""
+    size: int
+    style_mix: Dict[str, float] = field(default_factory=lambda: {
+        "conservative": 1.0, "balanced": 1.0, "aggressive": 1.0
+    })
+    risk_distribution: str = "uniform"
+    risk_params: Tuple[float, float] = (0.0, 1.0)
+    risk_precision: int = 2
+    initial_cash: float = 100000.0
+    name_prefix: str = "Trader"
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        """Validate the specification after initialization."""
+        if self.size < 0:
+            raise ValueError("size cannot be negative")
+
+        if not self.style_mix or any(weight < 0 for weight in self.style_mix.values()):
+            raise ValueError("style_mix must have non-negative weights")
+
+        if sum(self.style_mix.values()) <= 0:
+            raise ValueError("style_mix weights must not all be zero")
+
+        if self.risk_distribution not in ("uniform", "normal", "beta"):
+            raise ValueError("risk_distribution must be 'uniform', 'normal' or 'beta'")
+
+        if not 0 <= self.risk_precision <= PERSONA_RISK_DECIMALS:
+            raise ValueError(f"risk_precision must be between 0 and {PERSONA_RISK_DECIMALS}")
+
+        if self.initial_cash < 0:
+            raise ValueError("initial_cash cannot be negative")
+
+    def mean_risk_tolerance(self) -> float:
+        """
+        :return: The mean of the risk tolerance distribution, before clipping to [0, 1].
+        """
+        first, second = self.risk_params
+        if self.risk_distribution == "uniform":
+            return (first + second) / 2.0
+        if self.risk_distribution == "normal":
+            return float(first)
+        return first / (first + second)
+
+
+class RuleBasedTrader:
+    """
+    A lightweight view of one trader in a TraderPopulation. It holds no state of its own;
+    everything lives in the population's arrays and shared PersonaSpec.
+    """
+
+    __slots__ = ("population", "index")
+
+    def __init__(self, population: "TraderPopulation", index: int):
+        self.population = population
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.population.name(self.index)
+
+    @property
+    def spec(self) -> PersonaSpec:
+        return self.population.specs[self.population.spec_index[self.index]]
+
+    @property
+    def risk_tolerance(self) -> float:
+        return float(self.population.risk_tolerance[self.index])
+
+    @property
+    def cash_available(self) -> float:
+        return float(self.population.cash[self.index])
+
+
+class TraderPopulation:
+    """
+    Array-backed state for a large population of rule-based traders.
+
+    Per-agent state is one row of each array; names are derived from the index and the
+    persona text lives in interned PersonaSpec flyweights shared by every agent.
+    """
+
+    def __init__(
+        self,
+        specs: Sequence[PersonaSpec],
+        spec_index: np.ndarray,
+        risk_tolerance: np.ndarray,
+        initial_cash: float,
+        tickers: Sequence[str],
+        name_prefix: str = "Trader"
+    ):
+        """
+        :param specs: The unique persona specs used by the population.
+        :param spec_index: Index into ``specs`` for every agent.
+        :param risk_tolerance: Risk tolerance of every agent.
+        :param initial_cash: Starting cash of every agent.
+        :param tickers: The tickers agents can hold.
+        :param name_prefix: Agent names are ``f"{name_prefix}{index}"``.
+        """
+        self.specs: Tuple[PersonaSpec, ...] = tuple(specs)
+        self.spec_index = spec_index
+        self.risk_tolerance = risk_tolerance
+        self.tickers = list(tickers)
+        self.name_prefix = name_prefix
+        self.initial_cash = float(initial_cash)
+        self.cash = np.full(len(spec_index), self.initial_cash, dtype=np.float64)
+        self.positions = np.zeros((len(spec_index), len(self.tickers)), dtype=np.int32)
+        self.build_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self.spec_index)
+
+    def __getitem__(self, index: int) -> RuleBasedTrader:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return RuleBasedTrader(self, index)
+
+    def name(self, index: int) -> str:
+        """
+        :param index: The agent index.
+        :return: The agent's name.
+        """
+        return f"{self.name_prefix}{index}"
+
+    def reset(self) -> None:
+        """
+        Restore every agent's starting cash and close all positions, e.g. for a new episode.
+        """
+        self.cash.fill(self.initial_cash)
+        self.positions.fill(0)
+
+    def propose_orders(
+        self,
+        rng: np.random.Generator,
+        buy_probability: float = 0.1,
+        sell_probability: float = 0.1
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw one step of random one-share orders for every agent at once, mirroring
+        ``TradingPersona._random_trading_decision``.
+
+        :param rng: The random generator to draw decisions from.
+        :param buy_probability: Chance that an agent buys a random ticker.
+        :param sell_probability: Chance that an agent sells a random ticker.
+        :return: Agent index, ticker index and signed quantity of each order, ready for RiskGate.
+        """
+        roll = rng.random(len(self))
+        buying = roll < buy_probability
+        selling = (roll >= buy_probability) & (roll < buy_probability + sell_probability)
+        agent_idx = np.flatnonzero(buying | selling)
+        ticker_idx = rng.integers(0, len(self.tickers), agent_idx.shape[0])
+        quantity = np.where(buying[agent_idx], 1, -1)
+        return agent_idx, ticker_idx, quantity
+
+    def apply_fills(
+        self,
+        agent_idx: np.ndarray,
+        ticker_idx: np.ndarray,
+        quantity: np.ndarray,
+        prices: np.ndarray,
+        accepted: Optional[np.ndarray] = None,
+        costs: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Settle a batch of fills against the population's ledgers.
+
+        :param agent_idx: Agent index of each fill.
+        :param ticker_idx: Ticker index of each fill.
+        :param quantity: Signed share quantity of each fill.
+        :param prices: Execution price per ticker.
+        :param accepted: Optional mask of the fills to settle (e.g. ``RiskCheckResult.accepted``).
+        :param costs: Optional fees and other execution costs of each fill, charged to cash.
+        :return: The absolute notional traded by each agent.
+        """
+        if accepted is not None:
+            agent_idx, ticker_idx, quantity = agent_idx[accepted], ticker_idx[accepted], quantity[accepted]
+            if costs is not None:
+                costs = costs[accepted]
+        notional = quantity * np.asarray(prices)[ticker_idx]
+        np.add.at(self.positions, (agent_idx, ticker_idx), quantity.astype(self.positions.dtype))
+        self.cash -= np.bincount(agent_idx, weights=notional, minlength=len(self))
+        if costs is not None:
+            self.cash -= np.bincount(agent_idx, weights=costs, minlength=len(self))
+        return np.bincount(agent_idx, weights=np.abs(notional), minlength=len(self))
+
+    def equity(self, prices: np.ndarray) -> np.ndarray:
+        """
+        :param prices: Current price per ticker.
+        :return: Cash plus marked-to-market holdings of every agent.
+        """
+        return self.cash + self.positions @ np.asarray(prices, dtype=np.float64)
+
+    def unique_state_bytes(self) -> int:
+        """
+        :return: Bytes of state that is not shared between agents (the per-agent arrays).
+        """
+        return self.spec_index.nbytes + self.risk_tolerance.nbytes + self.cash.nbytes + self.positions.nbytes
+
+    def bytes_per_agent(self) -> float:
+        """
+        Only the array-backed population is counted: each spec is stored once for all agents.
+        Personas materialized with ``build_personas`` hold their own copies of the
+        definitions and are not included.
+
+        :return: Unique state per agent, plus an equal share of the interned specs.
+        """
+        if not len(self):
+            return 0.0
+        shared = sum(_spec_size(spec) for spec in self.specs)
+        return (self.unique_state_bytes() + shared) / len(self)
+
+#######################################
+# FUNCTIONS OUTSIDE OF CLASSES
+#######################################
+def build_population(spec: PopulationSpec, tickers: Optional[Sequence[str]] = None) -> TraderPopulation:
+    """
+    Generate a population from a distribution spec, creating all agent state in batch.
+    Risk tolerances are rounded to ``spec.risk_precision`` decimals so that agents share
+    a small set of interned PersonaSpec flyweights.
+
+    :param spec: The population to generate.
+    :param tickers: The tickers agents can hold. Defaults to the TradingWorld defaults.
+    :return: The new TraderPopulation.
+    """
+    logger = logging.getLogger(__name__)
+    start = time.perf_counter()
+    rng = np.random.default_rng(spec.seed)
+
+    styles = list(spec.style_mix)
+    weights = np.array([spec.style_mix[style] for style in styles], dtype=np.float64)
+    style_codes = rng.choice(len(styles), size=spec.size, p=weights / weights.sum())
+
+    low, high = spec.risk_params
+    if spec.risk_distribution == "uniform":
+        risk = rng.uniform(low, high, spec.size)
+    elif spec.risk_distribution == "normal":
+        risk = rng.normal(low, high, spec.size)
+    else:
+        risk = rng.beta(low, high, spec.size)
+    risk = np.round(np.clip(risk, 0.0, 1.0), spec.risk_precision).astype(np.float32)
+
+    # One spec per distinct (style, rounded risk) pair
+    scale = 10 ** spec.risk_precision
+    keys = style_codes.astype(np.int64) * (scale + 1) + np.rint(risk * scale).astype(np.int64)
+    unique_keys, spec_index = np.unique(keys, return_inverse=True)
+    specs = [
+        intern_persona_spec(styles[key // (scale + 1)], round((key % (scale + 1)) / scale, spec.risk_precision))
+        for key in unique_keys.tolist()
+    ]
+
+    population = TraderPopulation(
+        specs=specs,
+        spec_index=spec_index.astype(np.uint16 if len(specs) <= np.iinfo(np.uint16).max else np.uint32),
+        risk_tolerance=risk,
+        initial_cash=spec.initial_cash,
+        tickers=tickers if tickers else ["AAPL", "MSFT", "AMZN"],
+        name_prefix=spec.name_prefix,
+    )
+    population.build_seconds = time.perf_counter() - start
+    logger.info(
+        f"Built population of {len(population)} traders from {len(specs)} persona specs in "
+        f"{population.build_seconds:.3f}s ({population.bytes_per_agent():.1f} bytes/agent)"
+    )
+    return population
+
+
+def build_personas(population: TraderPopulation, limit: Optional[int] = None) -> List[TradingPersona]:
+    """
+    Create full TinyTroupe personas for (part of) a population. Each persona references
+    the population's PersonaSpec flyweight, so definitions are formatted once per spec,
+    but it holds its own mutable copy of them (see ``PersonaSpec.definition``).
+
+    :param population: The population to materialize.
+    :param limit: Only create the first ``limit`` personas.
+    :return: The TradingPersona instances, with cash taken from the population.
+    """
+    count = len(population) if limit is None else min(limit, len(population))
+    personas = []
+    for index in range(count):
+        spec = population.specs[population.spec_index[index]]
+        persona = create_trader_persona(population.name(index), spec.trading_style, spec.risk_tolerance)
+        persona.cash_available = float(population.cash[index])
+        personas.append(persona)
+    return personas
+
+
+def _spec_size(spec: PersonaSpec) -> int:
+    """
+    Approximate memory footprint of a PersonaSpec and its definition text.
+    """
+    size = sys.getsizeof(spec)
+    for definition in spec.definitions.values():
+        size += sys.getsizeof(definition)
+        for value in definition.values():
+            size += sys.getsizeof(value)
+            if isinstance(value, tuple):
+                size += sum(sys.getsizeof(item) for item in value)
+    return size
@@ -0,0 +1,563 @@
+# trading_simulation/results_store.py
+
+#######################################
+# IMPORTS
+#######################################
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+#######################################
+# CONSTANTS
+#######################################
+# Params and metrics become columns of the runs table, prefixed to keep them apart
+_PARAM_PREFIX = "p_"
+_METRIC_PREFIX = "m_"
+# Per-config mean of squares of each metric, for the standard deviation over seeds
+_SQUARE_PREFIX = "q_"
+_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+_OPERATORS = {"=", "!=", "<", "<=", ">", ">="}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    config_hash TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    created REAL NOT NULL,
+    config TEXT NOT NULL,
+    UNIQUE (config_hash, seed)
+);
+CREATE TABLE IF NOT EXISTS configs (
+    config_hash TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS series (
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    dtype TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (run_id, name, chunk)
+);
+"""
+
+#######################################
+# FUNCTIONS (helpers)
+#######################################
+def config_hash(config: Dict[str, Any]) -> str:
+    """
+    :param config: A run configuration; it must be JSON-serializable (other values use ``str``).
+    :return: A stable hash of the configuration, independent of key order.
+    """
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def flatten_config(config: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    The scalar parameters of a (nested) configuration, with nested keys joined by ".".
+    Items of lists and tuples are indexed by position (e.g. ``population.risk_params.0``);
+    other non-scalar values are kept only in the stored config JSON.
+
+    :param config: The configuration.
+    :param prefix: Key prefix used for recursion.
+    :return: Parameter name to scalar value.
+    """
+    params: Dict[str, Any] = {}
+    for key, value in config.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            params.update(flatten_config(value, f"{name}."))
+        elif isinstance(value, (list, tuple)):
+            params.update(flatten_config({str(index): item for index, item in enumerate(value)}, f"{name}."))
+        elif isinstance(value, (bool, int, float, str, np.integer, np.floating, np.bool_)):
+            params[name] = value.item() if isinstance(value, np.generic) else value
+    return params
+
+
+def _quote(column: str) -> str:
+    return f'"{column}"'
+
+
+def _strip_prefixes(column: str) -> str:
+    """
+    Map a runs/configs column back to its parameter or metric name.
+    """
+    for prefix in (_PARAM_PREFIX, _METRIC_PREFIX):
+        if column.startswith(prefix):
+            return column[len(prefix):]
+    return column
+
+#######################################
+# CLASSES
+#######################################
+@dataclass
+class RunRecord:
+    """The outcome of one simulation run, as stored in a ResultsStore."""
+    config: Dict[str, Any]
+    seed: int
+    metrics: Dict[str, float]
+    series: Dict[str, np.ndarray] = field(default_factory=dict)
+    config_hash: str = field(init=False)
+
+    def __post_init__(self):
+        """Hash the configuration and validate names after initialization."""
+        self.config_hash = config_hash(self.config)
+        for name in list(flatten_config(self.config)) + list(self.metrics):
+            if not _NAME_PATTERN.match(name):
+                raise ValueError(f"Invalid parameter or metric name: {name!r}")
+
+
+class ResultsStore:
+    """
+    A queryable store of simulation run results in one SQLite file.
+
+    Runs are keyed by (config hash, seed). Scalar config parameters and metrics are
+    columns of the ``runs`` table, added (with an index) the first time a name is seen,
+    so top-N queries with parameter filters are plain indexed SELECTs. The ``configs``
+    table keeps each configuration's parameters and per-metric means over its seeds,
+    refreshed on every write, so ranking configurations needs no GROUP BY. Time series are
+    split into fixed-size chunks of raw array bytes. The file uses WAL journaling, so
+    several sweep processes can each open a store on it and write batches concurrently
+    while others query.
+    """
+
+    def __init__(self, path: str = ":memory:", chunk_size: int = 4096, timeout: float = 60.0):
+        """
+        Constructor for the ResultsStore.
+
+        :param path: The SQLite file. Defaults to an in-memory (per-process) store.
+        :param chunk_size: Series values stored per chunk.
+        :param timeout: Seconds a writer waits for another process's transaction.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.chunk_size = chunk_size
+        # Autocommit mode: write transactions are opened explicitly with BEGIN IMMEDIATE
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS runs_config ON runs (config_hash)")
+        self._columns: Set[str] = set()
+        self._refresh_columns()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Lets SQLite refresh the planner statistics of the indexes queries used. Best effort:
+        # skipped when another process holds the write lock.
+        try:
+            self._connection.execute("PRAGMA optimize")
+        except sqlite3.OperationalError:
+            pass
+        self._connection.close()
+
+    def analyze(self) -> None:
+        """
+        Gather planner statistics for every index. Run it after a bulk load so filtered
+        top-N queries choose the best index.
+        """
+        self._connection.execute("ANALYZE")
+
+    #######################################
+    # Writing
+    #######################################
+    def add_run(
+        self,
+        config: Dict[str, Any],
+        seed: int,
+        metrics: Dict[str, float],
+        series: Optional[Dict[str, np.ndarray]] = None
+    ) -> int:
+        """
+        Store a single run. Use ``add_runs`` or a ``batch_writer`` for many runs.
+
+        :param config: The run configuration (without the seed).
+        :param seed: The run's random seed.
+        :param metrics: Scalar metrics, e.g. a run summary.
+        :param series: Named 1-d arrays, e.g. the equity curve.
+        :return: The run id.
+        """
+        return self.add_runs([RunRecord(config, seed, metrics, series or {})])[0]
+
+    def add_export(self, config: Dict[str, Any], seed: int, export: Dict[str, Any]) -> Optional[int]:
+        """
+        Store the export of ``SimulationRunner.run``: its summary as metrics, its equity
+        curve as the series "step" and "equity.<column>" and the numeric columns of its
+        "trades" log (if any) as "trades.<column>".
+
+        :param config: The run configuration (without the seed).
+        :param seed: The run's random seed.
+        :param export: The run export.
+        :return: The run id, or None if the export is empty.
+        """
+        if not export:
+            return None
+        return self.add_runs([export_record(config, seed, export)])[0]
+
+    def add_runs(self, records: Sequence[RunRecord]) -> List[int]:
+        """
+        Store runs in one transaction. A run with the same config hash and seed as a
+        stored one replaces it.
+
+        :param records: The runs to store.
+        :return: The run id of each record.
+        """
+        if not records:
+            return []
+        now = time.time()
+        run_ids: List[int] = []
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Holding the write lock, so no other process can add the same columns concurrently
+            self._refresh_columns()
+            params = [flatten_config(record.config) for record in records]
+            self._add_columns(_PARAM_PREFIX, {name for run in params for name in run})
+            self._add_columns(_METRIC_PREFIX, {name for record in records for name in record.metrics})
+
+            series_rows: List[Tuple[Any, ...]] = []
+            for record, run_params in zip(records, params):
+                connection.execute(
+                    "DELETE FROM series WHERE run_id IN (SELECT run_id FROM runs WHERE config_hash = ? AND seed = ?)",
+                    (record.config_hash, record.seed),
+                )
+                values = {
+                    "config_hash": record.config_hash,
+                    "seed": int(record.seed),
+                    "created": now,
+                    "config": json.dumps(record.config, sort_keys=True, default=str),
+                    **{_PARAM_PREFIX + name: value for name, value in run_params.items()},
+                    **{_METRIC_PREFIX + name: float(value) for name, value in record.metrics.items()},
+                }
+                columns = ", ".join(_quote(column) for column in values)
+                placeholders = ", ".join("?" * len(values))
+                cursor = connection.execute(
+                    f"INSERT OR REPLACE INTO runs ({columns}) VALUES ({placeholders})", list(values.values())
+                )
+                run_id = cursor.lastrowid
+                if run_id is None:
+                    raise RuntimeError(f"No run id returned for config {record.config_hash}, seed {record.seed}")
+                run_ids.append(run_id)
+                series_rows.extend(self._chunk_series(run_id, record.series))
+
+            connection.executemany(
+                "INSERT INTO series (run_id, name, chunk, dtype, data) VALUES (?, ?, ?, ?, ?)", series_rows
+            )
+            self._refresh_configs({record.config_hash for record in records})
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self.logger.debug(f"Stored {len(records)} runs in {self.path}")
+        return run_ids
+
+    def batch_writer(self, batch_size: int = 256) -> "BatchWriter":
+        """
+        :param batch_size: Runs buffered before each write transaction.
+        :return: A BatchWriter on this store; use it as a context manager so it flushes.
+        """
+        return BatchWriter(self, batch_size)
+
+    #######################################
+    # Querying
+    #######################################
+    def top_runs(
+        self,
+        metric: str,
+        n: int = 20,
+        where: Optional[Dict[str, Any]] = None,
+        ascending: bool = False
+    ) -> pd.DataFrame:
+        """
+        The best runs by a metric, e.g. ``top_runs("sharpe", 20, {"risk_tolerance": (">", 0.5)})``.
+
+        :param metric: The metric to rank by.
+        :param n: The number of runs to return.
+        :param where: Filters on parameter (or metric) values: ``name: value`` for equality,
+                      or ``name: (operator, value)`` with one of =, !=, <, <=, >, >=.
+        :param ascending: Rank the lowest values first (e.g. for max_drawdown).
+        :return: One row per run with run_id, config_hash, seed, the ranking metric first,
+                 then the other metrics and all parameters.
+        """
+        metric_column = self._column(metric, (_METRIC_PREFIX,))
+        clause, values = self._where(where)
+        columns = [metric_column] + self._value_columns(exclude=metric_column)
+        selected = ", ".join(["run_id", "config_hash", "seed"] + [_quote(column) for column in columns])
+        query = (
+            f"SELECT {selected} FROM runs WHERE {_quote(metric_column)} IS NOT NULL{clause} "
+            f"ORDER BY {_quote(metric_column)} {'ASC' if ascending else 'DESC'} LIMIT ?"
+        )
+        frame = pd.read_sql_query(query, self._connection, params=values + [n])
+        return frame.rename(columns=_strip_prefixes)
+
+    def top_configs(
+        self,
+        metric: str,
+        n: int = 20,
+        where: Optional[Dict[str, Any]] = None,
+        ascending: bool = False,
+        min_runs: int = 1
+    ) -> pd.DataFrame:
+        """
+        The best configurations by a metric averaged over their seeds.
+
+        :param metric: The metric to rank by.
+        :param n: The number of configurations to return.
+        :param where: Filters on parameter (or mean metric) values, as in ``top_runs``.
+        :param ascending: Rank the lowest mean first.
+        :param min_runs: Only rank configurations with at least this many seeds.
+        :return: One row per configuration with config_hash, runs, the mean and standard
+                 deviation of the ranking metric, the means of the other metrics and the
+                 configuration's parameters.
+        """
+        metric_column = self._column(metric, (_METRIC_PREFIX,))
+        clause, values = self._where(where)
+        square_column = _SQUARE_PREFIX + metric_column[len(_METRIC_PREFIX):]
+        columns = [metric_column, square_column] + self._value_columns(exclude=metric_column)
+        selected = ", ".join(["config_hash", "runs"] + [_quote(column) for column in columns])
+        query = (
+            f"SELECT {selected} FROM configs WHERE {_quote(metric_column)} IS NOT NULL AND runs >= ?{clause} "
+            f"ORDER BY {_quote(metric_column)} {'ASC' if ascending else 'DESC'} LIMIT ?"
+        )
+        frame = pd.read_sql_query(query, self._connection, params=[min_runs] + values + [n])
+        variance = (frame.pop(square_column) - frame[metric_column] ** 2).clip(lower=0.0)
+        frame.insert(3, f"{metric}_std", np.sqrt(variance * frame["runs"] / (frame["runs"] - 1).clip(lower=1)))
+        return frame.rename(columns=_strip_prefixes)
+
+    def get_run(self, config_hash: str, seed: int) -> Optional[Dict[str, Any]]:
+        """
+        :param config_hash: The run's config hash.
+        :param seed: The run's seed.
+        :return: The run's run_id, config, metrics and series names, or None if not stored.
+        """
+        cursor = self._connection.execute(
+            "SELECT * FROM runs WHERE config_hash = ? AND seed = ?", (config_hash, seed)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        values = dict(zip((column[0] for column in cursor.description), row))
+        series = self._connection.execute(
+            "SELECT DISTINCT name FROM series WHERE run_id = ? ORDER BY name", (values["run_id"],)
+        )
+        return {
+            "run_id": values["run_id"],
+            "config": json.loads(values["config"]),
+            "metrics": {
+                column[len(_METRIC_PREFIX):]: value for column, value in values.items()
+                if column.startswith(_METRIC_PREFIX) and value is not None
+            },
+            "series": [name for (name,) in series],
+        }
+
+    def load_series(self, run_id: int, name: str) -> np.ndarray:
+        """
+        :param run_id: The run id (see ``get_run`` or the query results).
+        :param name: The series name, e.g. "equity.world".
+        :return: The series reassembled from its chunks.
+        """
+        rows = self._connection.execute(
+            "SELECT dtype, data FROM series WHERE run_id = ? AND name = ? ORDER BY chunk", (run_id, name)
+        ).fetchall()
+        if not rows:
+            raise KeyError(f"No series {name!r} for run {run_id}")
+        return np.concatenate([np.frombuffer(data, dtype=np.dtype(dtype)) for dtype, data in rows])
+
+    #######################################
+    # Internal Methods
+    #######################################
+    def _refresh_columns(self) -> None:
+        self._columns = {row[1] for row in self._connection.execute("PRAGMA table_info(runs)")}
+
+    def _value_columns(self, exclude: str) -> List[str]:
+        """
+        The metric columns (except ``exclude``) followed by the parameter columns.
+        """
+        return sorted(
+            (column for column in self._columns if column.startswith((_METRIC_PREFIX, _PARAM_PREFIX)) and column != exclude),
+            key=lambda column: (not column.startswith(_METRIC_PREFIX), column),
+        )
+
+    def _refresh_configs(self, hashes: Set[str]) -> None:
+        """
+        Recompute the ``configs`` rows of the given config hashes from their runs.
+        Must run inside a write transaction.
+        """
+        params = sorted(column for column in self._columns if column.startswith(_PARAM_PREFIX))
+        metrics = sorted(column for column in self._columns if column.startswith(_METRIC_PREFIX))
+        columns = ["config_hash", "runs"] + params + metrics + [
+            _SQUARE_PREFIX + column[len(_METRIC_PREFIX):] for column in metrics
+        ]
+        aggregates = ["config_hash", "COUNT(*)"] + [f"MIN({_quote(column)})" for column in params] + [
+            f"AVG({_quote(column)})" for column in metrics
+        ] + [f"AVG({_quote(column)} * {_quote(column)})" for column in metrics]
+        ordered = sorted(hashes)
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(ordered), 500):
+            chunk = ordered[start:start + 500]
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO configs ({', '.join(_quote(column) for column in columns)}) "
+                f"SELECT {', '.join(aggregates)} FROM runs "
+                f"WHERE config_hash IN ({','.join('?' * len(chunk))}) GROUP BY config_hash",
+                chunk,
+            )
+
+    def _add_columns(self, prefix: str, names: Set[str]) -> None:
+        """
+        Add (and index) the columns that do not exist yet, to both the runs and configs
+        tables. Must run inside a write transaction.
+        """
+        for name in sorted(names):
+            column = prefix + name
+            if column in self._columns:
+                continue
+            affinity = " REAL" if prefix == _METRIC_PREFIX else ""
+            for table in ("runs", "configs"):
+                self._connection.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(column)}{affinity}")
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'{table}_{column}')} ON {table} ({_quote(column)})"
+                )
+            if prefix == _METRIC_PREFIX:
+                square = _SQUARE_PREFIX + name
+                self._connection.execute(f"ALTER TABLE configs ADD COLUMN {_quote(square)} REAL")
+            self._columns.add(column)
+
+    def _column(self, name: str, prefixes: Tuple[str, ...]) -> str:
+        """
+        Resolve a parameter or metric name to its column, refreshing the schema once in
+        case another process added it.
+        """
+        for attempt in range(2):
+            for prefix in prefixes:
+                if prefix + name in self._columns:
+                    return prefix + name
+            if attempt == 0:
+                self._refresh_columns()
+        raise ValueError(f"Unknown {'metric' if prefixes == (_METRIC_PREFIX,) else 'parameter'}: {name!r}")
+
+    def _where(self, where: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """
+        Build the SQL for a filter dict, as " AND ..." plus its bound values.
+        """
+        clauses, values = [], []
+        for name, condition in (where or {}).items():
+            operator, value = condition if isinstance(condition, tuple) else ("=", condition)
+            if operator not in _OPERATORS:
+                raise ValueError(f"Unsupported operator {operator!r}; use one of {sorted(_OPERATORS)}")
+            column = self._column(name, (_PARAM_PREFIX, _METRIC_PREFIX))
+            clauses.append(f" AND {_quote(column)} {operator} ?")
+            values.append(value)
+        return "".join(clauses), values
+
+    def _chunk_series(self, run_id: int, series: Dict[str, np.ndarray]) -> Iterator[Tuple[Any, ...]]:
+        """
+        Split each series into rows of (run_id, name, chunk, dtype, bytes).
+        """
+        for name, values in series.items():
+            array = np.ascontiguousarray(values)
+            if array.ndim != 1 or array.dtype.hasobject:
+                raise ValueError(f"Series {name!r} must be a 1-d numeric array")
+            for chunk, start in enumerate(range(0, len(array), self.chunk_size)):
+                yield run_id, name, chunk, array.dtype.str, array[start:start + self.chunk_size].tobytes()
+
+
+class BatchWriter:
+    """
+    Buffers runs and writes them to a ResultsStore in batches, one transaction each.
+    """
+
+    def __init__(self, store: ResultsStore, batch_size: int = 256):
+        """
+        :param store: The store to write to.
+        :param batch_size: Runs buffered before each write.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.store = store
+        self.batch_size = batch_size
+        self._pending: List[RunRecord] = []
+        self.written = 0
+
+    def add(
+        self,
+        config: Dict[str, Any],
+        seed: int,
+        metrics: Dict[str, float],
+        series: Optional[Dict[str, np.ndarray]] = None
+    ) -> None:
+        """
+        Queue a run; the batch is written once it reaches ``batch_size``.
+
+        :param config: The run configuration (without the seed).
+        :param seed: The run's random seed.
+        :param metrics: Scalar metrics.
+        :param series: Named 1-d arrays.
+        """
+        self.add_record(RunRecord(config, seed, metrics, series or {}))
+
+    def add_record(self, record: RunRecord) -> None:
+        """
+        :param record: The run to queue.
+        """
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write every queued run.
+        """
+        if self._pending:
+            self.store.add_runs(self._pending)
+            self.written += len(self._pending)
+            self._pending = []
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.flush()
+
+#######################################
+# FUNCTIONS OUTSIDE OF CLASSES
+#######################################
+def export_record(config: Dict[str, Any], seed: int, export: Dict[str, Any]) -> RunRecord:
+    """
+    Convert the export of ``SimulationRunner.run`` into a RunRecord.
+
+    :param config: The run configuration (without the seed).
+    :param seed: The run's random seed.
+    :param export: The run export (summary, agents, equity_curve and optionally trades).
+    :return: The record, with the summary as metrics and the equity curve (and trades) as series.
+    """
+    series: Dict[str, np.ndarray] = {}
+    curve = export.get("equity_curve")
+    if curve is not None:
+        series["step"] = curve.index.to_numpy()
+        for column in curve.columns:
+            series[f"equity.{column}"] = curve[column].to_numpy()
+    trades = export.get("trades")
+    if trades is not None:
+        for column in trades.select_dtypes(include="number").columns:
+            series[f"trades.{column}"] = trades[column].to_numpy()
+    return RunRecord(config, seed, dict(export.get("summary", {})), series)
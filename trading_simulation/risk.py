@@ -0,0 +1,253 @@
+# trading_simulation/risk.py
+
+#######################################
+# IMPORTS
+#######################################
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+#######################################
+# CONSTANTS
+#######################################
+# Reject reason codes, in the order the checks are applied.
+ACCEPTED = 0
+UNKNOWN_TICKER = 1
+TRADING_HALT = 2
+MAX_ORDER_SIZE = 3
+INSUFFICIENT_SHARES = 4
+POSITION_LIMIT = 5
+INSUFFICIENT_CASH = 6
+GROSS_EXPOSURE = 7
+NET_EXPOSURE = 8
+
+REASON_NAMES = (
+    "accepted",
+    "unknown_ticker",
+    "trading_halt",
+    "max_order_size",
+    "insufficient_shares",
+    "position_limit",
+    "insufficient_cash",
+    "gross_exposure",
+    "net_exposure",
+)
+
+#######################################
+# FUNCTIONS (helpers)
+#######################################
+def _group_cumsum(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """
+    Running sum of ``values`` within each group, preserving the original order.
+
+    :param values: The values to accumulate.
+    :param groups: Integer group id of each value.
+    :return: For each position, the sum of the values of its group up to and including it.
+    """
+    if values.size == 0:
+        return values.copy()
+    order = np.argsort(groups, kind="stable")
+    sorted_values = values[order]
+    sorted_groups = groups[order]
+    running = np.cumsum(sorted_values)
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    lengths = np.diff(np.r_[starts, sorted_values.size])
+    offsets = np.repeat(running[starts] - sorted_values[starts], lengths)
+    result = np.empty_like(running)
+    result[order] = running - offsets
+    return result
+
+
+def _reject_in_order(values: np.ndarray, groups: np.ndarray, candidates: np.ndarray, limit: np.ndarray) -> np.ndarray:
+    """
+    Accept candidate orders in submission order while the running total of the accepted
+    ones in their group stays within each order's limit. Rejected orders never count
+    towards the total, so they cannot use up room that a later order needs.
+
+    :param values: Amount each order adds to its group's total.
+    :param groups: Integer group id of each order.
+    :param candidates: Mask of the orders to check; the others are ignored.
+    :param limit: Largest allowed running total (including the order itself), per order.
+    :return: Mask of the candidates that are rejected.
+    """
+    rejected = np.zeros(values.shape[0], dtype=bool)
+    active = np.flatnonzero(candidates)
+    while active.size:
+        breach = _group_cumsum(values[active], groups[active]) > limit[active]
+        if not breach.any():
+            break
+        # Only the first breach of each group is certain; later ones may pass once it is dropped
+        breach_groups, first = np.unique(groups[active][breach], return_index=True)
+        rejected[active[np.flatnonzero(breach)[first]]] = True
+        # Groups without a breach are settled; keep re-checking the others
+        active = active[~rejected[active] & np.isin(groups[active], breach_groups)]
+    return rejected
+
+#######################################
+# CLASSES
+#######################################
+@dataclass
+class RiskLimits:
+    """Pre-trade limits applied to every order batch."""
+    hmax: Optional[int] = 100
+    max_position: Optional[int] = None
+    max_gross_leverage: Optional[float] = None
+    max_net_leverage: Optional[float] = None
+    turbulence_threshold: Optional[float] = None
+    transaction_cost_pct: float = 0.0
+    allow_short: bool = False
+
+    def __post_init__(self):
+        """Validate limits after initialization."""
+        if self.hmax is not None and self.hmax < 1:
+            raise ValueError("hmax must be positive")
+
+        if self.max_position is not None and self.max_position < 0:
+            raise ValueError("max_position cannot be negative")
+
+        for name in ("max_gross_leverage", "max_net_leverage"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+
+        if self.transaction_cost_pct < 0:
+            raise ValueError("transaction_cost_pct cannot be negative")
+
+
+@dataclass
+class RiskCheckResult:
+    """Per-order outcome of a risk check."""
+    accepted: np.ndarray
+    reasons: np.ndarray
+
+    def reason_names(self) -> List[str]:
+        """
+        :return: The reject reason of each order as a string ("accepted" if it passed).
+        """
+        return [REASON_NAMES[code] for code in self.reasons]
+
+    def reject_counts(self) -> dict:
+        """
+        :return: The number of rejected orders per reason.
+        """
+        counts = np.bincount(self.reasons, minlength=len(REASON_NAMES))
+        return {REASON_NAMES[code]: int(count) for code, count in enumerate(counts) if code and count}
+
+
+class RiskGate:
+    """
+    Validates a whole step's order batch at once with array operations over all agents.
+
+    Orders are checked in submission order, in stages (shares, position, cash, exposure):
+    at each stage an order is evaluated against the agent's state plus the earlier orders
+    of the batch that survived so far, so a rejected order never makes room for another.
+    Shares bought and sale proceeds are not credited until the next step, so a sale is
+    never covered by a buy of the same batch and the cash check is conservative.
+    """
+
+    def __init__(self, limits: Optional[RiskLimits] = None):
+        """
+        Constructor for the RiskGate.
+
+        :param limits: The limits to enforce. Defaults to FinRL's ``hmax`` of 100 shares per order.
+        """
+        self.limits = limits if limits is not None else RiskLimits()
+        self.logger = logging.getLogger(__name__)
+
+    def check(
+        self,
+        agent_idx: ArrayLike,
+        ticker_idx: ArrayLike,
+        quantity: ArrayLike,
+        prices: ArrayLike,
+        cash: np.ndarray,
+        positions: np.ndarray,
+        turbulence: float = 0.0,
+        costs: Optional[np.ndarray] = None
+    ) -> RiskCheckResult:
+        """
+        Check an order batch.
+
+        :param agent_idx: Agent index of each order, shape (n_orders,).
+        :param ticker_idx: Ticker index of each order; negative for tickers not traded in this world.
+        :param quantity: Signed share quantity of each order (positive buys, negative sells).
+        :param prices: Current price per ticker, shape (n_tickers,).
+        :param cash: Available cash per agent, shape (n_agents,).
+        :param positions: Current shares held, shape (n_agents, n_tickers).
+        :param turbulence: Current market turbulence index.
+        :param costs: Estimated execution costs of each order (fees, spread, impact), e.g. from
+                      a CostModel. Replaces the flat ``transaction_cost_pct`` in the cash check.
+        :return: A RiskCheckResult with the accept mask and reason code of every order.
+        """
+        limits = self.limits
+        agent_idx = np.asarray(agent_idx, dtype=np.int64)
+        ticker_idx = np.asarray(ticker_idx, dtype=np.int64)
+        quantity = np.asarray(quantity, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        n_agents, n_tickers = positions.shape
+        reasons = np.zeros(quantity.shape[0], dtype=np.int8)
+
+        def reject(mask: np.ndarray, code: int) -> None:
+            reasons[mask & (reasons == ACCEPTED)] = code
+
+        # Stateless, per-order checks
+        unknown = (ticker_idx < 0) | (ticker_idx >= n_tickers)
+        reject(unknown, UNKNOWN_TICKER)
+        ticker_idx = np.where(unknown, 0, ticker_idx)
+        is_buy = quantity > 0
+        if limits.turbulence_threshold is not None and turbulence > limits.turbulence_threshold:
+            # Like FinRL's env, a turbulence halt blocks new buying but still lets agents reduce risk.
+            reject(is_buy, TRADING_HALT)
+        if limits.hmax is not None:
+            reject(np.abs(quantity) > limits.hmax, MAX_ORDER_SIZE)
+
+        # Holdings after each order, given the earlier surviving orders of the same side
+        slot = agent_idx * n_tickers + ticker_idx
+        held = positions[agent_idx, ticker_idx].astype(np.float64)
+        is_sell = quantity < 0
+        if not limits.allow_short:
+            sells = is_sell & (reasons == ACCEPTED)
+            reject(_reject_in_order(-quantity, slot, sells, held), INSUFFICIENT_SHARES)
+        if limits.max_position is not None:
+            # Each side is limited only where it grows |position|, so oversized holdings can be reduced
+            buys, sells = is_buy & (reasons == ACCEPTED), is_sell & (reasons == ACCEPTED)
+            reject(_reject_in_order(quantity, slot, buys, limits.max_position - held), POSITION_LIMIT)
+            reject(_reject_in_order(-quantity, slot, sells, limits.max_position + held), POSITION_LIMIT)
+
+        # Cash sufficiency for the cumulative buy notional (and costs) of each agent
+        pending = reasons == ACCEPTED
+        notional = quantity * prices[ticker_idx]
+        if costs is None:
+            cash_needed = np.where(is_buy, notional * (1.0 + limits.transaction_cost_pct), 0.0)
+        else:
+            # Sells only need cash for costs their own proceeds do not cover
+            costs = np.asarray(costs, dtype=np.float64)
+            cash_needed = np.where(is_buy, notional + costs, np.maximum(costs + notional, 0.0))
+        reject(_reject_in_order(cash_needed, agent_idx, pending & (cash_needed > 0), cash[agent_idx]), INSUFFICIENT_CASH)
+
+        # Post-trade exposure per agent, relative to pre-trade equity
+        if limits.max_gross_leverage is not None or limits.max_net_leverage is not None:
+            pending = reasons == ACCEPTED
+            delta = np.bincount(
+                slot, weights=np.where(pending, quantity, 0.0), minlength=n_agents * n_tickers
+            ).reshape(n_agents, n_tickers)
+            post_trade = positions + delta
+            equity = np.maximum(cash + positions @ prices, 0.0)
+            if limits.max_gross_leverage is not None:
+                gross = np.abs(post_trade) @ prices
+                breach = (gross > limits.max_gross_leverage * equity)[agent_idx]
+                increases_gross = quantity * post_trade[agent_idx, ticker_idx] > 0
+                reject(breach & increases_gross, GROSS_EXPOSURE)
+            if limits.max_net_leverage is not None:
+                net = post_trade @ prices
+                breach = (np.abs(net) > limits.max_net_leverage * equity)[agent_idx]
+                increases_net = quantity * net[agent_idx] > 0
+                reject(breach & increases_net, NET_EXPOSURE)
+
+        result = RiskCheckResult(accepted=reasons == ACCEPTED, reasons=reasons)
+        if self.logger.isEnabledFor(logging.DEBUG) and reasons.any():
+            self.logger.debug(f"Risk gate rejected orders: {result.reject_counts()}")
+        return result
@@ -4,8 +4,11 @@
 # IMPORTS
 #######################################
 import logging
+import random
+import secrets
 import sys
-from typing import List
+from dataclasses import asdict, replace
+from typing import Any, Dict, List, Optional
 
 # TinyTroupe / project imports
 from tinytroupe.agent.tiny_person import TinyPerson
@@ -13,6 +16,15 @@ from tinytroupe.agent.tiny_person import TinyPerson
 # Local module imports
 from trading_simulation.trading_world import TradingWorld, run_trading_simulation
 from trading_simulation.trading_agents import create_trader_persona
+from trading_simulation.population import PopulationSpec, TraderPopulation, build_population
+from trading_simulation.results_store import ResultsStore
+from trading_simulation.distributed import (
+    Coordinator,
+    launch_local_workers,
+    merge_exports,
+    simulation_shards,
+    split_population,
+)
 
 #######################################
 # CLASSES
@@ -34,6 +46,8 @@ class SimulationRunner:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
         self.logger.addHandler(console_handler)
+        # Example: we define some tickers. You can choose others or pass them as a parameter.
+        self.ticker_list = ["AAPL", "MSFT", "AMZN", "TSLA", "GOOGL"]
         self.logger.debug("SimulationRunner initialized.")
 
     def setup_traders(self) -> List[TinyPerson]:
@@ -49,20 +63,43 @@ class SimulationRunner:
         self.logger.info("Created three trader personas with varying risk tolerances.")
         return [trader1, trader2, trader3]
 
-    def setup_trading_world(self, agents: List[TinyPerson]) -> TradingWorld:
+    def setup_population(self, population: PopulationSpec) -> TraderPopulation:
+        """
+        Generate an array-backed population of rule-based traders. The world steps it
+        directly from its arrays, so no per-agent persona objects are created.
+
+        :param population: The distribution spec to generate the traders from.
+        :return: The TraderPopulation, trading the runner's tickers.
+        """
+        traders = build_population(population, self.ticker_list)
+        self.logger.info(
+            f"Created a population of {len(traders)} rule-based traders "
+            f"({traders.bytes_per_agent():.1f} bytes/agent of world state)."
+        )
+        return traders
+
+    def setup_trading_world(
+        self,
+        agents: List[TinyPerson],
+        population: Optional[TraderPopulation] = None,
+        population_seed: Optional[int] = None
+    ) -> TradingWorld:
         """
         Initialize a TradingWorld environment with the given agents.
         
         :param agents: A list of trader personas.
+        :param population: Optional array-backed population, stepped alongside the personas.
+        :param population_seed: Seed for the population's trading decisions.
         :return: An instance of TradingWorld.
         """
-        # Example: we define some tickers. You can choose others or pass them as a parameter.
-        ticker_list = ["AAPL", "MSFT", "AMZN", "TSLA", "GOOGL"]
+        ticker_list = self.ticker_list
         # We set some arguments as an example
         trading_world = TradingWorld(
             name="Stock Market Simulation",
             agents=agents,
             ticker_list=ticker_list,
+            population=population,
+            population_seed=population_seed,
             initial_capital=1e5,
             technical_indicators=None,
             use_news=True,
@@ -72,25 +109,139 @@ class SimulationRunner:
         self.logger.info(f"TradingWorld created with tickers: {ticker_list}")
         return trading_world
 
-    def run(self, total_steps: int = 50) -> None:
+    def run(
+        self,
+        total_steps: int = 50,
+        population: Optional[PopulationSpec] = None,
+        results_store: Optional[ResultsStore] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Run the full simulation, from building agents to running the environment.
         
         :param total_steps: How many steps the simulation should run.
+        :param population: Optional distribution spec for an array-backed population of
+                           rule-based traders, used instead of the demonstration personas.
+        :param results_store: Optional store to record the run in, keyed by its config and seed.
+        :param seed: Seed for the run, overriding the population's. When neither gives one, a
+                     fresh seed is drawn, so unseeded runs never replace each other in the store.
+                     It seeds the population and Python's ``random`` (env actions, persona decisions).
+        :return: The run's performance export (world summary, per-agent metrics, equity curve).
         """
-        self.logger.info("Setting up trader personas...")
-        agents = self.setup_traders()
+        if seed is None and population is not None:
+            seed = population.seed
+        if seed is None:
+            seed = secrets.randbits(63)
+        if population is not None:
+            population = replace(population, seed=seed)
+        random.seed(seed)
+        self.logger.info(f"Run seed: {seed}")
+
+        if population is not None:
+            self.logger.info("Setting up trader population...")
+            agents, traders = [], self.setup_population(population)
+        else:
+            self.logger.info("Setting up trader personas...")
+            agents, traders = self.setup_traders(), None
 
         self.logger.info("Creating TradingWorld environment...")
-        world = self.setup_trading_world(agents)
+        world = self.setup_trading_world(agents, traders, seed)
 
         self.logger.info("Running trading simulation...")
-        run_trading_simulation(world, total_steps=total_steps)
-        self.logger.info("Simulation run complete.")
+        results = run_trading_simulation(world, total_steps=total_steps)
+        self.logger.info(f"Simulation run complete. Summary: {results.get('summary')}")
+        if results_store is not None:
+            run_id = results_store.add_export(run_config(total_steps, population), seed, results)
+            self.logger.info(f"Stored run {run_id} in {results_store.path}")
+        return results
+
+    def run_distributed(
+        self,
+        total_steps: int = 50,
+        population: Optional[PopulationSpec] = None,
+        n_shards: int = 2,
+        address: str = "tcp://127.0.0.1:0",
+        n_local_workers: int = 0,
+        heartbeat_timeout: float = 10.0,
+        timeout: Optional[float] = None,
+        n_workers: Optional[int] = None,
+        worker_timeout: float = 60.0,
+        results_store: Optional[ResultsStore] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the simulation as several independent worlds on remote or local workers.
+
+        With a population spec, its agents are split into ``n_shards`` groups, one world per
+        group; otherwise every shard runs a world with the default traders. Workers started
+        elsewhere connect with ``python -m trading_simulation.distributed <address>``.
+
+        :param total_steps: How many steps each world runs.
+        :param population: Optional distribution spec, split across the shards.
+        :param n_shards: The number of worlds to run.
+        :param address: The address the coordinator listens on (tcp://host:port or unix:///path).
+        :param n_local_workers: Worker processes to start on this machine.
+        :param heartbeat_timeout: Seconds of silence after which a worker's shard is re-dispatched.
+        :param timeout: Overall seconds allowed for the run, or None to wait indefinitely.
+        :param n_workers: Workers (local or external) that must connect before dispatching.
+                          Defaults to ``n_local_workers``, or one worker without local ones.
+        :param worker_timeout: Seconds to wait for those workers before raising TimeoutError.
+        :param results_store: Optional store to record the merged run in, keyed by its config
+                              (including ``n_shards``) and seed.
+        :param seed: Seed for the run, resolved as in ``run``; shard ``i`` runs with ``seed + i``.
+        :return: The merged performance export of all shards (see ``merge_exports``).
+        """
+        if seed is None and population is not None:
+            seed = population.seed
+        if seed is None:
+            seed = secrets.randbits(63)
+        if population is not None:
+            population = replace(population, seed=seed)
+        self.logger.info(f"Run seed: {seed}")
+
+        populations = split_population(population, n_shards) if population is not None else [None] * n_shards
+        shards = simulation_shards(total_steps, populations, seed)
+
+        with Coordinator(address, heartbeat_timeout=heartbeat_timeout) as coordinator:
+            if n_local_workers:
+                launch_local_workers(coordinator.address, n_local_workers)
+            # Fail fast rather than block forever when no worker ever connects
+            n_workers = n_workers if n_workers is not None else max(n_local_workers, 1)
+            self.logger.info(f"Waiting for {n_workers} workers on {coordinator.address}...")
+            coordinator.wait_for_workers(n_workers, timeout=worker_timeout)
+            self.logger.info(f"Dispatching {len(shards)} world shards from {coordinator.address}...")
+            shard_results = coordinator.run(shards, timeout=timeout)
+
+        results = merge_exports([shard_results[shard.shard_id] for shard in shards])
+        self.logger.info(f"Distributed run complete. Summary: {results.get('summary')}")
+        if results_store is not None:
+            config = {**run_config(total_steps, population), "n_shards": len(shards)}
+            run_id = results_store.add_export(config, seed, results)
+            self.logger.info(f"Stored run {run_id} in {results_store.path}")
+        return results
 
 #######################################
 # FUNCTIONS OUTSIDE OF CLASSES
 #######################################
+def run_config(total_steps: int, population: Optional[PopulationSpec] = None) -> Dict[str, Any]:
+    """
+    The configuration a run is stored under in a ResultsStore, alongside its seed. The
+    mean risk tolerance of the agents actually built depends on the seed, so it is stored
+    as the run's ``risk_tolerance`` metric (see ``TradingWorld.export``) rather than here;
+    ``where={"risk_tolerance": ...}`` filters on it all the same.
+
+    :param total_steps: How many steps the simulation ran.
+    :param population: The population spec, if any.
+    :return: The configuration, without the seed.
+    """
+    config: Dict[str, Any] = {"total_steps": total_steps}
+    if population is not None:
+        spec = asdict(population)
+        del spec["seed"]
+        config["population"] = spec
+    return config
+
+
 def main():
     """
     Main entry point for the simulation runner. Instantiates SimulationRunner
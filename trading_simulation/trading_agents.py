@@ -4,18 +4,75 @@
 # IMPORTS
 #######################################
 import logging
-from typing import Any, Dict, List, Optional
+import random
+import sys
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 # TinyTroupe imports
 from tinytroupe.agent.tiny_person import TinyPerson
 
+# Local module imports
+from trading_simulation.market_stimulus import MarketStimulus
+
 # If you have other relevant TinyTroupe modules for memory, environment, etc., import them as needed:
 # from tinytroupe.environment import TinyWorld
 # from tinytroupe.utils.config import get_config
 
+#######################################
+# CONSTANTS
+#######################################
+# Stand-in share price until personas read prices from the environment
+PLACEHOLDER_SHARE_PRICE = 100.0
+
+# Risk tolerances are rounded to this many decimals before interning a PersonaSpec,
+# which bounds the intern table at 10**PERSONA_RISK_DECIMALS + 1 specs per trading style
+PERSONA_RISK_DECIMALS = 4
+
 #######################################
 # CLASSES
 #######################################
+@dataclass(frozen=True)
+class PersonaSpec:
+    """
+    The shared, immutable part of a trader persona. All personas with the same trading
+    style and risk tolerance reference one interned PersonaSpec (a flyweight). Its
+    definitions are frozen all the way down (read-only mappings and tuples) and formatted
+    once per spec; each persona receives its own mutable copy through ``definition``,
+    since ``TinyPerson.define`` stores and may modify what it is given.
+    """
+    trading_style: str
+    risk_tolerance: float
+    definitions: Mapping[str, Dict[str, Any]] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        """Build the persona definitions once per spec."""
+        definitions = {
+            "occupation": {
+                "title": "Stock Trader",
+                "description": f"Focuses on {self.trading_style} strategies with risk tolerance {self.risk_tolerance}"
+            },
+            "preferences": {
+                "interests": ["stock market", "economics", "financial news"]
+            },
+            "personality": {
+                "traits": [
+                    f"Enjoys {self.trading_style} trading style with risk tolerance {self.risk_tolerance}",
+                    "Attentive to global economic indicators and financial press"
+                ]
+            },
+        }
+        object.__setattr__(self, "definitions", _freeze(definitions))
+
+    def definition(self, key: str) -> Dict[str, Any]:
+        """
+        :param key: The definition to copy, e.g. "occupation".
+        :return: A mutable copy of the definition, safe to hand to ``TinyPerson.define``.
+        """
+        return _thaw(self.definitions[key])
+
+
 class TradingPersona(TinyPerson):
     """
     A specialized persona representing a trader in the integrated simulation.
@@ -41,18 +98,27 @@ class TradingPersona(TinyPerson):
         """
         super().__init__(name, *args, **kwargs)
         self.logger = logging.getLogger(__name__)
-        self.trading_style = trading_style
+        self.persona_spec = intern_persona_spec(trading_style, risk_tolerance)
+        self.trading_style = self.persona_spec.trading_style
         self.risk_tolerance = risk_tolerance
 
         # Example placeholders for portfolio or account state
         self.portfolio: Dict[str, int] = {}  # ticker -> shares
         self.cash_available: float = 100000.0
 
+        # Latest per-ticker action from a trained policy (set by the world), if any
+        self.policy_action: Optional[Dict[str, float]] = None
+
+        # When the world gates orders in batch, trades are queued here as (ticker, signed shares)
+        # and settled through apply_fill instead of being executed immediately.
+        self.defer_execution: bool = False
+        self.pending_orders: List[Tuple[str, int]] = []
+
+        # Most recent closed bar per (symbol, timeframe) the persona subscribed to
+        self.latest_bars: Dict[Tuple[str, str], Dict[str, float]] = {}
+
         # Memory or additional fields can be defined here if needed
-        self.define("occupation", {
-            "title": "Stock Trader",
-            "description": f"Focuses on {trading_style} strategies with risk tolerance {risk_tolerance}"
-        })
+        self.define("occupation", self.persona_spec.definition("occupation"))
 
     def listen_and_act(self, stimulus: Any) -> None:
         """
@@ -63,7 +129,7 @@ class TradingPersona(TinyPerson):
         """
         super().listen(stimulus)  # Optionally store or process the stimulus
 
-        if isinstance(stimulus, dict):
+        if isinstance(stimulus, (dict, MarketStimulus)):
             stimulus_type = stimulus.get("type", "")
             if stimulus_type == "MARKET_UPDATE":
                 self._handle_market_update(stimulus)
@@ -71,16 +137,28 @@ class TradingPersona(TinyPerson):
                 # If it's some other type, do something else or do nothing
                 pass
 
+    def on_bars(self, symbol: str, timeframe: str, bars: Dict[str, Any]) -> None:
+        """
+        Receive newly closed bars from the world's bar feed.
+
+        :param symbol: The symbol the bars belong to.
+        :param timeframe: The bar resolution (e.g. "5m").
+        :param bars: Column arrays ("start", "open", "high", "low", "close", "volume").
+        """
+        self.latest_bars[(symbol, timeframe)] = {name: float(values[-1]) for name, values in bars.items()}
+        self.logger.debug(f"{self.name} received {len(bars['close'])} {timeframe} bars for {symbol}")
+
     #######################################
     # Internal Methods
     #######################################
-    def _handle_market_update(self, market_stimulus: Dict[str, Any]) -> None:
+    def _handle_market_update(self, market_stimulus: Union[MarketStimulus, Dict[str, Any]]) -> None:
         """
         React to a market update. This is a placeholder logic that can be replaced
         with real RL-based or rule-based trading decisions.
         
-        :param market_stimulus: A dictionary containing info about the new market observation,
-                                rewards, news, etc.
+        :param market_stimulus: A read-only MarketStimulus (or equivalent dictionary) with the
+                                new market observation, rewards, news, etc. It is shared
+                                with the other agents and must not be modified.
         """
         # Example placeholders
         observation = market_stimulus.get("observation", None)
@@ -94,19 +172,37 @@ class TradingPersona(TinyPerson):
         if news_items:
             self.logger.debug(f"{self.name} sees news items: {news_items}")
 
-        # If you had an RL agent or a rule-based system, you'd call it here
-        # e.g. action = self.my_drl_agent.decide(observation)
+        # DRL-backed personas act on the action computed by the world's PolicyServer
+        if self.policy_action is not None:
+            self._policy_trading_decision(self.policy_action)
+            self.policy_action = None
+            return
 
         # For demonstration, let's do a placeholder buy or sell logic
         self._random_trading_decision()
 
+    def _policy_trading_decision(self, action: Dict[str, float], threshold: float = 0.1) -> None:
+        """
+        Trade the ticker with the strongest policy signal, following FinRL's
+        convention that positive actions buy and negative actions sell.
+
+        :param action: Mapping of ticker to the policy's action in [-1, 1].
+        :param threshold: Minimum absolute action required to trade.
+        """
+        ticker, strength = max(action.items(), key=lambda item: abs(item[1]))
+        if strength > threshold:
+            self._buy_random_stock(ticker)
+        elif strength < -threshold:
+            self._sell_random_stock(ticker)
+        else:
+            self.logger.debug(f"{self.name} policy signal is below threshold, holding.")
+
     def _random_trading_decision(self) -> None:
         """
         Placeholder function to mimic a random buy or sell action.
         In a real scenario, you'd have logic that uses risk_tolerance,
         the current market data, etc.
         """
-        import random
         # For demonstration, 1/10 chance to buy, 1/10 chance to sell, else hold
         decision_roll = random.random()
         if decision_roll < 0.1:
@@ -116,44 +212,118 @@ class TradingPersona(TinyPerson):
         else:
             self.logger.debug(f"{self.name} decides to hold (no trade).")
 
-    def _buy_random_stock(self) -> None:
+    def _buy_random_stock(self, ticker: Optional[str] = None) -> None:
         """
         Buys a small number of shares of a random stock (placeholder).
+
+        :param ticker: The ticker to buy. A random one is picked if not given.
         """
         example_tickers = ["AAPL", "MSFT", "AMZN", "GOOGL", "TSLA"]
-        ticker = random.choice(example_tickers)
+        ticker = ticker or random.choice(example_tickers)
         shares_to_buy = 1
 
+        if self.defer_execution:
+            self.pending_orders.append((ticker, shares_to_buy))
+            return
+
         # Placeholder logic: check if we have enough cash
         # In a real scenario, you'd factor in the price from the environment, transaction cost, etc.
-        if self.cash_available > 100:  # pretend each share costs < 100
-            self.cash_available -= 100
+        if self.cash_available > PLACEHOLDER_SHARE_PRICE:  # pretend each share costs < 100
+            self.cash_available -= PLACEHOLDER_SHARE_PRICE
             self.portfolio[ticker] = self.portfolio.get(ticker, 0) + shares_to_buy
             self.logger.info(f"{self.name} buys {shares_to_buy} shares of {ticker}. Cash left: {self.cash_available}")
         else:
             self.logger.debug(f"{self.name} wants to buy {ticker} but has insufficient cash.")
 
-    def _sell_random_stock(self) -> None:
+    def _sell_random_stock(self, ticker: Optional[str] = None) -> None:
         """
         Sells a small number of shares of a random stock (placeholder).
+
+        :param ticker: The ticker to sell. A random held one is picked if not given.
         """
         if not self.portfolio:
             self.logger.debug(f"{self.name} has no stocks to sell.")
             return
-        ticker, shares_owned = random.choice(list(self.portfolio.items()))
+        if ticker is None:
+            ticker, shares_owned = random.choice(list(self.portfolio.items()))
+        else:
+            shares_owned = self.portfolio.get(ticker, 0)
         if shares_owned > 0:
             shares_to_sell = 1
+            if self.defer_execution:
+                self.pending_orders.append((ticker, -shares_to_sell))
+                return
             self.portfolio[ticker] -= shares_to_sell
-            self.cash_available += 100  # placeholder for share price
+            self.cash_available += PLACEHOLDER_SHARE_PRICE  # placeholder for share price
             self.logger.info(f"{self.name} sells {shares_to_sell} shares of {ticker}. Cash now: {self.cash_available}")
             if self.portfolio[ticker] <= 0:
                 del self.portfolio[ticker]
         else:
             self.logger.debug(f"{self.name} has zero shares of {ticker}, cannot sell.")
 
+    def apply_fill(self, ticker: str, quantity: int, price: float, cost: float = 0.0) -> None:
+        """
+        Settle an order that the world accepted.
+
+        :param ticker: The ticker traded.
+        :param quantity: Signed number of shares (positive for buys, negative for sells).
+        :param price: The execution price per share.
+        :param cost: Total execution costs (fees, spread, impact) charged on the fill.
+        """
+        self.cash_available -= quantity * price + cost
+        shares = self.portfolio.get(ticker, 0) + quantity
+        if shares:
+            self.portfolio[ticker] = shares
+        else:
+            self.portfolio.pop(ticker, None)
+        side = "buys" if quantity > 0 else "sells"
+        self.logger.info(f"{self.name} {side} {abs(quantity)} shares of {ticker}. Cash now: {self.cash_available}")
+
 #######################################
 # FUNCTIONS OUTSIDE OF CLASSES
 #######################################
+def _freeze(value: Any) -> Any:
+    """
+    Recursively convert dicts to read-only mappings and lists to tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """
+    Recursively copy a frozen value back into dicts and lists.
+    """
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+_PERSONA_SPECS: Dict[Tuple[str, float], PersonaSpec] = {}
+
+
+def intern_persona_spec(trading_style: str, risk_tolerance: float) -> PersonaSpec:
+    """
+    Return the shared PersonaSpec for a trading style and risk tolerance, creating it once.
+    The risk tolerance is rounded to ``PERSONA_RISK_DECIMALS`` decimals first, so the intern
+    table stays bounded however many distinct floats are passed in.
+
+    :param trading_style: e.g., "conservative", "balanced", "aggressive".
+    :param risk_tolerance: float representing how risk-hungry or risk-averse the persona is.
+    :return: The interned PersonaSpec.
+    """
+    key = (sys.intern(trading_style), round(float(risk_tolerance), PERSONA_RISK_DECIMALS))
+    spec = _PERSONA_SPECS.get(key)
+    if spec is None:
+        spec = _PERSONA_SPECS[key] = PersonaSpec(*key)
+    return spec
+
+
 def create_trader_persona(
     name: str,
     trading_style: str,
@@ -170,13 +340,6 @@ def create_trader_persona(
     """
     persona = TradingPersona(name=name, trading_style=trading_style, risk_tolerance=risk_tolerance)
     # Optionally define more attributes or set memory
-    persona.define("preferences", {
-        "interests": ["stock market", "economics", "financial news"]
-    })
-    persona.define("personality", {
-        "traits": [
-            f"Enjoys {trading_style} trading style with risk tolerance {risk_tolerance}",
-            "Attentive to global economic indicators and financial press"
-        ]
-    })
+    persona.define("preferences", persona.persona_spec.definition("preferences"))
+    persona.define("personality", persona.persona_spec.definition("personality"))
     return persona
\ No newline at end of file
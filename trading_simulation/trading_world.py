@@ -7,7 +7,9 @@ import os
 import time
 import logging
 import random
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 # TinyTroupe imports
 from tinytroupe.environment import TinyWorld
@@ -20,7 +22,6 @@ from finrl.config import INDICATORS
 from finrl.meta.env_stock_trading.env_stocktrading_np import StockTradingEnv
 from finrl.meta.preprocessor.yahoodownloader import YahooDownloader
 from finrl.meta.preprocessor.preprocessors import FeatureEngineer
-from finrl.meta.preprocessor.preprocessors import data_split
 from finrl.config import (
     TRAIN_START_DATE,
     TRAIN_END_DATE,
@@ -34,6 +35,24 @@ from finrl.config import (
 # News scraper imports
 # We'll assume you have a module "news_scraper.scraper" that provides a function get_latest_news
 # from news_scraper.scraper import get_latest_news
+from news_scraper.sentiment import SentimentCache, SentimentScorer
+
+# Local module imports
+from trading_simulation.analytics import SimulationAnalytics
+from trading_simulation.bars import BarFeed
+from trading_simulation.data_cache import EpisodeCache
+from trading_simulation.execution_costs import CostAdjustedEnv, CostModel, ExecutionResult, ProportionalCostModel
+from trading_simulation.market_stimulus import StimulusBuilder
+from trading_simulation.policy_server import PolicyServer
+from trading_simulation.population import TraderPopulation
+from trading_simulation.risk import REASON_NAMES, RiskCheckResult, RiskGate, RiskLimits
+from trading_simulation.trading_agents import PLACEHOLDER_SHARE_PRICE
+
+#######################################
+# CONSTANTS
+#######################################
+# FinRL's env needs a finite turbulence threshold; this one never triggers its halt
+_NO_TURBULENCE_HALT = float(np.finfo(np.float32).max)
 
 #######################################
 # CLASSES
@@ -57,6 +76,7 @@ class TradingWorld(TinyWorld):
         technical_indicators: Optional[List[str]] = None,
         use_news: bool = True,
         news_update_interval: int = 60,
+        turbulence_threshold: Optional[float] = 99.0,
         **kwargs
     ):
         """
@@ -69,7 +89,20 @@ class TradingWorld(TinyWorld):
         :param technical_indicators: A list of technical indicators for the FinRL environment.
         :param use_news: If True, we fetch news from an external scraper to influence the environment.
         :param news_update_interval: The frequency (in seconds) at which we fetch new news articles.
+        :param turbulence_threshold: Turbulence above which buying halts, in both the FinRL env and
+                                     the agents' risk gate (FinRL's default is 99). None disables it.
         :param kwargs: Additional arguments to pass to the parent or for extended usage.
+                       ``policy_server`` attaches a PolicyServer for DRL-backed agents.
+                       ``sentiment_scorer`` scores fetched headlines; ``sentiment_cache_path``
+                       overrides the default scorer's per-user cache file.
+                       ``hmax`` caps shares per order; ``risk_gate`` replaces the default RiskGate.
+                       ``bar_feed`` attaches a BarFeed for intraday, multi-resolution bars;
+                       ``bar_source(day)`` returns each symbol's finest-resolution bars
+                       (timestamps, open, high, low, close, volume) for an env day, which
+                       ``step`` feeds through the BarFeed before the agents act.
+                       ``cost_model`` prices fills in both the env reward and the agents' ledgers.
+                       ``population`` adds a TraderPopulation of rule-based traders, stepped in
+                       batch from its arrays; ``population_seed`` seeds their decisions.
         """
         super().__init__(name, agents)
         self.logger = logging.getLogger(__name__)
@@ -78,6 +111,14 @@ class TradingWorld(TinyWorld):
         self.ticker_list = ticker_list if ticker_list else ["AAPL", "MSFT", "AMZN"]
         self.initial_capital = initial_capital
         self.tech_indicators = technical_indicators if technical_indicators else INDICATORS
+        self.hmax = kwargs.get("hmax", 100)
+        self.cost_model: CostModel = kwargs.get("cost_model") or ProportionalCostModel(0.001)
+        self.transaction_cost_pct = self.cost_model.fee_pct
+        self.reference_prices = np.full(len(self.ticker_list), PLACEHOLDER_SHARE_PRICE)
+        self._market_fields: Dict[str, np.ndarray] = {}
+        self._market_bar: Dict[str, np.ndarray] = {}
+        self.turbulence_threshold = turbulence_threshold
+        self._turbulence = np.zeros(0)
         
         # Prepare data for FinRL environment
         self.stock_env = self._init_finrl_env()
@@ -87,19 +128,63 @@ class TradingWorld(TinyWorld):
         self.news_update_interval = news_update_interval
         self.last_news_fetch_time = time.time()
         self.current_news: List[Dict[str, Any]] = []
+        self.sentiment_scorer: SentimentScorer = kwargs.get("sentiment_scorer") or SentimentScorer(
+            cache=SentimentCache(kwargs.get("sentiment_cache_path"))
+        )
         
         # Additional environment state
         self.market_time_step = 0
+        self._stimulus_builder = StimulusBuilder()
         self._max_steps = kwargs.get("max_steps", 1000)  # an example param
+
+        # Trained policies for DRL-backed agents, evaluated in one batch per step
+        self.policy_server: Optional[PolicyServer] = kwargs.get("policy_server")
+
+        # Pre-trade risk checks, applied to all agents' orders at once after they act
+        # Buying halts above the same turbulence threshold as in the env
+        self.risk_gate: RiskGate = kwargs.get("risk_gate") or RiskGate(
+            RiskLimits(
+                hmax=self.hmax,
+                transaction_cost_pct=self.transaction_cost_pct,
+                turbulence_threshold=self.turbulence_threshold,
+            )
+        )
+        self._ticker_index = {ticker: i for i, ticker in enumerate(self.ticker_list)}
+        self.last_risk_result: Optional[RiskCheckResult] = None
+        for agent in self.agents:
+            if hasattr(agent, "pending_orders"):
+                agent.defer_execution = True
+
+        # Array-backed rule-based traders, stepped alongside the personas without materializing them
+        self.population: Optional[TraderPopulation] = kwargs.get("population")
+        if self.population is not None and self.population.tickers != self.ticker_list:
+            raise ValueError("population tickers must match the world's ticker_list")
+        self._population_rng = np.random.default_rng(kwargs.get("population_seed"))
+        self._population_names: List[str] = (
+            [self.population.name(i) for i in range(len(self.population))] if self.population is not None else []
+        )
+
+        # Intraday bars at several resolutions, fed by step from bar_source or through feed_bars
+        self.bar_feed: Optional[BarFeed] = kwargs.get("bar_feed")
+        self.bar_source: Optional[Callable[[int], Mapping[str, Sequence[Any]]]] = kwargs.get("bar_source")
+
+        # Streaming performance metrics, created on the first step
+        self.analytics: Optional[SimulationAnalytics] = None
+        # Fills settled during the current step: (agent, ticker, quantity, price, cost) arrays
+        self._step_trades: List[Tuple[np.ndarray, ...]] = []
         self.logger.info(f"TradingWorld '{self.name}' created with tickers: {self.ticker_list}")
     
     def step(self, steps: int = 1) -> None:
         """
         Advance the simulation by a certain number of steps. Each step will:
         1. Optionally fetch new news (if time has elapsed).
-        2. Step the FinRL environment to update market data.
+        2. Step the FinRL environment to update market data, and feed the new day's
+           finest-resolution bars from ``bar_source`` (if any) through the bar feed.
         3. Provide updated info to the TinyTroupe agents, letting them act or react.
         4. Log any relevant events or decisions.
+
+        The FinRL env itself advances one daily bar per step; intraday resolution reaches the
+        agents through the bar feed, where every coarser timeframe updates as finer bars close.
         
         :param steps: The number of steps to move forward.
         """
@@ -113,27 +198,87 @@ class TradingWorld(TinyWorld):
                 self._check_and_fetch_news()
             
             # 2. Step the FinRL environment
-            obs, rewards, dones, info = self.stock_env.step([random.randint(0, 2)])  # e.g. random action for demonstration
+            # FinRL's env returns (state, reward, done, truncated, info); older envs omit truncated
+            obs, rewards, dones, *_, info = self.stock_env.step([random.randint(0, 2)])  # e.g. random action for demonstration
             # In a real scenario, you'd retrieve actions from DRL or from the agent.
+            self._update_market_conditions()
+            self._feed_step_bars()
             
-            # 3. Create a custom 'market update' stimulus for the agents
-            market_stimulus = {
-                "type": "MARKET_UPDATE",
-                "observation": obs,
-                "reward": rewards,
-                "done": dones,
-                "info": info,
-                "news": self.current_news
-            }
+            # 3. Create a read-only 'market update' stimulus, shared by all agents
+            market_stimulus = self._stimulus_builder.build(
+                self.market_time_step, obs, rewards, dones, info, self.current_news
+            )
             
+            # Run one batched forward pass for all DRL-backed agents
+            policy_actions = self._compute_policy_actions(obs)
+
             # Let each agent handle the stimulus
             for agent in self.agents:
+                if agent.name in policy_actions:
+                    agent.policy_action = dict(zip(self.ticker_list, policy_actions[agent.name]))
                 agent.listen_and_act(market_stimulus)
+
+            # Validate and settle the orders of all agents as one batch
+            traders = self._trader_agents()
+            traded_notional = self._execute_pending_orders(traders)
+            population_notional = self._step_population(first_agent=len(traders))
+            self._update_analytics(traders, traded_notional, population_notional)
             
             # Log the event
             self.logger.debug(f"Step {self.market_time_step}: Observations: {obs}, Rewards: {rewards}, Dones: {dones}")
             self.market_time_step += 1
 
+    def subscribe_bars(self, agent: TinyPerson, timeframe: str, symbols: Optional[List[str]] = None) -> None:
+        """
+        Deliver closed bars of a timeframe to an agent's ``on_bars`` handler. Different agents
+        can follow different resolutions of the same feed.
+
+        :param agent: The agent to notify; must define ``on_bars(symbol, timeframe, bars)``.
+        :param timeframe: The bar resolution, e.g. "1m", "5m", "1h" or "1d".
+        :param symbols: Restrict the subscription to these symbols. Defaults to all.
+        """
+        if self.bar_feed is None:
+            self.bar_feed = BarFeed(self.ticker_list)
+        self.bar_feed.subscribe(timeframe, agent.on_bars, symbols)
+
+    def feed_bars(self, symbol: str, timestamps: Any, open: Any, high: Any, low: Any, close: Any, volume: Any) -> None:
+        """
+        Push a chunk of fine-resolution (e.g. minute) bars for a symbol. Coarser bars are
+        updated incrementally as finer ones close, and subscribers are notified.
+
+        :param symbol: The symbol the bars belong to.
+        :param timestamps: Epoch seconds at which each bar starts.
+        :param open: Open prices.
+        :param high: High prices.
+        :param low: Low prices.
+        :param close: Close prices.
+        :param volume: Volumes.
+        """
+        if self.bar_feed is None:
+            self.bar_feed = BarFeed(self.ticker_list)
+        self.bar_feed.update_bars(symbol, timestamps, open, high, low, close, volume)
+
+    def export(self) -> Dict[str, Any]:
+        """
+        The performance export of the run since the last reset (see ``SimulationAnalytics.export``),
+        with each agent's risk tolerance as the ``risk_tolerance`` column of the agent table and
+        their mean as the summary's ``risk_tolerance``.
+
+        :return: The export, or an empty dict if no step was run.
+        """
+        if self.analytics is None:
+            return {}
+        export = self.analytics.export()
+        traders = self._trader_agents()
+        risk = np.array([getattr(agent, "risk_tolerance", np.nan) for agent in traders], dtype=np.float64)
+        if self.population is not None:
+            risk = np.concatenate([risk, self.population.risk_tolerance.astype(np.float64)])
+        if len(risk) == len(export["agents"]):
+            export["agents"]["risk_tolerance"] = risk
+            if len(risk) and not np.isnan(risk).all():
+                export["summary"]["risk_tolerance"] = float(np.nanmean(risk))
+        return export
+
     def reset(self) -> None:
         """
         Reset the environment, including the FinRL environment and any relevant local state.
@@ -141,7 +286,11 @@ class TradingWorld(TinyWorld):
         self.logger.info("Resetting TradingWorld environment.")
         self.market_time_step = 0
         self.current_news = []
+        self.analytics = None
+        self._step_trades = []
         self.stock_env.reset()
+        if self.population is not None:
+            self.population.reset()
         for agent in self.agents:
             agent.reset_memory()
         self.logger.info("TradingWorld environment has been reset.")
@@ -172,26 +321,251 @@ class TradingWorld(TinyWorld):
         )
         processed_df = fe.preprocess_data(df)
         
-        # 3. Split into training and trading for demonstration
-        train_data = data_split(processed_df, TRAIN_START_DATE, TRAIN_END_DATE)
-        trade_data = data_split(processed_df, TRADE_START_DATE, TRADE_END_DATE)
+        # 3. Split into training and trading for demonstration. The cache sorts the frame
+        # once and serves every window (and its env arrays) as shared slices.
+        self.episode_cache = EpisodeCache(processed_df, self.tech_indicators)
+        train_data = self.episode_cache.frame(TRAIN_START_DATE, TRAIN_END_DATE)
+        trade_data = self.episode_cache.frame(TRADE_START_DATE, TRADE_END_DATE)
         
         # 4. Create environment (just for the trading phase)
         env_config = {
             "df": trade_data,
             "stock_dim": len(self.ticker_list),
-            "hmax": 100,  # maximum number of shares to buy/sell
+            "hmax": self.hmax,  # maximum number of shares to buy/sell
             "initial_amount": self.initial_capital,
-            "transaction_cost_pct": 0.001,
+            "transaction_cost_pct": self.transaction_cost_pct,
             "tech_indicator_list": self.tech_indicators,
             "risk_indicator_col": "turbulence",
-            "reward_scaling": 1e-4
+            "reward_scaling": 1e-4,
+            **self.episode_cache.env_config(TRADE_START_DATE, TRADE_END_DATE)
         }
-        env = StockTradingEnv(config=env_config)
+        turbulence_thresh = self.turbulence_threshold if self.turbulence_threshold is not None else _NO_TURBULENCE_HALT
+        # The env ignores transaction_cost_pct in its config; its own fees must match the cost model's
+        env = StockTradingEnv(
+            config=env_config,
+            turbulence_thresh=turbulence_thresh,
+            buy_cost_pct=self.transaction_cost_pct,
+            sell_cost_pct=self.transaction_cost_pct,
+        )
+        # The env only keeps a squashed copy of the turbulence series; the risk gate needs the raw one
+        self._turbulence = self.episode_cache.episode(TRADE_START_DATE, TRADE_END_DATE).turbulence
+
+        # 5. Charge the cost model's spread and impact in the env reward, from the window's bars
+        bars = {
+            column: self.episode_cache.field(column, TRADE_START_DATE, TRADE_END_DATE)
+            for column in ("close", "high", "low", "volume") if column in processed_df.columns
+        }
+        env = CostAdjustedEnv(
+            env, self.cost_model, charged_fee_pct=self.transaction_cost_pct,
+            high=bars.get("high"), low=bars.get("low"), volume=bars.get("volume")
+        )
+        if set(self.ticker_list) <= set(self.episode_cache.tickers):
+            order = [self.episode_cache.tickers.index(ticker) for ticker in self.ticker_list]
+            self._market_fields = {column: array[:, order] for column, array in bars.items()}
         
         self.logger.info("FinRL environment initialization complete.")
         return env
 
+    def _compute_policy_actions(self, obs: Any) -> Dict[str, Any]:
+        """
+        Ask the policy server for the actions of every agent that has a trained policy.
+        All agents currently observe the same market state.
+
+        :param obs: The latest observation from the FinRL environment.
+        :return: A mapping of agent name to its per-ticker action array.
+        """
+        if self.policy_server is None:
+            return {}
+        observations = {
+            agent.name: obs for agent in self.agents if self.policy_server.has_policy(agent.name)
+        }
+        if not observations:
+            return {}
+        return self.policy_server.predict(observations)
+
+    def _trader_agents(self) -> List[Any]:
+        """
+        :return: The agents that hold a cash ledger and portfolio, in a stable order.
+        """
+        return [agent for agent in self.agents if hasattr(agent, "pending_orders")]
+
+    def _portfolio_state(self, traders: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the traders' ledgers into arrays.
+
+        :param traders: The agents returned by ``_trader_agents``.
+        :return: Cash per trader, shape (n,), and shares held, shape (n, n_tickers).
+        """
+        cash = np.array([agent.cash_available for agent in traders], dtype=np.float64)
+        positions = np.zeros((len(traders), len(self.ticker_list)))
+        for i, agent in enumerate(traders):
+            for ticker, shares in agent.portfolio.items():
+                if ticker in self._ticker_index:
+                    positions[i, self._ticker_index[ticker]] = shares
+        return cash, positions
+
+    def _execute_pending_orders(self, traders: List[Any]) -> np.ndarray:
+        """
+        Collect the orders queued by the agents during this step, price them with the cost
+        model, run them through the risk gate as one batch (so the cash check covers every
+        cost) and settle the accepted ones at those fills. The settled fills are queued for
+        the run's trade log.
+
+        :param traders: The agents returned by ``_trader_agents``.
+        :return: The absolute notional traded by each trader in this step.
+        """
+        traded_notional = np.zeros(len(traders))
+        if not any(agent.pending_orders for agent in traders):
+            return traded_notional
+
+        agent_idx, ticker_idx, quantity = [], [], []
+        for i, agent in enumerate(traders):
+            for ticker, shares in agent.pending_orders:
+                agent_idx.append(i)
+                ticker_idx.append(self._ticker_index.get(ticker, -1))
+                quantity.append(shares)
+        cash, positions = self._portfolio_state(traders)
+
+        # Price every order in one pass of the cost model, before the cash check
+        fills = self._price_fills(np.asarray(ticker_idx), np.asarray(quantity, dtype=np.float64))
+        result = self.risk_gate.check(
+            agent_idx, ticker_idx, quantity, self.reference_prices, cash, positions,
+            turbulence=self._current_turbulence(), costs=fills.total_cost
+        )
+        self.last_risk_result = result
+
+        order = 0
+        settled = np.zeros(len(ticker_idx), dtype=bool)
+        for i, agent in enumerate(traders):
+            for ticker, shares in agent.pending_orders:
+                if result.accepted[order]:
+                    filled = int(fills.filled[order])
+                    if filled:
+                        agent.apply_fill(ticker, filled, float(fills.price[order]), float(fills.total_cost[order]))
+                        traded_notional[i] += abs(filled) * fills.price[order]
+                        settled[order] = True
+                else:
+                    self.logger.debug(f"{agent.name} order {shares} {ticker} rejected: {REASON_NAMES[result.reasons[order]]}")
+                order += 1
+            agent.pending_orders.clear()
+        self._step_trades.append((
+            np.asarray(agent_idx)[settled], np.asarray(ticker_idx)[settled],
+            np.trunc(fills.filled[settled]), fills.price[settled], fills.total_cost[settled]
+        ))
+        return traded_notional
+
+    def _step_population(self, first_agent: int = 0) -> Optional[np.ndarray]:
+        """
+        Draw, check and settle one step of orders for the whole TraderPopulation, straight
+        from its arrays. The settled fills are queued for the run's trade log.
+
+        :param first_agent: Index of the first population agent among the analytics' agents.
+        :return: The absolute notional traded by each population agent, or None without a population.
+        """
+        population = self.population
+        if population is None:
+            return None
+        agent_idx, ticker_idx, quantity = population.propose_orders(self._population_rng)
+        fills = self._price_fills(ticker_idx, quantity.astype(np.float64))
+        result = self.risk_gate.check(
+            agent_idx, ticker_idx, quantity, self.reference_prices, population.cash, population.positions,
+            turbulence=self._current_turbulence(), costs=fills.total_cost
+        )
+        settled = result.accepted & (fills.filled != 0)
+        self._step_trades.append((
+            agent_idx[settled] + first_agent, ticker_idx[settled],
+            fills.filled[settled], fills.price[settled], fills.total_cost[settled]
+        ))
+        return population.apply_fills(
+            agent_idx, ticker_idx, fills.filled, self.reference_prices, result.accepted, costs=fills.total_cost
+        )
+
+    def _price_fills(self, ticker_idx: np.ndarray, quantity: np.ndarray) -> ExecutionResult:
+        """
+        Price a batch of orders with the cost model at the current reference prices and bar.
+
+        :param ticker_idx: Ticker index of each order; orders for unknown (negative) tickers cost nothing.
+        :param quantity: Signed share quantity of each order.
+        :return: The cost model's fills, one per order.
+        """
+        known = ticker_idx >= 0
+        ticker_idx = np.where(known, ticker_idx, 0)
+        quantity = np.where(known, quantity, 0.0)
+        return self.cost_model.apply(
+            quantity,
+            self.reference_prices[ticker_idx],
+            ticker=ticker_idx,
+            **{column: self._market_bar[column][ticker_idx] if column in self._market_bar else None
+               for column in ("high", "low", "volume")}
+        )
+
+    def _update_analytics(
+        self,
+        traders: List[Any],
+        traded_notional: np.ndarray,
+        population_notional: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Feed the step's fills and the end-of-step equity of every trader, and of every
+        population agent, to the run's analytics. The analytics are created on the first step after a reset; the
+        traders cannot change until the next reset, or their accumulated stats would be lost.
+
+        :param traders: The agents returned by ``_trader_agents``.
+        :param traded_notional: The absolute notional traded by each trader in this step.
+        :param population_notional: The absolute notional traded by each population agent.
+        """
+        names = [agent.name for agent in traders] + self._population_names
+        if self.analytics is None:
+            self.analytics = SimulationAnalytics(names)
+        elif self.analytics.agent_names != names:
+            raise RuntimeError("The traders changed during the run; call reset() before adding or removing agents")
+        for trades in self._step_trades:
+            self.analytics.record_trades(*trades)
+        self._step_trades = []
+        cash, positions = self._portfolio_state(traders)
+        equity = cash + positions @ self.reference_prices
+        if self.population is not None:
+            equity = np.concatenate([equity, self.population.equity(self.reference_prices)])
+            traded_notional = np.concatenate([traded_notional, population_notional])
+        self.analytics.update(equity, traded_notional)
+
+    def _update_market_conditions(self) -> None:
+        """
+        Point the reference prices and bar data (high, low, volume) at the env's current day.
+        Prices keep their placeholder values when the env data does not cover every ticker.
+        """
+        day = getattr(self.stock_env, "day", None)
+        if not self._market_fields or day is None:
+            return
+        for column, array in self._market_fields.items():
+            if len(array):
+                self._market_bar[column] = array[min(day, len(array) - 1)]
+        if "close" in self._market_bar:
+            self.reference_prices = self._market_bar["close"]
+
+    def _feed_step_bars(self) -> None:
+        """
+        Push the env's current day of finest-resolution bars from ``bar_source`` through the
+        bar feed, so subscribers receive every timeframe that closed during the day.
+        """
+        day = getattr(self.stock_env, "day", None)
+        if self.bar_source is None or day is None:
+            return
+        if self.bar_feed is None:
+            self.bar_feed = BarFeed(self.ticker_list)
+        for symbol, columns in self.bar_source(day).items():
+            self.bar_feed.update_bars(symbol, *columns)
+
+    def _current_turbulence(self) -> float:
+        """
+        :return: The raw turbulence index of the env's current day, or 0 if unavailable.
+        """
+        turbulence = self._turbulence
+        day = getattr(self.stock_env, "day", None)
+        if day is None or len(turbulence) == 0:
+            return 0.0
+        return float(turbulence[min(day, len(turbulence) - 1)])
+
     def _check_and_fetch_news(self) -> None:
         """
         Periodically fetch new market news using the external scraper if the interval has passed.
@@ -201,18 +575,18 @@ class TradingWorld(TinyWorld):
             self.logger.info("Fetching latest news from the web scraper...")
             try:
                 # Example usage: self.current_news = get_latest_news(keywords=["stocks","market"])
-                self.current_news = [
+                news_items = [
                     {
                         "headline": "Placeholder: Market sees unexpected rally",
-                        "sentiment": "positive",
                         "timestamp": time.time()
                     },
                     {
                         "headline": "Placeholder: Tech stocks slump amid regulation fears",
-                        "sentiment": "negative",
                         "timestamp": time.time()
                     }
                 ]
+                # Score once here so every agent shares the same annotated items
+                self.current_news = self.sentiment_scorer.score_items(news_items)
             except Exception as e:
                 self.logger.error(f"Error fetching news: {e}")
                 self.current_news = []
@@ -226,13 +600,16 @@ def run_trading_simulation(
     world: TradingWorld,
     total_steps: int = 100,
     step_batch: int = 1
-) -> None:
+) -> Dict[str, Any]:
     """
     Execute a full simulation run in the given TradingWorld environment.
     
     :param world: An instance of TradingWorld or subclass.
     :param total_steps: The total number of steps to simulate.
     :param step_batch: Number of steps to advance per iteration in the loop.
+    :return: The run's performance export (see ``TradingWorld.export``). Without any
+             trading agents its agent table is empty and the world equity is zero; if no
+             step was run at all, it is an empty dict.
     """
     logging.info(f"Starting trading simulation for {total_steps} steps.")
     world.reset()
@@ -242,4 +619,5 @@ def run_trading_simulation(
         # Add a short sleep or additional logic if needed
         time.sleep(0.1)
     
-    logging.info("Trading simulation completed.")
\ No newline at end of file
+    logging.info("Trading simulation completed.")
+    return world.export()
\ No newline at end of file